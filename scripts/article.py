@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Registro compacto de un artículo de noticias, compartido por todos los scrapers
+Reemplaza los diccionarios de 10-12 claves que armaba cada scraper: los campos
+viven en __slots__, el nombre de la fuente se interna, la fecha se guarda ya
+interpretada, el contenido completo no duplica al resumen y `scraped_at` es un
+solo string por lote. Se comporta como un diccionario (get, update, [], in...)
+para el resto del pipeline y se serializa al mismo esquema JSON de siempre.
+"""
+
+import json
+import sys
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from date_parsing import parse_date
+
+# Región de la fuente -> bandera con que se muestra junto a su nombre
+FLAGS = {'CL': '🇨🇱', 'INT': '🌍'}
+_REGION_BY_FLAG = {flag: region for region, flag in FLAGS.items()}
+
+DATE_FORMAT = '%d/%m/%Y'
+
+# Claves del esquema JSON, en el orden en que se escriben
+KEYS = (
+    'title', 'url', 'source', 'date', 'summary', 'image_url', 'full_content', 'content_length',
+    'scraped_at', 'scraping_success', 'is_chilean_source', 'published_at', 'content_hash', 'relevance_score',
+)
+# Claves que son directamente un slot
+_PLAIN = frozenset({
+    'title', 'url', 'summary', 'image_url', 'scraped_at', 'scraping_success',
+    'published_at', 'content_hash', 'relevance_score',
+})
+
+Content = Union[None, str, Callable[[], str]]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Article(MutableMapping):
+    """
+    Artículo normalizado
+
+    Un slot sin asignar equivale a una clave ausente, así que cada scraper
+    sigue escribiendo solo las claves que conoce. Las claves fuera del
+    esquema (campos de enriquecimiento, duplicate_urls...) van a un dict
+    que se crea solo si hace falta.
+
+    El contenido completo puede ser None (es el mismo texto del resumen, no
+    se guarda dos veces) o una función sin argumentos que lo produce la
+    primera vez que alguien lo lee.
+    """
+
+    __slots__ = (
+        'title', 'url', 'source_name', 'region', '_date', 'summary', 'image_url', '_content',
+        'scraped_at', 'scraping_success', 'published_at', 'content_hash', 'relevance_score', '_extra',
+    )
+
+    def __init__(self, title: str, url: str, source: str, summary: str = '', *,
+                 date: Union[None, str, date] = None, region: Optional[str] = None,
+                 content: Content = None, image_url: str = '', scraped_at: Optional[str] = None,
+                 **fields: Any):
+        self.title = title
+        self.url = url
+        self.source_name = _intern(source)
+        self.region = region
+        self.summary = summary
+        self.image_url = image_url
+        self._extra: Optional[Dict[str, Any]] = None
+        self['full_content'] = content
+        self['date'] = date
+        if scraped_at is not None:
+            self.scraped_at = scraped_at
+        self.update(fields)
+
+    # --- Campos derivados ----------------------------------------------
+
+    @property
+    def source(self) -> str:
+        """Nombre de la fuente con la bandera de su región, como en el JSON"""
+        return f"{self.source_name} {FLAGS[self.region]}" if self.region else self.source_name
+
+    @property
+    def parsed_date(self) -> Optional[date]:
+        value = self._date
+        return value if isinstance(value, date) else None
+
+    @property
+    def full_content(self) -> str:
+        content = self._content
+        if content is None:
+            return self.summary
+        if callable(content):
+            content = self._content = content() or ''
+        return content
+
+    # --- Interfaz de diccionario ---------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _PLAIN:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if key == 'source':
+            return self.source
+        if key == 'date':
+            value = self._date
+            return value.strftime(DATE_FORMAT) if isinstance(value, date) else (value or '')
+        if key == 'full_content':
+            return self.full_content
+        if key == 'content_length':
+            return len(self.full_content)
+        if key == 'is_chilean_source':
+            if self.region is None:
+                raise KeyError(key)
+            return self.region == 'CL'
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _PLAIN:
+            setattr(self, key, value)
+        elif key == 'source':
+            name, _, flag = str(value).rpartition(' ')
+            if flag in _REGION_BY_FLAG:
+                self.source_name, self.region = _intern(name), _REGION_BY_FLAG[flag]
+            else:
+                self.source_name, self.region = _intern(value), None
+        elif key == 'date':
+            # Se guarda interpretada; un texto no reconocido se conserva tal cual
+            self._date = (parse_date(value) or value or None) if isinstance(value, str) else value
+        elif key == 'full_content':
+            self._content = None if value is None or value == self.summary else value
+        elif key == 'content_length':
+            pass  # Se deriva de full_content
+        elif key == 'is_chilean_source':
+            self.region = 'CL' if value else 'INT'
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _PLAIN:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif key == 'is_chilean_source' and self.region is not None:
+            self.region = None
+        elif key not in KEYS and self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in KEYS:
+            if key in _PLAIN:
+                if hasattr(self, key):
+                    yield key
+            elif key != 'is_chilean_source' or self.region is not None:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Article({self.title!r}, {self.url!r}, {self.source!r})"
+
+    # --- Conversión JSON -----------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Article':
+        """Artículo desde un diccionario con el esquema de los JSON de salida"""
+        article = cls.__new__(cls)
+        article.source_name, article.region = '', None
+        article._date = article._content = article._extra = None
+        article.title = article.url = article.summary = article.image_url = ''
+        # El resumen primero, para reconocer un full_content que lo repite
+        article.summary = data.get('summary') or ''
+        for key, value in data.items():
+            if key != 'content_length':
+                article[key] = value
+        return article
+
+
+def json_default(value: Any) -> Any:
+    """Hook `default` de json.dump(s) para serializar Article dentro de cualquier estructura"""
+    if isinstance(value, Article):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_articles(articles: Iterable[Article], **kwargs: Any) -> str:
+    return json.dumps([article.to_dict() for article in articles], ensure_ascii=False, **kwargs)
+
+
+def loads_articles(text: str) -> List[Article]:
+    data = json.loads(text)
+    items = data.get('articles', []) if isinstance(data, dict) else data
+    return [Article.from_dict(item) for item in items]
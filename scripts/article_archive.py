@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Archivo histórico de noticias (SQLite + FTS5)
+Cada scraper agrega aquí lo que publica, así que el historial sobrevive a la
+sobreescritura de iso_news.json, cms2.json y emol_pyme_noticias.json. Incluye
+un índice de texto completo sobre título, resumen y contenido (sin acentos) e
+índices por fecha, fuente y norma ISO, para consultar en milisegundos.
+
+Uso (desde la raíz del repositorio):
+    python scripts/article_archive.py import [dataset ...]
+    python scripts/article_archive.py search [texto] [--standard 9001] [--since AAAA-MM-DD]
+        [--until AAAA-MM-DD] [--chilean | --international] [--source S] [--limit N] [--prefix]
+    python scripts/article_archive.py stats
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+from urllib.parse import urlsplit
+
+from article import json_default
+from config_iso_scraper import ARCHIVE, ENRICHMENT
+from date_parsing import parse_date
+from enrich_news import load_dataset
+from url_utils import canonicalize_url
+
+# Normas citadas en el texto: "ISO 9001", "ISO/IEC 27001", "ISO 45001:2018" (no "ISO 2015")
+_STANDARD_RE = re.compile(r'\bISO(?:\s*/\s*IEC)?[\s-]*(?!(?:19|20)\d\d\b)(\d{3,5})\b', re.IGNORECASE)
+_FTS_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,  -- URL canónica, con '#<key>' en datasets que la repiten
+    dataset TEXT NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    content TEXT NOT NULL,
+    published TEXT,
+    is_chilean INTEGER NOT NULL,
+    image_url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, published);
+CREATE INDEX IF NOT EXISTS idx_articles_chilean ON articles (is_chilean, published);
+
+CREATE TABLE IF NOT EXISTS article_standards (
+    standard TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (standard, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_standards_article ON article_standards (article_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content,
+    content='articles', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- El índice FTS sigue a la tabla (contenido externo: el texto no se guarda dos veces)
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary, content)
+    VALUES (new.id, new.title, new.summary, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary, content)
+    VALUES ('delete', old.id, old.title, old.summary, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, summary, content ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary, content)
+    VALUES ('delete', old.id, old.title, old.summary, old.content);
+    INSERT INTO articles_fts (rowid, title, summary, content)
+    VALUES (new.id, new.title, new.summary, new.content);
+END;
+"""
+
+DateLike = Union[None, str, date]
+
+# PRAGMA user_version del esquema actual (1: registros de datasets con `key` identificados por URL + clave)
+_SCHEMA_VERSION = 1
+
+
+def extract_standards(*texts: Optional[str]) -> List[str]:
+    """Normas ISO mencionadas, normalizadas como 'ISO 9001'"""
+    found = set()
+    for text in texts:
+        if text:
+            found.update(f"ISO {number}" for number in _STANDARD_RE.findall(text))
+    return sorted(found)
+
+
+def normalize_standard(value: str) -> str:
+    """'9001', 'iso9001' o 'ISO 9001' -> 'ISO 9001'"""
+    digits = re.sub(r'\D', '', value)
+    return f"ISO {digits}" if digits else value.strip()
+
+
+def fts_query(text: str, prefix: bool = False) -> str:
+    """
+    Texto libre -> consulta FTS5: cada palabra entre comillas (sin operadores
+    accidentales); con `prefix` la última vale como prefijo, para buscar
+    mientras se escribe (más lento: combina las listas de todos los términos)
+    """
+    tokens = _FTS_TOKEN_RE.findall(text)
+    if not tokens:
+        return ''
+    quoted = [f'"{token}"' for token in tokens]
+    if prefix:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _iso_date(value: DateLike) -> Optional[str]:
+    if isinstance(value, date):
+        return value.isoformat()
+    parsed = parse_date(value) if value else None
+    return parsed.isoformat() if parsed else None
+
+
+class ArticleArchive:
+    """
+    Base de datos de todas las noticias publicadas por los scrapers, con
+    búsqueda por texto, norma, rango de fechas, origen y fuente
+    """
+
+    def __init__(self, path: str = ARCHIVE['path'], datasets: Dict[str, Dict[str, Any]] = ARCHIVE['datasets']):
+        self.path = path
+        self.datasets = datasets
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        # Título pesa más que resumen y resumen más que contenido
+        self._conn.execute("INSERT INTO articles_fts (articles_fts, rank) VALUES ('rank', ?)",
+                           (f"bm25({', '.join(str(w) for w in ARCHIVE['rank_weights'])})",))
+        self._conn.commit()
+        self.rank_window = ARCHIVE['rank_window']
+        self._lock = threading.Lock()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # Antes, los registros que comparten URL se pisaban entre sí: se descarta el
+            # sobreviviente, sin clave, y la próxima importación los agrega a todos
+            for name, fields in self.datasets.items():
+                if fields.get('key'):
+                    self._conn.execute("DELETE FROM articles WHERE dataset = ? AND url NOT LIKE '%#%'", (name,))
+        self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    # --- Escritura -----------------------------------------------------
+
+    def _row(self, dataset: str, item: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Columnas del archivo a partir de un registro con los campos de su dataset"""
+        fields = self.datasets[dataset]
+        url = item.get(fields['url']) or ''
+        key = canonicalize_url(url)
+        if not key:
+            return None
+        # canonicalize_url quita el fragmento, así que '#<clave>' no choca con URLs reales
+        if fields.get('key') and item.get(fields['key']):
+            key = f"{key}#{item[fields['key']]}"
+
+        published = None
+        for field in fields['date']:
+            published = _iso_date(item.get(field))
+            if published:
+                break
+
+        chilean = fields.get('chilean')
+        if isinstance(chilean, str):
+            chilean = item.get(chilean)
+        if chilean is None:
+            chilean = (urlsplit(url).hostname or '').endswith('.cl')
+
+        title = str(item.get(fields['title']) or '')
+        summary = str(item.get(fields['summary']) or '') if fields.get('summary') else ''
+        content = str(item.get(fields['content']) or '') if fields.get('content') else ''
+        return {
+            'url': key,
+            'dataset': dataset,
+            'source': fields.get('source_name') or str(item.get(fields.get('source', '')) or ''),
+            'title': title,
+            'summary': summary,
+            # Sin repetir en el índice un contenido igual al resumen
+            'content': '' if content == summary else content,
+            'published': published,
+            'is_chilean': int(bool(chilean)),
+            'image_url': item.get(fields.get('image', '')) or None,
+            'payload': json.dumps(item, ensure_ascii=False, default=json_default),
+        }
+
+    def add(self, dataset: str, items: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Agrega o actualiza (por URL canónica, más `key` si el dataset la define) los registros de un dataset
+
+        Returns:
+            int: Registros archivados
+        """
+        now = datetime.now().isoformat()
+        rows = [row for row in (self._row(dataset, item) for item in items) if row]
+        with self._lock, self._conn:
+            for row in rows:
+                article_id = self._conn.execute(
+                    """INSERT INTO articles (url, dataset, source, title, summary, content, published,
+                                             is_chilean, image_url, first_seen, last_seen, payload)
+                       VALUES (:url, :dataset, :source, :title, :summary, :content, :published,
+                               :is_chilean, :image_url, :now, :now, :payload)
+                       ON CONFLICT(url) DO UPDATE SET
+                           dataset = excluded.dataset, source = excluded.source,
+                           title = excluded.title, summary = excluded.summary, content = excluded.content,
+                           published = COALESCE(excluded.published, published),
+                           is_chilean = excluded.is_chilean, image_url = excluded.image_url,
+                           last_seen = excluded.last_seen, payload = excluded.payload
+                       RETURNING id""",
+                    {**row, 'now': now}
+                ).fetchone()[0]
+                self._conn.execute("DELETE FROM article_standards WHERE article_id = ?", (article_id,))
+                self._conn.executemany(
+                    "INSERT INTO article_standards (standard, article_id) VALUES (?, ?)",
+                    [(standard, article_id)
+                     for standard in extract_standards(row['title'], row['summary'], row['content'])]
+                )
+        return len(rows)
+
+    def import_dataset(self, name: str) -> Optional[int]:
+        """Archiva el JSON actual de un dataset de ENRICHMENT (None si no se pudo leer)"""
+        _, items = load_dataset(name, ENRICHMENT['datasets'][name])
+        if items is None:
+            return None
+        return self.add(name, items)
+
+    # --- Consulta ------------------------------------------------------
+
+    def search(self, text: Optional[str] = None, standard: Optional[str] = None,
+               since: DateLike = None, until: DateLike = None, chilean: Optional[bool] = None,
+               source: Optional[str] = None, dataset: Optional[str] = None,
+               limit: int = ARCHIVE['default_limit'], offset: int = 0,
+               prefix: bool = False) -> List[Dict[str, Any]]:
+        """
+        Busca en el archivo; todos los filtros son opcionales y se combinan
+
+        Args:
+            text: Palabras a buscar en título, resumen y contenido (sin
+                distinguir acentos; con `prefix` la última vale como prefijo)
+            standard: Norma citada ('9001' o 'ISO 9001')
+            since, until: Rango de fechas de publicación (inclusive)
+            chilean: True solo fuentes chilenas, False solo internacionales
+            source: Nombre de la fuente (prefijo, ej. 'Emol')
+
+        Returns:
+            List[Dict]: Registros originales, por relevancia si hay texto y
+            si no por fecha (más recientes primero), con `archive` agregado.
+            Con texto, la relevancia se calcula primero sobre las últimas
+            ARCHIVE['rank_window'] coincidencias archivadas (ver abajo)
+        """
+        query = fts_query(text or '', prefix)
+        if text and not query:
+            return []
+
+        joins, where, params = [], [], []
+        if query:
+            joins.append("JOIN articles_fts f ON f.rowid = a.id")
+            where.append("articles_fts MATCH ?")
+            params.append(query)
+        if standard:
+            joins.append("JOIN article_standards s ON s.article_id = a.id AND s.standard = ?")
+            params.insert(0, normalize_standard(standard))
+        if since:
+            where.append("a.published >= ?")
+            params.append(_iso_date(since))
+        if until:
+            where.append("a.published <= ?")
+            params.append(_iso_date(until))
+        if chilean is not None:
+            where.append("a.is_chilean = ?")
+            params.append(int(chilean))
+        if source:
+            where.append("a.source LIKE ? ESCAPE '\\'")
+            params.append(re.sub(r'([%_\\])', r'\\\1', source) + '%')
+        if dataset:
+            where.append("a.dataset = ?")
+            params.append(dataset)
+
+        def run(extra_where: List[str], extra_params: List[Any]) -> List[sqlite3.Row]:
+            conditions = where + extra_where
+            sql = (
+                "SELECT a.dataset, a.source, a.published, a.is_chilean, a.payload FROM articles a "
+                + " ".join(joins)
+                + (" WHERE " + " AND ".join(conditions) if conditions else "")
+                + (" ORDER BY f.rank, a.published DESC" if query else " ORDER BY a.published DESC, a.id DESC")
+                + " LIMIT ? OFFSET ?"
+            )
+            return self._conn.execute(sql, params + extra_params + [limit, offset]).fetchall()
+
+        with self._lock:
+            if not query:
+                rows = run([], [])
+            else:
+                # bm25 puntúa todas las coincidencias: con un término muy común eso
+                # son cientos de miles. Se rankean primero las `rank_window` archivadas
+                # por primera vez más tarde (mayor id, no necesariamente las de fecha
+                # de publicación más reciente ni las de mejor bm25) y solo si no
+                # alcanzan `limit` se recorre el resto.
+                floor = self._conn.execute(
+                    "SELECT rowid FROM articles_fts WHERE articles_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                    (query, max(self.rank_window, limit + offset) - 1)
+                ).fetchone()
+                rows = run(["f.rowid >= ?"], [floor[0]]) if floor else []
+                if len(rows) < limit:
+                    rows = run([], [])
+
+        results = []
+        for row in rows:
+            item = json.loads(row['payload'])
+            item['archive'] = {
+                'dataset': row['dataset'],
+                'source': row['source'],
+                'published': row['published'],
+                'is_chilean': bool(row['is_chilean']),
+            }
+            results.append(item)
+        return results
+
+    def standards(self) -> Dict[str, int]:
+        """Cantidad de noticias archivadas por norma"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT standard, COUNT(*) FROM article_standards GROUP BY standard ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return {standard: count for standard, count in rows}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total, chilean, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(is_chilean), 0), MIN(published), MAX(published) FROM articles"
+            ).fetchone()
+            by_dataset = dict(self._conn.execute(
+                "SELECT dataset, COUNT(*) FROM articles GROUP BY dataset ORDER BY dataset"
+            ).fetchall())
+        return {
+            'articles': total,
+            'chilean': chilean,
+            'international': total - chilean,
+            'oldest': oldest,
+            'newest': newest,
+            'by_dataset': by_dataset,
+        }
+
+    def optimize(self) -> None:
+        """Compacta los segmentos del índice FTS (útil después de importaciones grandes)"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_archive: Optional[ArticleArchive] = None
+_default_archive_lock = threading.Lock()
+
+
+def get_default_archive() -> ArticleArchive:
+    """Archivo compartido del proceso, en ARCHIVE['path']"""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = ArticleArchive()
+        return _default_archive
+
+
+def archive_articles(dataset: str, items: Iterable[Mapping[str, Any]],
+                     logger: Optional[logging.Logger] = None) -> Optional[int]:
+    """
+    Archiva lo que acaba de publicar un scraper. Un error del archivo no
+    debe hacer fallar la ejecución: se informa y se devuelve None
+    """
+    try:
+        return get_default_archive().add(dataset, items)
+    except sqlite3.Error as e:
+        message = f"No se pudo archivar {dataset}: {e}"
+        if logger:
+            logger.warning(message)
+        else:
+            print(f"⚠️ {message}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archivo histórico de noticias con búsqueda de texto completo")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help="Archivar los JSON actuales de los datasets")
+    importer.add_argument('datasets', nargs='*', default=list(ARCHIVE['datasets']))
+
+    search = commands.add_parser('search', help="Buscar noticias archivadas")
+    search.add_argument('text', nargs='?')
+    search.add_argument('--standard')
+    search.add_argument('--since')
+    search.add_argument('--until')
+    origin = search.add_mutually_exclusive_group()
+    origin.add_argument('--chilean', dest='chilean', action='store_const', const=True)
+    origin.add_argument('--international', dest='chilean', action='store_const', const=False)
+    search.add_argument('--source')
+    search.add_argument('--dataset', choices=list(ARCHIVE['datasets']))
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--prefix', action='store_true', help="La última palabra vale como prefijo")
+
+    commands.add_parser('stats', help="Resumen del archivo")
+    args = parser.parse_args()
+
+    archive = ArticleArchive()
+    if args.command == 'import':
+        for name in args.datasets:
+            count = archive.import_dataset(name)
+            if count is not None:
+                print(f"✅ {name}: {count} noticias archivadas")
+        archive.optimize()
+        print(f"📚 {archive.stats()}")
+    elif args.command == 'search':
+        start = datetime.now()
+        results = archive.search(args.text, args.standard, args.since, args.until, args.chilean,
+                                 args.source, args.dataset, args.limit, prefix=args.prefix)
+        elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+        for item in results:
+            meta = item['archive']
+            title = item.get('title') or item.get('titulo') or item.get('texto') or ''
+            flag = '🇨🇱' if meta['is_chilean'] else '🌍'
+            print(f"{meta['published'] or '----------'} {flag} [{meta['source']}] {title[:90]}")
+        print(f"🔎 {len(results)} resultados en {elapsed_ms:.1f}ms")
+    else:
+        print(json.dumps({**archive.stats(), 'standards': archive.standards()}, ensure_ascii=False, indent=2))
+    archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Extracción del contenido completo de artículos con un pool de hilos acotado
+Descarga en paralelo entre dominios, respeta CONFIG['delay_between_requests']
+por dominio, corta al agotar el presupuesto de tiempo global y extrae el
+contenido con CSS_SELECTORS
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from config_iso_scraper import CONFIG, CSS_SELECTORS, RESILIENCE
+from date_parsing import parse_date
+from html_parsing import make_soup
+from resilience import ResilientClient
+from run_metrics import RunMetrics
+
+# Largo mínimo para aceptar un bloque como contenido del artículo
+MIN_CONTENT_LENGTH = 200
+
+
+class DomainThrottle:
+    """
+    Garantiza una pausa mínima entre requests al mismo dominio, sin frenar
+    las descargas a otros dominios
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> float:
+        """Reserva el próximo turno del dominio y espera hasta él; devuelve lo esperado"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.delay
+        waited = slot - now
+        if waited > 0:
+            time.sleep(waited)
+        return waited
+
+
+class ArticleExtractor:
+    """
+    Pool de hilos que completa `full_content`, `content_length` y
+    `scraping_success` para una lista de artículos
+    """
+
+    def __init__(self, session: requests.Session,
+                 max_workers: int = CONFIG['max_concurrent_extractions'],
+                 delay: float = CONFIG['delay_between_requests'],
+                 timeout: float = CONFIG['timeout_seconds'],
+                 time_budget: float = CONFIG['extraction_time_budget_seconds'],
+                 selectors: Dict[str, List[str]] = CSS_SELECTORS,
+                 logger: Optional[logging.Logger] = None,
+                 metrics: Optional[RunMetrics] = None):
+        self.session = session
+        self.max_workers = max(1, max_workers)
+        self.throttle = DomainThrottle(delay)
+        self.timeout = timeout
+        self.time_budget = time_budget
+        self.selectors = selectors
+        self.logger = logger or logging.getLogger(__name__)
+        self.metrics = metrics
+        # Un host caído abre su circuito y sus artículos fallan de inmediato
+        self.http = ResilientClient(session, metrics=metrics, logger=self.logger,
+                                    timeout=(RESILIENCE['connect_timeout_seconds'], timeout))
+
+    def _select_text(self, soup: BeautifulSoup, field: str) -> str:
+        for selector in self.selectors.get(field, []):
+            element = soup.select_one(selector)
+            if element is None:
+                continue
+            if field == 'date' and element.get('datetime'):
+                return element['datetime'].strip()
+            text = element.get_text(' ', strip=True)
+            if text:
+                return text
+        return ''
+
+    def _select_content(self, soup: BeautifulSoup) -> str:
+        for selector in self.selectors.get('content', []):
+            for element in soup.select(selector):
+                text = element.get_text(' ', strip=True)
+                if len(text) >= MIN_CONTENT_LENGTH:
+                    return text
+        # Sin contenedor reconocible: unir los párrafos de la página
+        return ' '.join(p.get_text(' ', strip=True) for p in soup.find_all('p')).strip()
+
+    def extract(self, html: str) -> Dict[str, str]:
+        """
+        Extrae título, contenido, fecha y autor de una página con CSS_SELECTORS
+        """
+        soup = make_soup(html)
+        for element in soup(['script', 'style', 'noscript']):
+            element.decompose()
+        return {
+            'title': self._select_text(soup, 'title'),
+            'content': self._select_content(soup),
+            'date': self._select_text(soup, 'date'),
+            'author': self._select_text(soup, 'author'),
+        }
+
+    def _scrape_one(self, article: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        """Descarga y extrae un artículo; devuelve solo los campos a actualizar"""
+        url = article.get('url', '')
+        host = urlsplit(url).hostname or ''
+
+        self.throttle.wait(host)
+        if time.monotonic() >= deadline:
+            return {'scraping_success': False, 'scraping_error': 'time_budget_exceeded'}
+
+        start = time.monotonic()
+        try:
+            # Sin reintentos que terminen después del presupuesto de tiempo
+            response = self.http.get(url, deadline=deadline)
+            response.raise_for_status()
+            extracted = self.extract(response.text)
+        except Exception as e:
+            self.logger.warning(f"No se pudo extraer {url}: {str(e)}")
+            if self.metrics and isinstance(e, requests.RequestException) and e.response is None:
+                self.metrics.record_error(url)
+            return {'scraping_success': False, 'scraping_error': str(e)}
+        finally:
+            if self.metrics:
+                self.metrics.record_latency('extract', time.monotonic() - start)
+
+        content = extracted['content']
+        updates = {
+            'full_content': content,
+            'content_length': len(content),
+            'scraping_success': bool(content),
+        }
+        if not article.get('title') and extracted['title']:
+            updates['title'] = extracted['title']
+        if extracted['author']:
+            updates['author'] = extracted['author']
+        published = parse_date(extracted['date'])
+        if published and not article.get('published_at'):
+            updates['published_at'] = published.isoformat()
+        return updates
+
+    @staticmethod
+    def _interleave_by_domain(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Intercalar dominios para que los hilos no esperen todos al mismo host
+        by_domain: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        for article in articles:
+            by_domain.setdefault(urlsplit(article.get('url', '')).hostname or '', []).append(article)
+        queues = list(by_domain.values())
+        ordered = []
+        while queues:
+            ordered.extend(queue.pop(0) for queue in queues)
+            queues = [queue for queue in queues if queue]
+        return ordered
+
+    def scrape(self, articles: List[Dict[str, Any]],
+               max_articles: int = CONFIG['max_articles_detailed']) -> List[Dict[str, Any]]:
+        """
+        Descarga y extrae hasta `max_articles` artículos dentro del presupuesto
+        de tiempo; el resto se devuelve sin contenido completo y marcado como
+        no extraído (`scraping_error='not_selected'`)
+        """
+        start = time.monotonic()
+        deadline = start + self.time_budget
+        selected = [a for a in articles if a.get('url')][:max_articles]
+        selected_ids = {id(a) for a in selected}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {executor.submit(self._scrape_one, article, deadline): article
+                   for article in self._interleave_by_domain(selected)}
+        done, pending = wait(futures, timeout=self.time_budget)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # Solo se aplican resultados terminados; lo pendiente queda marcado como fallido
+        for future, article in futures.items():
+            if future in done:
+                article.update(future.result())
+            else:
+                article.update({'scraping_success': False, 'scraping_error': 'time_budget_exceeded'})
+
+        successes = sum(1 for a in selected if a.get('scraping_success'))
+        if self.metrics:
+            self.metrics.record_failure('extract', len(selected) - successes)
+        self.logger.info(
+            f"Extraídos {successes}/{len(selected)} artículos en {time.monotonic() - start:.1f}s "
+            f"({len(pending)} sin terminar por presupuesto de tiempo)"
+        )
+        rest = [a for a in articles if id(a) not in selected_ids]
+        for article in rest:
+            article.update({'scraping_success': False, 'scraping_error': 'not_selected'})
+        return selected + rest
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del re-fechado del archivo completo
+Parsea todas las fechas de cms2.json y emol_pyme_noticias.json con
+date_parsing.parse_date (en frío y con caché) y con el método anterior
+basado en str.replace + strptime
+
+Uso (desde la raíz del repositorio):
+    python scripts/benchmarks/bench_date_parsing.py [--repeat N]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from date_parsing import parse_date  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src', 'data')
+
+MONTHS_ES = {
+    'enero': 'January', 'febrero': 'February', 'marzo': 'March',
+    'abril': 'April', 'mayo': 'May', 'junio': 'June',
+    'julio': 'July', 'agosto': 'August', 'septiembre': 'September',
+    'octubre': 'October', 'noviembre': 'November', 'diciembre': 'December'
+}
+
+
+def legacy_parse(date_str):
+    """Método anterior de ISONewsScraperReal.parse_date (sin el respaldo a hoy)"""
+    date_clean = date_str.strip().lower()
+    for es_month, en_month in MONTHS_ES.items():
+        date_clean = date_clean.replace(es_month, en_month)
+    for fmt in ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d de %B de %Y", "%d %B %Y"):
+        try:
+            return datetime.datetime.strptime(date_clean, fmt.lower()).date()
+        except ValueError:
+            continue
+    return None
+
+
+def load_dates():
+    with open(os.path.join(DATA_DIR, 'cms2.json'), encoding='utf-8') as f:
+        dates = [item['fecha'] for item in json.load(f)['noticias']]
+    with open(os.path.join(DATA_DIR, 'emol_pyme_noticias.json'), encoding='utf-8') as f:
+        dates += [item['fecha'] for item in json.load(f)]
+    return dates
+
+
+def timed(func, dates, repeat, before=None):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        result = [func(text) for text in dates]
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, sum(1 for value in result if value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    dates = load_dates()
+    print(f"📅 {len(dates)} fechas del archivo (mejor de {args.repeat} ejecuciones)")
+    for name, func, before in (
+        ('strptime anterior', legacy_parse, None),
+        ('parse_date en frío', parse_date, parse_date.cache_clear),
+        ('parse_date con caché', parse_date, None),
+    ):
+        elapsed, parsed = timed(func, dates, args.repeat, before)
+        print(f"{name:<22} {elapsed:>8.2f}ms  {parsed}/{len(dates)} reconocidas")
+
+
+if __name__ == "__main__":
+    main()
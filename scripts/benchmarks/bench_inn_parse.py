@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del parseo del listado de noticias del INN
+Compara los backends de BeautifulSoup disponibles y la búsqueda anterior
+(un soup.select por selector) contra el recorrido único de SelectorSet
+
+Uso (desde la raíz del repositorio):
+    python scripts/benchmarks/bench_inn_parse.py [archivo.html] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from html_parsing import make_soup  # noqa: E402
+from iso_news_scraper_real import NEWS_SELECTORS  # noqa: E402
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'inn_noticias.html')
+BACKENDS = ['html.parser', 'lxml', 'html5lib']
+
+
+def available_backends():
+    backends = []
+    for parser in BACKENDS:
+        try:
+            make_soup('<p></p>', parser)
+            backends.append(parser)
+        except Exception:
+            continue
+    return backends
+
+
+def select_per_selector(soup):
+    """Búsqueda anterior: un recorrido completo del documento por selector"""
+    items = []
+    for selector in NEWS_SELECTORS.selectors:
+        items.extend(soup.select(selector))
+    return items
+
+
+def select_single_pass(soup):
+    return NEWS_SELECTORS.select_distinct(soup)
+
+
+def timed(func, repeat):
+    """Mejor tiempo en ms de `repeat` ejecuciones y el último resultado"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('html', nargs='?', default=DEFAULT_FIXTURE)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.html, encoding='utf-8') as f:
+        markup = f.read()
+    print(f"📄 {args.html} ({len(markup) / 1024:.0f} KB, mejor de {args.repeat} ejecuciones)")
+    print(f"{'backend':<12} {'parseo':>10} {'7x select':>12} {'una pasada':>12} {'total':>10}  elementos")
+
+    for backend in available_backends():
+        parse_ms, soup = timed(lambda: make_soup(markup, backend), args.repeat)
+        old_ms, old_items = timed(lambda: select_per_selector(soup), args.repeat)
+        new_ms, new_items = timed(lambda: select_single_pass(soup), args.repeat)
+        print(f"{backend:<12} {parse_ms:>8.2f}ms {old_ms:>10.2f}ms {new_ms:>10.2f}ms "
+              f"{parse_ms + new_ms:>8.2f}ms  {len(old_items)} -> {len(new_items)}")
+
+
+if __name__ == "__main__":
+    main()
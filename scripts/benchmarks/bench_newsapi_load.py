@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de search_newsapi contra el NewsAPI local
+Levanta newsapi_mock_server.py en el mismo proceso, apunta el scraper a él y
+ejecuta N consultas con el motor concurrente, el limitador y la cuota del
+scraper. Reporta throughput, espera en el limitador, consumo de cuota y las
+respuestas 429 vistas por el cliente frente a las emitidas por el servidor.
+
+Uso (desde la raíz del repositorio):
+    python scripts/benchmarks/bench_newsapi_load.py [--queries N] [--rps R] [--burst B] [--workers W]
+        [--latency-ms MS] [--429-every N] [--429-burst M] [--quota Q]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fetch_engine import ConcurrentFetcher, TokenBucket  # noqa: E402
+from iso_news_scraper_newsapi import ISONewsScraperNewsAPI  # noqa: E402
+from newsapi_mock_server import MockNewsAPI, start_server  # noqa: E402
+from query_planner import QuotaTracker  # noqa: E402
+from state_store import ArticleStateStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--rps', type=float, default=200, help="Tasa del limitador del cliente")
+    parser.add_argument('--burst', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--jitter-ms', type=float, default=5)
+    parser.add_argument('--429-every', dest='rate_limit_every', type=int, default=0)
+    parser.add_argument('--429-burst', dest='rate_limit_burst', type=int, default=1)
+    parser.add_argument('--results-per-query', type=int, default=30)
+    parser.add_argument('--quota', type=int, default=0, help="Cuota de requests (0 = una por consulta)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    backend = MockNewsAPI(args.latency_ms, args.jitter_ms, args.rate_limit_every, args.rate_limit_burst,
+                          results_per_query=args.results_per_query)
+    server, base_url = start_server(backend)
+
+    scraper = ISONewsScraperNewsAPI(output_dir=tempfile.mkdtemp(prefix='bench-'),
+                                    state=ArticleStateStore(':memory:'))
+    scraper.newsapi_base_url = base_url
+    scraper.rate_limiter = TokenBucket(args.rps, args.burst)
+    scraper.fetcher = ConcurrentFetcher(args.workers, scraper.logger)
+    scraper.quota = QuotaTracker(args.quota or args.queries, scraper.logger)
+
+    queries = [f"(ISO AND {9000 + i})" for i in range(args.queries)]
+    start = time.monotonic()
+    results = scraper.fetcher.map(lambda q: list(scraper.search_newsapi(q)), queries)
+    elapsed = time.monotonic() - start
+    server.shutdown()
+
+    quota = scraper.quota
+    articles = sum(len(result or []) for result in results)
+    print(f"🧪 {args.queries} consultas contra {base_url} "
+          f"(limitador {args.rps}/s ráfaga {args.burst}, {args.workers} hilos, latencia {args.latency_ms}ms)")
+    print(f"⏱️ {scraper.request_count} requests en {elapsed:.2f}s = {scraper.request_count / elapsed:.1f} req/s; "
+          f"{scraper.rate_limiter.waited_seconds:.2f}s acumulados esperando al limitador")
+    print(f"📰 {articles} artículos recibidos")
+    print(f"🎫 Cuota: {quota.used}/{quota.max_requests} usados, {quota.rejected} consultas sin cuota, "
+          f"{quota.rate_limited} respuestas 429 vistas por el cliente")
+    print(f"🖥️ Servidor: {backend.requests} requests, respuestas {dict(sorted(backend.statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark sin red de las rutas calientes de los scrapers
+Mide throughput y memoria máxima por etapa sobre fixtures locales:
+- NewsAPI: payloads JSON sintéticos de 1k/10k/100k artículos (decodificación,
+  de-duplicado por URL canónica, process_newsapi_articles y filtro de relevancia)
+- INN: fixtures/inn_noticias.html (scrape_inn_news), un listado sintético con
+  la estructura de https://www.inn.cl/noticias, no una página guardada del sitio
+
+No abre conexiones: la página del INN se entrega desde el fixture y el estado
+vive en memoria. Apto para CI.
+
+Uso (desde la raíz del repositorio):
+    python scripts/benchmarks/bench_scrapers.py [--sizes 1000,10000,100000] [--repeat N]
+                                                [--inn-pages N] [--inn-html archivo.html] [--no-memory]
+                                                [--json salida.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from iso_news_scraper_newsapi import ISONewsScraperNewsAPI  # noqa: E402
+from iso_news_scraper_real import ISONewsScraperReal  # noqa: E402
+from relevance import get_default_scorer  # noqa: E402
+from state_store import ArticleStateStore  # noqa: E402
+from url_utils import unique_by_url  # noqa: E402
+
+INN_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'inn_noticias.html')
+
+ISO_TOPICS = ['ISO 9001', 'ISO 14001', 'ISO 45001', 'ISO 27001', 'ISO 22000', 'normas ISO', 'certificación ISO']
+ISO_PHRASES = [
+    'Empresas chilenas obtienen la {topic} tras una auditoría de calidad',
+    'Nueva versión de {topic}: qué cambia en los sistemas de gestión',
+    'Auditoría y certificación: guía práctica de {topic} para pymes',
+    'El INN actualiza la norma chilena equivalente a {topic}',
+]
+OTHER_PHRASES = [
+    'Resultados del fútbol chileno: la fecha {n} deja sorpresas',
+    'El dólar cierra la jornada {n} con una leve alza',
+    'Receta del día {n}: empanadas de pino al horno',
+    'Pronóstico del tiempo para la semana {n} en la zona central',
+]
+DOMAINS = ['emol.com', 'latercera.com', 'df.cl', 'biobiochile.cl', 'elpais.com', 'infobae.com', 'iso.org',
+           'clarin.com', 'eltiempo.com', 'example.com']
+URL_VARIANTS = ['{url}', '{url}?utm_source=newsapi&utm_medium=rss', 'https://www.{rest}', '{url}/amp']
+
+
+def synthetic_newsapi_payload(size, seed=0):
+    """
+    Respuesta JSON de /v2/everything con `size` artículos: ~60 % sobre ISO,
+    ~10 % URLs repetidas con variantes de seguimiento/AMP/www
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 8, 1, 12, 0, 0)
+    articles = []
+    for i in range(size):
+        # Una de cada diez noticias repite la URL de una anterior con otra forma
+        if i and rng.random() < 0.1:
+            base = articles[rng.randrange(len(articles))]
+            duplicate = dict(base)
+            rest = base['url'].split('://', 1)[1]
+            duplicate['url'] = rng.choice(URL_VARIANTS).format(url=base['url'], rest=rest)
+            articles.append(duplicate)
+            continue
+
+        domain = rng.choice(DOMAINS)
+        if rng.random() < 0.6:
+            topic = rng.choice(ISO_TOPICS)
+            title = rng.choice(ISO_PHRASES).format(topic=topic)
+            description = f"Las organizaciones que implementan {topic} mejoran su gestión de calidad y procesos."
+        else:
+            title = rng.choice(OTHER_PHRASES).format(n=i)
+            description = 'Noticia general sin relación con normas técnicas.'
+        articles.append({
+            'source': {'id': None, 'name': domain.split('.')[0].title()},
+            'author': f"Redacción {domain}",
+            'title': f"{title} ({i})",
+            'description': description,
+            'url': f"https://{domain}/noticias/{i}-{rng.randrange(10 ** 6)}",
+            'urlToImage': f"https://{domain}/img/{i}.jpg",
+            'publishedAt': (now - timedelta(minutes=7 * i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': (description + ' ') * rng.randint(2, 8) + '[+1200 chars]',
+        })
+    return json.dumps({'status': 'ok', 'totalResults': size, 'articles': articles}, ensure_ascii=False)
+
+
+def measure(func, repeat, memory, setup=None):
+    """
+    Mejor tiempo de `repeat` ejecuciones y, en una ejecución aparte (tracemalloc
+    la hace más lenta), la memoria máxima asignada por la etapa
+
+    Returns:
+        tuple: (segundos, bytes máximos o None, último resultado)
+    """
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def row(stage, size, items, seconds, peak):
+    return {
+        'stage': stage,
+        'size': size,
+        'items': items,
+        'seconds': round(seconds, 4),
+        'items_per_second': round(items / seconds) if seconds else None,
+        'peak_mb': round(peak / 2 ** 20, 2) if peak is not None else None,
+    }
+
+
+def bench_newsapi(sizes, repeat, memory):
+    scraper = ISONewsScraperNewsAPI(output_dir=tempfile.mkdtemp(prefix='bench-'),
+                                    state=ArticleStateStore(':memory:'))
+    scorer = get_default_scorer()
+    rows = []
+    for size in sizes:
+        payload = synthetic_newsapi_payload(size)
+        seconds, peak, data = measure(lambda: json.loads(payload), repeat, memory)
+        rows.append(row('newsapi json', size, size, seconds, peak))
+
+        articles = data['articles']
+        seconds, peak, unique = measure(lambda: unique_by_url(articles), repeat, memory)
+        rows.append(row('url dedupe', size, len(articles), seconds, peak))
+
+        # El estado está vacío: todos los artículos se procesan como nuevos
+        seconds, peak, processed = measure(lambda: scraper.process_newsapi_articles(unique), repeat, memory)
+        rows.append(row('process_newsapi_articles', size, len(unique), seconds, peak))
+
+        seconds, peak, _ = measure(lambda: scorer.filter(processed), repeat, memory)
+        rows.append(row('relevance filter', size, len(processed), seconds, peak))
+    return rows
+
+
+def bench_inn(pages, repeat, memory, html_path=INN_FIXTURE):
+    with open(html_path, encoding='utf-8') as f:
+        markup = f.read()
+    scraper = ISONewsScraperReal(state=ArticleStateStore(':memory:'))
+    scraper.get_page_content = lambda url: markup
+
+    def scrape_pages():
+        items = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(pages):
+                items += len(scraper.scrape_inn_news())
+                scraper.state.rollback()  # Cada página cuenta como nueva
+        return items
+
+    seconds, peak, items = measure(scrape_pages, repeat, memory, setup=scraper.state.rollback)
+    return [row('scrape_inn_news', pages, items, seconds, peak)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Artículos NewsAPI por payload")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--inn-pages', type=int, default=20, help="Veces que se procesa el listado del INN")
+    parser.add_argument('--inn-html', default=INN_FIXTURE,
+                        help="Listado del INN a procesar (p. ej. una copia guardada de inn.cl/noticias)")
+    parser.add_argument('--no-memory', action='store_true', help="Omitir la medición con tracemalloc")
+    parser.add_argument('--json', help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    # Los scrapers registran cada paso en INFO; aquí solo interesan los tiempos
+    logging.disable(logging.INFO)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    memory = not args.no_memory
+
+    print(f"⏱️ Mejor de {args.repeat} ejecuciones por etapa"
+          f"{'; memoria máxima en una ejecución aparte' if memory else ''}")
+    rows = bench_newsapi(sizes, args.repeat, memory) + bench_inn(args.inn_pages, args.repeat, memory, args.inn_html)
+
+    print(f"{'etapa':<26} {'tamaño':>8} {'elementos':>10} {'tiempo':>10} {'elem/s':>10} {'memoria':>10}")
+    for result in rows:
+        peak = f"{result['peak_mb']:.2f}MB" if result['peak_mb'] is not None else '-'
+        rate = result['items_per_second'] if result['items_per_second'] is not None else '-'
+        print(f"{result['stage']:<26} {result['size']:>8} {result['items']:>10} "
+              f"{result['seconds'] * 1000:>8.1f}ms {rate:>10} {peak:>10}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'repeat': args.repeat,
+                'results': rows,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"📄 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
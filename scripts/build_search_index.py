@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Índice invertido estático para la búsqueda de noticias en el navegador
+Recorre los datasets de ENRICHMENT (cms2, iso_news, emol_pyme) y escribe en
+public/search un manifiesto, los postings repartidos en buckets por prefijo
+del token y las fichas de las noticias en fragmentos por id. El buscador del
+sitio descarga solo los buckets de los prefijos escritos y las fichas de los
+resultados que muestra, nunca los datasets completos.
+
+Tokens: minúsculas sin acentos (NFKD), solo [a-z0-9], sin stopwords. Ids de
+documento por fecha (0 = la más reciente), así que un empate de puntaje se
+resuelve a favor de la noticia más nueva. Cada término guarda una lista plana
+[delta_id, peso, delta_id, peso, ...] con ids ascendentes.
+
+Uso (desde la raíz del repositorio):
+    python scripts/build_search_index.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config_iso_scraper import ENRICHMENT, SEARCH_INDEX
+from date_parsing import parse_date
+from enrich_news import load_dataset, make_title
+from export_shards import article_slug
+
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+Doc = Tuple[str, str, str, str]  # (título, url, fecha ISO, fuente)
+
+
+def fold(text: str) -> str:
+    """Minúsculas sin tildes ni diéresis ('Gestión' -> 'gestion', 'ñ' -> 'n')"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: str, min_length: int = SEARCH_INDEX['min_token_length'],
+             stopwords: Iterable[str] = SEARCH_INDEX['stopwords']) -> List[str]:
+    """Tokens indexables de un texto, en orden y con repeticiones"""
+    stop = stopwords if isinstance(stopwords, (set, frozenset)) else set(stopwords)
+    return [token for token in _TOKEN_RE.findall(fold(text))
+            if len(token) >= min_length and token not in stop]
+
+
+class SearchIndexBuilder:
+    """
+    Genera manifest.json, idx/<prefijo>.<hash>.json y docs/<n>.<hash>.json
+    bajo `output_dir`. Los nombres llevan el hash del contenido para que el
+    navegador los cachee sin revalidar; solo se reescriben archivos que
+    cambian y se eliminan los que ya no aparecen en el manifiesto.
+    """
+
+    def __init__(self, output_dir: str = SEARCH_INDEX['output_dir'],
+                 datasets: Dict[str, Dict[str, Any]] = SEARCH_INDEX['datasets']):
+        self.output_dir = output_dir
+        self.datasets = datasets
+        self.stopwords = frozenset(SEARCH_INDEX['stopwords'])
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    # --- Documentos ----------------------------------------------------
+
+    def _doc(self, name: str, item: Dict[str, Any]) -> Optional[Tuple[Doc, str]]:
+        """(ficha, texto del cuerpo) de un registro; None si no tiene título ni cuerpo"""
+        spec = self.datasets[name]
+        body = ' '.join(str(item.get(field) or '') for field in spec['body']).strip()
+        title = str(item.get(spec['title']) or '').strip() or make_title(body)
+        if not title:
+            return None
+
+        url = str(item.get(spec['url']) or '')
+        if spec.get('page') and body:
+            url = spec['page'].format(slug=article_slug(item))
+
+        fecha = item.get('fecha_iso')
+        if not fecha:
+            parsed = parse_date(str(item.get(ENRICHMENT['datasets'][name]['date_field']) or ''))
+            fecha = parsed.isoformat() if parsed else ''
+
+        source = spec.get('source_name') or str(item.get(spec.get('source', '')) or '')
+        return (title, url, fecha, source), body
+
+    def collect(self) -> Tuple[List[Doc], List[Tuple[str, str]], Dict[str, int]]:
+        """Fichas y textos (título, cuerpo) de todos los datasets, de la más reciente a la más antigua"""
+        records = []
+        counts = {}
+        seen = set()
+        for name in self.datasets:
+            _, items = load_dataset(name, ENRICHMENT['datasets'][name])
+            counts[name] = 0
+            for item in items or []:
+                result = self._doc(name, item)
+                if result is None or (result[0][1] and result[0][1] in seen):
+                    continue
+                seen.add(result[0][1])
+                records.append(result)
+                counts[name] += 1
+        # Orden estable: sin fecha al final, empates en el orden de los datasets
+        records.sort(key=lambda record: record[0][2], reverse=True)
+        docs = [doc for doc, _ in records]
+        texts = [(doc[0], body) for doc, body in records]
+        return docs, texts, counts
+
+    # --- Índice --------------------------------------------------------
+
+    def postings(self, texts: List[Tuple[str, str]]) -> Dict[str, List[Tuple[int, int]]]:
+        """término -> [(id, peso)] con ids ascendentes; el peso pondera el título"""
+        title_weight = SEARCH_INDEX['title_weight']
+        index: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, (title, body) in enumerate(texts):
+            weights: Dict[str, int] = {}
+            for token in tokenize(title, stopwords=self.stopwords):
+                weights[token] = weights.get(token, 0) + title_weight
+            for token in tokenize(body, stopwords=self.stopwords):
+                weights[token] = weights.get(token, 0) + 1
+            for token, weight in weights.items():
+                index.setdefault(token, []).append((doc_id, weight))
+        return index
+
+    def buckets(self, terms: Dict[str, List[Tuple[int, int]]]) -> Dict[str, List[str]]:
+        """
+        prefijo -> términos. Un bucket con más de `max_bucket_postings`
+        postings se divide con un carácter más de prefijo (hasta
+        `max_prefix_length`); los términos tan cortos como el prefijo quedan
+        en el bucket padre
+        """
+        limit = SEARCH_INDEX['max_bucket_postings']
+        max_length = SEARCH_INDEX['max_prefix_length']
+
+        def split(key: str, members: List[str]) -> Dict[str, List[str]]:
+            size = sum(len(terms[term]) for term in members)
+            if size <= limit or len(key) >= max_length:
+                return {key: members}
+            result: Dict[str, List[str]] = {}
+            children: Dict[str, List[str]] = {}
+            for term in members:
+                if len(term) <= len(key):
+                    result.setdefault(key, []).append(term)
+                else:
+                    children.setdefault(term[:len(key) + 1], []).append(term)
+            for child, child_members in children.items():
+                result.update(split(child, child_members))
+            return result
+
+        top: Dict[str, List[str]] = {}
+        for term in sorted(terms):
+            top.setdefault(term[:SEARCH_INDEX['prefix_length']], []).append(term)
+        result: Dict[str, List[str]] = {}
+        for key, members in top.items():
+            result.update(split(key, members))
+        return result
+
+    @staticmethod
+    def encode(postings: List[Tuple[int, int]]) -> List[int]:
+        flat = []
+        previous = 0
+        for doc_id, weight in postings:
+            flat.extend((doc_id - previous, weight))
+            previous = doc_id
+        return flat
+
+    # --- Escritura -----------------------------------------------------
+
+    def _write(self, subdir: str, stem: str, data: Any) -> str:
+        """Escribe `data` como subdir/<stem>.<hash>.json y devuelve esa ruta relativa"""
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:10]
+        relative = f"{subdir}/{stem}.{digest}.json"
+        path = os.path.join(self.output_dir, relative)
+        if os.path.exists(path):
+            self.unchanged += 1
+            return relative
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.written += 1
+        return relative
+
+    def _prune(self, subdir: str, keep: set) -> None:
+        directory = os.path.join(self.output_dir, subdir)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.endswith('.json') and f"{subdir}/{name}" not in keep:
+                os.remove(os.path.join(directory, name))
+                self.removed += 1
+
+    def build(self) -> Dict[str, Any]:
+        """Escribe el índice completo y devuelve el manifiesto"""
+        docs, texts, counts = self.collect()
+        terms = self.postings(texts)
+
+        bucket_files = {}
+        for key, members in sorted(self.buckets(terms).items()):
+            bucket_files[key] = self._write('idx', key, {term: self.encode(terms[term]) for term in members})
+
+        chunk_size = max(1, SEARCH_INDEX['docs_per_chunk'])
+        doc_files = [
+            self._write('docs', str(n), [list(doc) for doc in docs[start:start + chunk_size]])
+            for n, start in enumerate(range(0, len(docs), chunk_size))
+        ]
+
+        self._prune('idx', set(bucket_files.values()))
+        self._prune('docs', set(doc_files))
+
+        manifest = {
+            'version': INDEX_VERSION,
+            'total': len(docs),
+            'por_dataset': counts,
+            'terminos': len(terms),
+            'min_token': SEARCH_INDEX['min_token_length'],
+            'stopwords': sorted(self.stopwords),
+            'docs_por_fragmento': chunk_size,
+            'docs': doc_files,
+            'buckets': bucket_files,
+        }
+        path = os.path.join(self.output_dir, 'manifest.json')
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+
+        print(f"✅ {len(docs)} noticias, {len(terms)} términos -> {len(bucket_files)} buckets, "
+              f"{len(doc_files)} fragmentos de fichas en {self.output_dir}")
+        print(f"📝 {self.written} archivos escritos, {self.unchanged} sin cambios, {self.removed} eliminados")
+        return manifest
+
+
+if __name__ == "__main__":
+    SearchIndexBuilder().build()
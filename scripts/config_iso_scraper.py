@@ -4,6 +4,11 @@ Archivo de configuración para el scraper de noticias ISO en Chile
 Modifica estos parámetros según tus necesidades específicas
 """
 
+import os
+
+# Directorio local para cachés y estado persistente entre ejecuciones
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
 # Configuración general
 CONFIG = {
     'output_directory': r'C:\Users\jp200\Downloads\newsjp_phyton',
@@ -11,6 +16,105 @@ CONFIG = {
     'max_articles_detailed': 10,  # Máximo de artículos para extraer contenido completo
     'delay_between_requests': 2,  # Segundos de pausa entre requests
     'timeout_seconds': 10,  # Timeout para requests HTTP
+    'max_concurrent_extractions': 4,  # Hilos para extraer contenido completo
+    'extraction_time_budget_seconds': 120,  # Tiempo máximo total de extracción
+}
+
+# Configuración de NewsAPI (cuota y concurrencia)
+NEWSAPI = {
+    'base_url': 'https://newsapi.org/v2',  # La variable NEWSAPI_BASE_URL lo reemplaza (p. ej. newsapi_mock_server.py)
+    'requests_per_second': 1.0,  # Tasa sostenida del limitador (token bucket)
+    'burst': 5,  # Requests permitidos en ráfaga antes de limitar
+    'max_workers': 4,  # Consultas simultáneas
+    'max_requests_per_run': 100,  # Cuota de requests por ejecución (plan developer: 100/día)
+    'page_size': 100,  # Resultados por página (máximo de NewsAPI)
+    'max_pages': 5,  # Páginas máximas por consulta antes de cortar
+    'max_query_length': 500,  # Largo máximo del parámetro q
+}
+
+# Búsqueda internacional en varios idiomas (iso_news_international.py). Comparte la
+# cuota, el limitador y los hilos de NEWSAPI: cada idioma agrega solo sus consultas
+INTERNATIONAL = {
+    'output_file': 'iso_news_international.json',
+    'state_path': os.path.join(CACHE_DIR, 'iso_international_state.sqlite3'),
+    'days_back': 30,
+    # Código de idioma de NewsAPI -> términos de búsqueda
+    'languages': {
+        'es': ['ISO 9001', 'ISO 14001', 'ISO 45001', 'ISO 27001', 'ISO 22000',
+               'certificación ISO', 'normas ISO', 'auditoría ISO'],
+        'en': ['ISO 9001', 'ISO 14001', 'ISO 45001', 'ISO 27001', 'ISO 22000',
+               'ISO certification', 'ISO standard', 'ISO audit'],
+        'pt': ['ISO 9001', 'ISO 14001', 'ISO 45001', 'ISO 27001', 'ISO 22000',
+               'certificação ISO', 'normas ISO', 'auditoria ISO'],
+    },
+}
+
+# Reintentos, timeouts y circuit breaker por host (resilience.py)
+RESILIENCE = {
+    'max_attempts': 4,  # Intentos totales por request
+    'backoff_base_seconds': 0.5,  # Backoff exponencial con jitter: hasta base * 2^intento
+    'backoff_max_seconds': 20,
+    'max_retry_after_seconds': 60,  # Si Retry-After pide más, no se reintenta
+    'retry_statuses': [429, 500, 502, 503, 504],
+    'connect_timeout_seconds': 5,  # El de lectura es CONFIG['timeout_seconds']
+    'breaker_failure_threshold': 5,  # Fallos seguidos que abren el circuito de un host
+    'breaker_reset_seconds': 60,  # Tiempo con el circuito abierto antes de probar de nuevo
+}
+
+# Archivo histórico de noticias con búsqueda de texto completo (article_archive.py)
+ARCHIVE = {
+    'path': os.path.join(CACHE_DIR, 'news_archive.sqlite3'),
+    # Campos de cada dataset de ENRICHMENT['datasets'] -> columnas del archivo. `date`
+    # se prueba en orden; `source`/`chilean` son un campo o, en `source_name`/`chilean`,
+    # un valor fijo. Si no hay campo `chilean`, se usa el dominio (.cl) de la URL.
+    # `key` distingue registros distintos que comparten URL (cms2 repite `link`).
+    'datasets': {
+        'iso_news': {'url': 'url', 'title': 'title', 'summary': 'summary', 'content': 'full_content',
+                     'date': ['date', 'published_at'], 'source': 'source', 'image': 'image_url',
+                     'chilean': 'is_chilean_source'},
+        'cms2': {'url': 'link', 'title': 'titulo', 'summary': 'extracto', 'content': 'texto',
+                 'date': ['fecha'], 'source_name': 'CMS Consultores', 'image': 'imagen', 'chilean': True,
+                 'key': 'slug'},
+        'emol_pyme': {'url': 'link_noticia', 'title': 'titulo', 'summary': None, 'content': None,
+                      'date': ['fecha'], 'source_name': 'Emol', 'image': 'link_imagen', 'chilean': True},
+        'iso_news_international': {'url': 'url', 'title': 'title', 'summary': 'summary', 'content': 'full_content',
+                                   'date': ['date', 'published_at'], 'source': 'source', 'image': 'image_url',
+                                   'chilean': 'is_chilean_source'},
+    },
+    'default_limit': 50,
+    'rank_weights': [10.0, 4.0, 1.0],  # bm25 por columna: título, resumen, contenido
+    'rank_window': 1000,  # Últimas coincidencias archivadas (por id) que se rankean antes de recorrer todas
+}
+
+# Transporte HTTP compartido por todos los scrapers (http_transport.py)
+HTTP_TRANSPORT = {
+    'pool_connections': 32,  # Hosts con pool de conexiones abierto a la vez
+    'max_per_host': 8,  # Requests simultáneos por host (y tamaño de su pool)
+    'host_limits': {  # Límites propios de algunos hosts
+        'www.inn.cl': 4,
+    },
+    'dns_ttl_seconds': 300,  # Vigencia de las resoluciones DNS cacheadas en el proceso
+    'accept_language': 'es-CL,es;q=0.9,en;q=0.6',
+}
+
+# Configuración de la caché HTTP compartida
+HTTP_CACHE = {
+    'path': os.path.join(CACHE_DIR, 'http_cache.sqlite3'),
+    'max_bytes': 50 * 1024 * 1024,  # Tamaño máximo antes de desalojar (LRU)
+    'default_ttl_seconds': 6 * 3600,  # Vigencia si el servidor no envía max-age
+}
+
+# Estado persistente de artículos ya procesados (scraping incremental)
+STATE_STORE = {
+    'path': os.path.join(CACHE_DIR, 'iso_state.sqlite3'),
+    'history_days': 90,  # Días que un artículo no visto se mantiene en la salida
+}
+
+# Métricas operativas por ejecución (una línea JSON por ejecución)
+METRICS = {
+    'path': os.path.join(CACHE_DIR, 'run_metrics.jsonl'),
+    'keep_runs': 90,  # Ejecuciones que se conservan en el historial
+    'percentiles': [50, 90, 99],  # Percentiles de latencia por etapa y por host
 }
 
 # Consultas de búsqueda personalizables
@@ -146,6 +250,20 @@ FILTERS = {
     ]
 }
 
+# Pesos del puntaje de relevancia (por palabra clave de ISO_KEYWORDS encontrada)
+RELEVANCE_WEIGHTS = {
+    'standard': 3,  # Norma específica, ej. 'ISO 9001'
+    'iso_term': 2,  # Término que menciona ISO, ej. 'certificación ISO'
+    'keyword': 1,  # Resto de instituciones, conceptos y sectores
+}
+
+# Detección de noticias casi duplicadas (SimHash + bandas LSH)
+DEDUPE = {
+    'max_hamming_distance': 3,  # Bits de diferencia para considerar dos textos iguales
+    'lsh_bands': 4,  # Debe dividir 64 y ser mayor que max_hamming_distance
+    'min_tokens': 8,  # Textos más cortos solo se agrupan por URL canónica
+}
+
 # Configuración de salida JSON
 JSON_OUTPUT = {
     'indent': 2,
@@ -155,6 +273,121 @@ JSON_OUTPUT = {
     'generate_summary': True,  # Generar archivo resumen adicional
 }
 
+# Reglas de categoría de las noticias del sitio: se evalúan en orden sobre el
+# texto en minúsculas y gana la primera con alguna coincidencia
+CATEGORY_RULES = [
+    ('Noticias Clientes', ['certificación', 'certificacion']),
+    ('Capacitación', ['capacitación', 'capacitacion']),
+    ('Seguridad Alimentaria', ['haccp', 'iso 22000']),
+    ('Seguridad IT', ['iso 27001', 'ciberseguridad']),
+    ('Seguridad Laboral', ['iso 45001', 'seguridad']),
+    ('Gestión Ambiental', ['iso 14001', 'ambiental']),
+    ('Auditoría', ['auditoria']),
+]
+DEFAULT_CATEGORY = 'Noticias Clientes'
+
+# Datos del sitio enriquecidos con campos derivados (rutas relativas a la raíz del repo)
+ENRICHMENT = {
+    'datasets': {
+        'cms2': {'path': 'src/data/cms2.json', 'items_key': 'noticias',
+                 'text_fields': ['texto'], 'date_field': 'fecha', 'slug_fields': ['fecha', 'texto', 'imagen'],
+                 'derive_title': True},
+        'iso_news': {'path': 'src/data/iso_news.json', 'items_key': 'articles',
+                     'text_fields': ['title', 'summary'], 'date_field': 'date', 'slug_fields': ['url']},
+        'emol_pyme': {'path': 'src/data/emol_pyme_noticias.json', 'items_key': None,
+                      'text_fields': ['titulo'], 'date_field': 'fecha', 'slug_fields': ['link_noticia']},
+        'iso_news_international': {'path': 'src/data/iso_news_international.json', 'items_key': 'articles',
+                                   'text_fields': ['title', 'summary'], 'date_field': 'date', 'slug_fields': ['url']},
+    },
+    'title_length': 80,  # Largo máximo del título derivado del texto
+    'excerpt_length': 150,  # Largo del extracto para tarjetas
+}
+
+# Fragmentos de cms2.json para las páginas Astro (rutas relativas a la raíz del repo)
+SHARDS = {
+    'source': 'src/data/cms2.json',
+    'output_dir': 'src/data/shards',
+    'page_size': 24,  # Noticias por archivo de página
+    'slug_words': 8,  # Palabras del texto usadas en el slug
+}
+
+# Feeds RSS/Atom descargados antes del build (rss_prefetch.py)
+RSS_FEEDS = {
+    'output_dir': 'src/data/rss',  # Un <output>.json por salida, con el esquema de iso_news.json
+    # nombre -> URL, archivo de salida (los feeds con la misma salida se combinan),
+    # región de la fuente y nombre fijo (si no, el <source> del ítem o el título del feed)
+    'feeds': {
+        'google_normas_iso_chile': {
+            'url': 'https://news.google.com/rss/search?q=normas+ISO+Chile&hl=es-419&gl=CL&ceid=CL:es-419',
+            'output': 'rss_noticias', 'region': 'CL',
+        },
+        'google_certificacion_iso': {
+            'url': 'https://news.google.com/rss/search?q=certificaci%C3%B3n+ISO&hl=es-419&gl=CL&ceid=CL:es-419',
+            'output': 'rss_noticias', 'region': 'CL',
+        },
+        'wired': {
+            'url': 'https://www.wired.com/feed/rss',
+            'output': 'rss_wired', 'region': 'INT', 'source_name': 'Wired',
+        },
+    },
+    'max_items_per_feed': 30,
+    'summary_length': 300,  # Caracteres del resumen (texto sin HTML)
+    'max_workers': 6,  # Feeds descargados a la vez
+}
+
+# Índice de búsqueda estático para el navegador (generado por build_search_index.py)
+SEARCH_INDEX = {
+    'output_dir': 'public/search',
+    # Campos de cada dataset de ENRICHMENT['datasets']. `page` es la ruta de la
+    # noticia en el sitio (si tiene texto); si no, se enlaza `url`
+    'datasets': {
+        'cms2': {'title': 'titulo', 'body': ['texto'], 'url': 'link', 'page': '/noticias/{slug}/',
+                 'source_name': 'CMS Consultores'},
+        'iso_news': {'title': 'title', 'body': ['summary'], 'url': 'url', 'source': 'source'},
+        'emol_pyme': {'title': 'titulo', 'body': [], 'url': 'link_noticia', 'source_name': 'Emol'},
+    },
+    'title_weight': 3,  # Una aparición en el título vale como tres en el cuerpo
+    'min_token_length': 2,
+    'prefix_length': 2,  # Caracteres del token que eligen su bucket
+    'max_prefix_length': 4,  # Hasta dónde se subdivide un bucket demasiado grande
+    'max_bucket_postings': 4000,
+    'docs_per_chunk': 100,
+    'stopwords': [
+        'al', 'como', 'con', 'de', 'del', 'el', 'en', 'es', 'esta', 'este', 'la', 'las', 'lo', 'los',
+        'mas', 'para', 'pero', 'por', 'que', 'se', 'si', 'sin', 'su', 'sus', 'un', 'una', 'y',
+        'and', 'for', 'in', 'of', 'on', 'the', 'to', 'with',
+    ],
+}
+
+# Variantes responsivas de public/images (rutas relativas a la raíz del repo)
+IMAGES = {
+    'source_dir': 'public/images',
+    'public_root': 'public',  # Las URLs del sitio son relativas a esta carpeta
+    'output_dir': 'public/images-opt',
+    'manifest': 'src/data/image_manifest.json',
+    'extensions': ['.png', '.jpg', '.jpeg', '.webp', '.gif'],
+    'widths': [320, 640, 1024, 1600],
+    'formats': {'webp': 80, 'avif': 55},  # Formato -> calidad
+    'placeholder_width': 16,
+    'max_workers': None,  # None = un proceso por CPU
+}
+
+# Copia local de imágenes remotas de las noticias (rutas relativas a la raíz del repo)
+IMAGE_MIRROR = {
+    'output_dir': 'public/images/mirror',
+    'public_root': 'public',
+    'index': 'public/images/mirror/index.json',  # URL remota -> miniatura local
+    'fields': {'cms2': 'imagen', 'iso_news': 'image_url', 'emol_pyme': 'link_imagen'},
+    # Imágenes propias del sitio (o su copia en GitHub): no se copian
+    'local_prefixes': ['https://www.cmsconsultores.cl/', 'https://cmsconsultores.cl/',
+                       'http://www.cmsconsultores.cl/', 'https://raw.githubusercontent.com/thenext90/cms/'],
+    'thumbnail_width': 640,
+    'thumbnail_quality': 80,
+    'max_bytes': 15 * 1024 * 1024,  # Descargas más grandes se descartan
+    'max_workers': 6,
+    'timeout_seconds': 20,
+}
+
 # Configuración de logging
 LOGGING = {
     'level': 'INFO',  # DEBUG, INFO, WARNING, ERROR
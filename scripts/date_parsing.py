@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Parser de fechas compartido por los scrapers y los datos del sitio
+Reconoce con una sola expresión regular precompilada los formatos que
+mezclan nuestras fuentes y memoriza los resultados:
+
+    "19 de Agosto de 2025"      (emol_pyme_noticias.json)
+    "Julio 20, 2026"            (cms2.json)
+    "2025-08-19T14:03:00Z"      (published_at de NewsAPI)
+    "19/08/2025", "19-08-2025", "2025-08-19"
+
+Devuelve objetos `date` o None cuando el texto no es una fecha reconocible;
+nunca reemplaza en silencio por la fecha de hoy.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+# Meses en español (con abreviaturas) y en inglés
+MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10,
+    'noviembre': 11, 'diciembre': 12,
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6, 'jul': 7,
+    'ago': 8, 'sep': 9, 'sept': 9, 'set': 9, 'oct': 10, 'nov': 11, 'dic': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'june': 6, 'july': 7,
+    'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'apr': 4, 'aug': 8, 'dec': 12,
+}
+
+# Nombres para mostrar, índice = número de mes
+MONTH_NAMES = ('', 'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+               'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre')
+
+_MONTH = r'[a-z]+'
+
+# Día de la semana opcional al inicio: "lunes, 19 de agosto de 2025"
+_WEEKDAY = r'(?:[^\W\d]+,?\s+)?'
+
+_DATE_RE = re.compile(
+    r'^\s*(?:'
+    # 2025-08-19 y timestamps ISO 8601 (la hora y zona se ignoran)
+    r'(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})(?:[T\s][\d:.,]+(?:Z|[+-]\d{2}:?\d{2})?)?'
+    r'|'
+    # 19/08/2025, 19-08-2025, 19.08.2025
+    r'(?P<num_d>\d{1,2})(?P<sep>[/.-])(?P<num_m>\d{1,2})(?P=sep)(?P<num_y>\d{4})'
+    r'|'
+    # 19 de Agosto de 2025, 19 agosto 2025, 19 ago. 2025
+    + _WEEKDAY +
+    r'(?P<dm_d>\d{1,2})(?:\s+de)?\s+(?P<dm_m>' + _MONTH + r')\.?(?:\s+de\s+|,?\s+)(?P<dm_y>\d{4})'
+    r'|'
+    # Julio 20, 2026, August 19 2025
+    + _WEEKDAY +
+    r'(?P<md_m>' + _MONTH + r')\.?\s+(?P<md_d>\d{1,2}),?\s+(?:de\s+)?(?P<md_y>\d{4})'
+    r')\s*$',
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: Optional[str]) -> Optional[date]:
+    """
+    Convierte un texto de fecha en `date`
+
+    Returns:
+        Optional[date]: La fecha, o None si el texto no tiene un formato
+        reconocido o no es una fecha válida (p. ej. 31 de febrero)
+    """
+    if not text:
+        return None
+    match = _DATE_RE.match(text)
+    if not match:
+        return None
+    groups = match.groupdict()
+    try:
+        if groups['iso_y']:
+            return date(int(groups['iso_y']), int(groups['iso_m']), int(groups['iso_d']))
+        if groups['num_y']:
+            return date(int(groups['num_y']), int(groups['num_m']), int(groups['num_d']))
+        if groups['dm_y']:
+            month = MONTHS.get(groups['dm_m'].lower())
+            return date(int(groups['dm_y']), month, int(groups['dm_d'])) if month else None
+        month = MONTHS.get(groups['md_m'].lower())
+        return date(int(groups['md_y']), month, int(groups['md_d'])) if month else None
+    except ValueError:
+        return None
+
+
+def format_date(text: Optional[str], fmt: str = '%d/%m/%Y') -> Optional[str]:
+    """Fecha reformateada con `fmt` (por defecto DD/MM/YYYY), o None si no se reconoce"""
+    parsed = parse_date(text)
+    return parsed.strftime(fmt) if parsed else None
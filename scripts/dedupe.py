@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Detección de noticias casi duplicadas entre fuentes
+Agrupa copias sindicadas (emol.com, latercera.com, biobiochile.cl...) y
+variantes de URL usando SimHash con bandas LSH, sin comparar todos contra todos
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config_iso_scraper import DEDUPE, KNOWN_SOURCES
+from relevance import fold_text
+from url_utils import canonicalize_url
+
+_TOKEN_RE = re.compile(r'\w+')
+
+SIMHASH_BITS = 64
+
+
+def simhash(text: str, shingle_size: int = 3, min_tokens: int = 0) -> Optional[int]:
+    """
+    Huella SimHash de 64 bits sobre shingles de palabras del texto normalizado
+    (None si el texto tiene menos de `min_tokens` palabras)
+    """
+    tokens = _TOKEN_RE.findall(fold_text(text))
+    if not tokens or len(tokens) < min_tokens:
+        return None
+    if len(tokens) >= shingle_size:
+        shingles = {' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+    else:
+        shingles = set(tokens)
+
+    # Cada hash como cadena de 64 bits; zip(*...) recorre las columnas en C y el
+    # bit resultante es 1 si la mayoría de los shingles lo tienen en 1
+    bit_strings = [
+        format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'), '064b')
+        for shingle in shingles
+    ]
+    half = len(bit_strings) / 2
+    return int(''.join('1' if column.count('1') > half else '0' for column in zip(*bit_strings)), 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _source_priorities() -> Dict[str, int]:
+    priorities = {}
+    for source in KNOWN_SOURCES.values():
+        host = urlsplit(source['base_url']).hostname or ''
+        priorities[host[4:] if host.startswith('www.') else host] = source['priority']
+    return priorities
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class NearDuplicateDetector:
+    """
+    Agrupa artículos por URL canónica y por similitud de contenido
+
+    Con `max_distance` bits de diferencia permitidos y `bands` > max_distance
+    bandas, dos huellas cercanas coinciden en al menos una banda completa
+    (principio del palomar), así que solo se comparan los pares que comparten
+    un bucket.
+    """
+
+    def __init__(self, max_distance: int = DEDUPE['max_hamming_distance'],
+                 bands: int = DEDUPE['lsh_bands'],
+                 min_tokens: int = DEDUPE['min_tokens'],
+                 fields: Sequence[str] = ('title', 'summary', 'full_content')):
+        if bands <= max_distance or SIMHASH_BITS % bands:
+            raise ValueError("bands debe dividir 64 y ser mayor que max_distance")
+        self.max_distance = max_distance
+        self.bands = bands
+        self.band_bits = SIMHASH_BITS // bands
+        self.min_tokens = min_tokens
+        self.fields = fields
+        self.priorities = _source_priorities()
+
+    def _text(self, article: Dict[str, Any]) -> str:
+        return ' '.join(str(article.get(field) or '') for field in self.fields)
+
+    def source_priority(self, article: Dict[str, Any]) -> int:
+        """Prioridad de la fuente según KNOWN_SOURCES (0 si no es conocida)"""
+        host = urlsplit(canonicalize_url(article.get('url', ''))).hostname or ''
+        labels = host.split('.')
+        for i in range(len(labels)):
+            priority = self.priorities.get('.'.join(labels[i:]))
+            if priority is not None:
+                return priority
+        return 0
+
+    def _rank(self, article: Dict[str, Any]) -> tuple:
+        return (
+            bool(article.get('is_chilean_source')),
+            self.source_priority(article),
+            article.get('content_length') or len(article.get('full_content') or ''),
+            len(article.get('summary') or ''),
+        )
+
+    def cluster(self, articles: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Agrupa índices de artículos duplicados o casi duplicados
+
+        Returns:
+            List[List[int]]: Clusters en orden de primera aparición
+        """
+        groups = _UnionFind(len(articles))
+
+        # 1. Misma URL canónica (parámetros de seguimiento, AMP, www...)
+        first_by_url: Dict[str, int] = {}
+        for i, article in enumerate(articles):
+            key = canonicalize_url(article.get('url', ''))
+            if key in first_by_url:
+                groups.union(first_by_url[key], i)
+            elif key:
+                first_by_url[key] = i
+
+        # 2. Contenido casi idéntico vía buckets LSH (textos muy cortos no se comparan)
+        fingerprints = [simhash(self._text(article), min_tokens=self.min_tokens) for article in articles]
+        mask = (1 << self.band_bits) - 1
+        buckets: Dict[tuple, List[int]] = defaultdict(list)
+        for i, fingerprint in enumerate(fingerprints):
+            if fingerprint is None:
+                continue
+            for band in range(self.bands):
+                buckets[(band, fingerprint >> (band * self.band_bits) & mask)].append(i)
+
+        for members in buckets.values():
+            for pos, i in enumerate(members):
+                for j in members[pos + 1:]:
+                    if groups.find(i) != groups.find(j) and \
+                            hamming_distance(fingerprints[i], fingerprints[j]) <= self.max_distance:
+                        groups.union(i, j)
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(articles)):
+            clusters.setdefault(groups.find(i), []).append(i)
+        return list(clusters.values())
+
+    def deduplicate(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Conserva el mejor representante de cada cluster (fuente chilena primero,
+        luego mayor prioridad de fuente y más contenido) y anota en
+        `duplicate_urls` las copias descartadas
+        """
+        result = []
+        for members in self.cluster(articles):
+            best = max(members, key=lambda i: self._rank(articles[i]))
+            representative = articles[best]
+            duplicates = [articles[i].get('url') for i in members if i != best]
+            if duplicates:
+                representative['duplicate_urls'] = sorted(
+                    set(representative.get('duplicate_urls', []) + duplicates) - {representative.get('url')}
+                )
+            result.append(representative)
+        return result
+
+
+_default_detector: Optional[NearDuplicateDetector] = None
+
+
+def deduplicate_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Atajo con el detector configurado en DEDUPE"""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = NearDuplicateDetector()
+    return _default_detector.deduplicate(articles)
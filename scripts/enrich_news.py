@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Enriquecimiento de los datos de noticias del sitio
+Escribe una vez, después del scraping, los campos que las páginas Astro
+calculaban en cada build (categoría, año, mes, fecha formateada, slug y,
+para cms2.json, título y extracto). Solo recalcula los registros cuyo
+contenido cambió desde la última pasada.
+
+Uso (desde la raíz del repositorio):
+    python scripts/enrich_news.py [dataset ...]
+"""
+
+import json
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from config_iso_scraper import CATEGORY_RULES, DEFAULT_CATEGORY, ENRICHMENT, SHARDS
+from date_parsing import MONTH_NAMES, parse_date
+from state_store import content_hash
+from url_utils import stable_slug
+
+_YEAR_RE = re.compile(r'\b(\d{4})\b')
+
+# Cambiar las reglas invalida el hash de todos los registros
+RULES_SIGNATURE = content_hash(json.dumps([CATEGORY_RULES, DEFAULT_CATEGORY, ENRICHMENT['title_length'],
+                                           ENRICHMENT['excerpt_length'], SHARDS['slug_words']],
+                                          ensure_ascii=False))
+
+
+def infer_category(text: str) -> str:
+    """Primera categoría de CATEGORY_RULES con alguna coincidencia en el texto"""
+    lowered = (text or '').lower()
+    for category, needles in CATEGORY_RULES:
+        if any(needle in lowered for needle in needles):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def make_title(text: str, length: int = ENRICHMENT['title_length']) -> str:
+    """Título a partir del texto: primera línea útil, cortado en palabra completa"""
+    title = text.replace('\n', ' ')[:length]
+    if len(title) == length:
+        last_space = title.rfind(' ')
+        if last_space > length * 5 // 8:
+            title = title[:last_space] + '...'
+    return title[:1].upper() + title[1:]
+
+
+def make_excerpt(text: str, length: int = ENRICHMENT['excerpt_length']) -> str:
+    excerpt = text.replace('\n', ' ')[:length]
+    return excerpt + '...' if len(text) > length else excerpt
+
+
+def year_of(fecha: Optional[str]) -> Optional[int]:
+    """Año de una fecha; si no tiene un formato reconocido, el primer año de cuatro dígitos del texto"""
+    parsed = parse_date(fecha)
+    if parsed:
+        return parsed.year
+    match = _YEAR_RE.search(fecha or '')
+    return int(match.group(1)) if match else None
+
+
+def derived_fields(item: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos derivados de un registro según la definición de su dataset"""
+    text = ' '.join(str(item.get(field) or '') for field in spec['text_fields']).strip()
+    fecha = item.get(spec['date_field']) or ''
+    parsed = parse_date(fecha)
+    if parsed:
+        year, month = parsed.year, MONTH_NAMES[parsed.month]
+        formatted = f"{month} {year}"
+    else:
+        year = year_of(fecha)
+        month = fecha.split(' ')[0] if fecha else ''
+        formatted = fecha
+
+    fields = {
+        'categoria': infer_category(text),
+        'ano': year,
+        'mes': month,
+        'fecha_formateada': formatted,
+        'fecha_iso': parsed.isoformat() if parsed else None,
+        'slug': stable_slug(str(item.get(spec['text_fields'][0]) or ''),
+                            [source_value(item, field) for field in spec['slug_fields']],
+                            SHARDS['slug_words']),
+    }
+    if spec.get('derive_title'):
+        fields['titulo'] = make_title(text)
+        fields['extracto'] = make_excerpt(text)
+    return fields
+
+
+def source_value(item: Dict[str, Any], field: str) -> str:
+    """Valor original de un campo (image_mirror.py guarda en `<campo>_original` el que reemplaza)"""
+    return str(item.get(f"{field}_original") or item.get(field) or '')
+
+
+def record_hash(item: Dict[str, Any], spec: Dict[str, Any]) -> str:
+    source_fields = spec['text_fields'] + [spec['date_field']] + spec['slug_fields']
+    return content_hash(RULES_SIGNATURE, *(source_value(item, field) for field in source_fields))
+
+
+def load_dataset(name: str, spec: Dict[str, Any]) -> Tuple[Any, Optional[List[Dict[str, Any]]]]:
+    """(datos completos, lista de registros) de un dataset; (None, None) si no se puede leer"""
+    try:
+        with open(spec['path'], encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"⚠️ {name}: no existe {spec['path']}")
+        return None, None
+    except ValueError as e:
+        print(f"⚠️ {name}: {spec['path']} no es JSON válido ({e})")
+        return None, None
+    items = data.get(spec['items_key']) if spec['items_key'] else data
+    if not isinstance(items, list):
+        print(f"⚠️ {name}: formato inesperado en {spec['path']}")
+        return None, None
+    return data, items
+
+
+def save_dataset(spec: Dict[str, Any], data: Any) -> None:
+    with open(spec['path'], 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+class NewsEnricher:
+    """Aplica los campos derivados a los datasets de ENRICHMENT['datasets']"""
+
+    def __init__(self, datasets: Dict[str, Dict[str, Any]] = ENRICHMENT['datasets']):
+        self.datasets = datasets
+
+    def enrich_items(self, items: List[Dict[str, Any]], spec: Dict[str, Any]) -> int:
+        """Enriquece en el lugar; devuelve cuántos registros cambiaron"""
+        updated = 0
+        for item in items:
+            digest = record_hash(item, spec)
+            if item.get('enrich_hash') == digest:
+                continue
+            item.update(derived_fields(item, spec))
+            item['enrich_hash'] = digest
+            updated += 1
+        return updated
+
+    def enrich_dataset(self, name: str) -> Optional[int]:
+        """Enriquece un dataset y lo guarda solo si algo cambió (None si no se pudo leer)"""
+        spec = self.datasets[name]
+        data, items = load_dataset(name, spec)
+        if items is None:
+            return None
+
+        updated = self.enrich_items(items, spec)
+        if updated:
+            save_dataset(spec, data)
+        print(f"✅ {name}: {updated} registros enriquecidos, {len(items) - updated} sin cambios")
+        return updated
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, Optional[int]]:
+        return {name: self.enrich_dataset(name) for name in (names or list(self.datasets))}
+
+
+if __name__ == "__main__":
+    NewsEnricher().run(sys.argv[1:] or None)
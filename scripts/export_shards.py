@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Exportador de fragmentos de cms2.json para el build de Astro
+Escribe un archivo por noticia, por página y por año, más un manifiesto
+pequeño, para que cada página importe solo lo que muestra en vez del
+archivo completo. El texto completo va solo en el archivo de cada
+noticia. Los slugs derivan del contenido, no de la posición.
+
+Uso (desde la raíz del repositorio):
+    python scripts/export_shards.py
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from config_iso_scraper import SHARDS
+from date_parsing import parse_date
+from enrich_news import year_of
+from url_utils import stable_slug
+
+ENRICHED_FIELDS = ('categoria', 'mes', 'fecha_formateada', 'titulo', 'extracto')
+
+# Solo articles/<slug>.json lleva el cuerpo; las páginas y los años son listados
+DETAIL_FIELDS = ('texto', 'link')
+
+
+def article_slug(noticia: Dict[str, Any], max_words: int = SHARDS['slug_words']) -> str:
+    """
+    Slug de una noticia de cms2.json; usa el de enrich_news.py si ya existe
+    """
+    if noticia.get('slug'):
+        return noticia['slug']
+    return stable_slug(noticia.get('texto', ''),
+                       [noticia.get(field) for field in ('fecha', 'texto', 'imagen')], max_words)
+
+
+class ShardExporter:
+    """
+    Genera articles/<slug>.json, pages/<n>.json, years/<año>.json y
+    manifest.json bajo `output_dir`; solo reescribe archivos que cambian y
+    elimina los fragmentos de noticias que ya no existen
+    """
+
+    def __init__(self, source: str = SHARDS['source'], output_dir: str = SHARDS['output_dir'],
+                 page_size: int = SHARDS['page_size']):
+        self.source = source
+        self.output_dir = output_dir
+        self.page_size = max(1, page_size)
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def load(self) -> Tuple[Dict[str, Any], str]:
+        with open(self.source, 'rb') as f:
+            raw = f.read()
+        return json.loads(raw.decode('utf-8')), hashlib.sha1(raw).hexdigest()
+
+    def build_articles(self, noticias: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Noticias con texto, con slug y fecha ISO, de la más reciente a la más antigua"""
+        articles = []
+        seen = set()
+        for noticia in noticias:
+            if not (noticia.get('texto') or '').strip():
+                continue
+            slug = article_slug(noticia)
+            if slug in seen:
+                continue  # Entrada repetida en el origen (mismo contenido)
+            seen.add(slug)
+            parsed = parse_date(noticia.get('fecha'))
+            article = {
+                'slug': slug,
+                'fecha': noticia.get('fecha', ''),
+                'fecha_iso': parsed.isoformat() if parsed else None,
+                'ano': year_of(noticia.get('fecha', '')) or 0,
+                'texto': noticia['texto'],
+                'imagen': noticia.get('imagen', ''),
+                'link': noticia.get('link', ''),
+            }
+            # Campos precalculados por enrich_news.py
+            article.update({field: noticia[field] for field in ENRICHED_FIELDS if field in noticia})
+            articles.append(article)
+        # Orden estable: sin fecha reconocible al final, empates en el orden del origen
+        articles.sort(key=lambda a: a['fecha_iso'] or '', reverse=True)
+        return articles
+
+    @staticmethod
+    def list_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+        """Campos que necesita una tarjeta de listado (sin cuerpo ni enlace original)"""
+        return {key: value for key, value in article.items() if key not in DETAIL_FIELDS}
+
+    def _write(self, relative_path: str, data: Any) -> None:
+        path = os.path.join(self.output_dir, relative_path)
+        content = json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+        try:
+            with open(path, encoding='utf-8') as f:
+                if f.read() == content:
+                    self.unchanged += 1
+                    return
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.written += 1
+
+    def _prune(self, subdir: str, keep: set) -> None:
+        directory = os.path.join(self.output_dir, subdir)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.endswith('.json') and name not in keep:
+                os.remove(os.path.join(directory, name))
+                self.removed += 1
+
+    def export(self) -> Optional[Dict[str, Any]]:
+        """Escribe todos los fragmentos y devuelve el manifiesto"""
+        try:
+            data, source_hash = self.load()
+        except (OSError, ValueError) as e:
+            print(f"❌ No se pudo leer {self.source}: {e}")
+            return None
+
+        articles = self.build_articles(data.get('noticias', []))
+
+        # Un archivo por noticia, con enlaces a la anterior y la siguiente
+        for i, article in enumerate(articles):
+            self._write(f"articles/{article['slug']}.json", {
+                **article,
+                'anterior': articles[i - 1]['slug'] if i > 0 else None,
+                'siguiente': articles[i + 1]['slug'] if i + 1 < len(articles) else None,
+            })
+
+        # Páginas y años solo con los campos de las tarjetas
+        listed = [self.list_fields(article) for article in articles]
+
+        # Páginas de tamaño fijo
+        total_pages = max(1, -(-len(articles) // self.page_size))
+        for page in range(1, total_pages + 1):
+            start = (page - 1) * self.page_size
+            self._write(f"pages/{page}.json", {
+                'pagina': page,
+                'total_paginas': total_pages,
+                'noticias': listed[start:start + self.page_size],
+            })
+
+        # Un archivo por año (0 = sin fecha reconocible)
+        by_year: Dict[int, List[Dict[str, Any]]] = {}
+        for article in listed:
+            by_year.setdefault(article['ano'], []).append(article)
+        years = sorted(by_year, reverse=True)
+        for year in years:
+            self._write(f"years/{year}.json", {'ano': year, 'noticias': by_year[year]})
+
+        self._prune('articles', {f"{a['slug']}.json" for a in articles})
+        self._prune('pages', {f"{page}.json" for page in range(1, total_pages + 1)})
+        self._prune('years', {f"{year}.json" for year in years})
+
+        manifest = {
+            'fuente': os.path.basename(self.source),
+            'fuente_sha1': source_hash,
+            'sitio_web': data.get('sitio_web', ''),
+            'total': len(articles),
+            'tamano_pagina': self.page_size,
+            'total_paginas': total_pages,
+            'anos': [{'ano': year, 'total': len(by_year[year])} for year in years],
+            'slugs': [a['slug'] for a in articles],
+        }
+        self._write('manifest.json', manifest)
+
+        print(f"✅ {len(articles)} noticias -> {total_pages} páginas, {len(years)} años en {self.output_dir}")
+        print(f"📝 {self.written} archivos escritos, {self.unchanged} sin cambios, {self.removed} eliminados")
+        return manifest
+
+
+if __name__ == "__main__":
+    ShardExporter().export()
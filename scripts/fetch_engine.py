@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Motor de descarga concurrente con limitador de tasa para los scrapers ISO
+Reemplaza las pausas fijas (time.sleep) por un token bucket compartido
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class TokenBucket:
+    """
+    Limitador de tasa tipo token bucket, seguro para uso desde varios hilos
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate (float): Tokens repuestos por segundo
+            capacity (int): Máximo de tokens acumulables (ráfaga permitida)
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate debe ser > 0 y capacity >= 1")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Bloquea hasta disponer de `tokens` y los consume
+
+        Returns:
+            float: Segundos esperados por este llamado
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.waited_seconds += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ConcurrentFetcher:
+    """
+    Ejecuta tareas de descarga en un pool de hilos y mide el tiempo total
+    """
+
+    def __init__(self, max_workers: int = 4, logger: Optional[logging.Logger] = None):
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logger or logging.getLogger(__name__)
+        self.wall_seconds = 0.0
+        self.tasks_run = 0
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Aplica `func` a cada elemento en paralelo, preservando el orden de entrada.
+        Una tarea que falla devuelve None y se registra en el log.
+        """
+        items = list(items)
+        start = time.monotonic()
+
+        def _safe(item: Any) -> Any:
+            try:
+                return func(item)
+            except Exception as e:
+                self.logger.error(f"Error en tarea concurrente {item!r}: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(_safe, items))
+
+        self.wall_seconds += time.monotonic() - start
+        self.tasks_run += len(items)
+        return results
+
+    def report(self, request_count: int, limiter: Optional[TokenBucket] = None) -> Dict[str, Any]:
+        """
+        Resume el tiempo de reloj frente al número de requests realizados
+        """
+        stats = {
+            'wall_seconds': round(self.wall_seconds, 2),
+            'requests': request_count,
+            'requests_per_second': round(request_count / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            'rate_limit_wait_seconds': round(limiter.waited_seconds, 2) if limiter else 0.0,
+        }
+        self.logger.info(
+            f"{stats['requests']} requests en {stats['wall_seconds']}s "
+            f"({stats['requests_per_second']} req/s, "
+            f"{stats['rate_limit_wait_seconds']}s esperando al limitador)"
+        )
+        return stats
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Backend de parseo HTML y evaluación de selectores en una sola pasada
+Usa lxml cuando está instalado (mucho más rápido que html.parser) y recorre
+el documento una vez para encontrar nodos de noticias sin duplicar anidados
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+# Formas de selector soportadas: 'tag', '.clase', 'tag.clase', 'tag[class*="x"]', '[class*="x"]'
+_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?'
+    r'(?:\.(?P<cls>[\w-]+))?'
+    r'(?:\[class\*=["\']?(?P<contains>[^"\'\]]+)["\']?\])?$'
+)
+
+Matcher = Callable[[Tag], bool]
+
+
+def make_soup(markup: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """Crea el árbol con el backend más rápido disponible (o el indicado)"""
+    return BeautifulSoup(markup, parser or DEFAULT_PARSER)
+
+
+def compile_selector(selector: str) -> Matcher:
+    """
+    Compila un selector simple a un predicado sobre un Tag. Selectores más
+    complejos se rechazan para no caer en evaluaciones de documento completo.
+    """
+    match = _SELECTOR_RE.match(selector.strip())
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Selector no soportado para evaluación en una pasada: '{selector}'")
+    tag, cls, contains = match.group('tag'), match.group('cls'), match.group('contains')
+    tag = tag.lower() if tag else None
+
+    def matcher(node: Tag) -> bool:
+        if tag and node.name != tag:
+            return False
+        if cls or contains:
+            classes = node.get('class') or []
+            if cls and cls not in classes:
+                return False
+            if contains and contains not in ' '.join(classes):
+                return False
+        return True
+
+    return matcher
+
+
+class SelectorSet:
+    """
+    Conjunto de selectores evaluados juntos en un único recorrido del árbol
+    """
+
+    def __init__(self, selectors: Sequence[str]):
+        self.selectors = list(selectors)
+        self._matchers: List[Tuple[str, Matcher]] = [(s, compile_selector(s)) for s in self.selectors]
+        self.counts: Dict[str, int] = {}
+
+    def first_matching(self, node: Tag) -> Optional[int]:
+        """Índice del primer selector (el de mayor prioridad) que cumple el nodo"""
+        for priority, (_, matcher) in enumerate(self._matchers):
+            if matcher(node):
+                return priority
+        return None
+
+    def select_distinct(self, root: Tag) -> List[Tag]:
+        """
+        Recorre el árbol una sola vez y devuelve los nodos que cumplen algún
+        selector, en orden de prioridad de selector y luego de documento (como
+        varios `select` seguidos), sin repetir nodos ni incluir nodos anidados:
+        un contenedor con varias noticias dentro se reemplaza por ellas y, si
+        solo envuelve una, queda el nodo de mayor prioridad
+        """
+        self.counts = {}
+        matches: List[Tuple[int, int, int, Tag]] = []  # (prioridad, inicio, fin, nodo)
+        position = 0
+        # Entradas (nodo, índice de match abierto); el índice marca el cierre del subárbol
+        stack: List[Tuple[Tag, Optional[int]]] = [(root, None)]
+        while stack:
+            node, open_match = stack.pop()
+            if open_match is not None:
+                priority, start, _, tag = matches[open_match]
+                matches[open_match] = (priority, start, position, tag)
+                continue
+            position += 1
+            priority = self.first_matching(node) if node is not root else None
+            if priority is not None:
+                matches.append((priority, position, position, node))
+                stack.append((node, len(matches) - 1))
+            stack.extend((child, None) for child in reversed(node.contents) if isinstance(child, Tag))
+
+        # Bosque de matches: los subárboles son anidados o disjuntos y `matches` está en orden de documento
+        children: List[List[int]] = [[] for _ in matches]
+        roots: List[int] = []
+        open_matches: List[int] = []
+        for k, (_, start, _, _) in enumerate(matches):
+            while open_matches and matches[open_matches[-1]][2] < start:
+                open_matches.pop()
+            (children[open_matches[-1]] if open_matches else roots).append(k)
+            open_matches.append(k)
+
+        def resolve(k: int) -> List[int]:
+            # Un match con varios matches dentro es un contenedor del listado: se reemplaza por
+            # ellos. Con uno solo es la noticia y el de adentro una parte (ej. '.news-excerpt'):
+            # queda el de mayor prioridad, el externo en caso de empate
+            nested = [found for child in children[k] for found in resolve(child)]
+            if len(children[k]) > 1 or len(nested) > 1:
+                return nested
+            if nested and matches[nested[0]][0] < matches[k][0]:
+                return nested
+            return [k]
+
+        chosen = [matches[k] for root in roots for k in resolve(root)]
+        selected: List[Tag] = []
+        for priority, _, _, node in sorted(chosen, key=lambda m: (m[0], m[1])):
+            selected.append(node)
+            selector = self.selectors[priority]
+            self.counts[selector] = self.counts.get(selector, 0) + 1
+        return selected
+
+def first_match(node: Tag, selectors: Sequence[str]) -> Optional[Tag]:
+    """Primer descendiente que cumple el primer selector con resultados (en orden de prioridad)"""
+    for selector in selectors:
+        found = node.select_one(selector)
+        if found is not None:
+            return found
+    return None
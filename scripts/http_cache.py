@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Caché HTTP persistente (SQLite) compartida por todos los scrapers
+Se monta como adaptador de transporte en los requests.Session existentes y
+revalida con If-None-Match / If-Modified-Since cuando una entrada expira
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config_iso_scraper import HTTP_CACHE
+
+# Cabeceras que no tienen sentido al reconstruir una respuesta desde la caché
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def normalize_url(url: str, ignored_params: Iterable[str] = ()) -> str:
+    """
+    Normaliza una URL para usarla como clave: esquema y host en minúsculas,
+    parámetros ordenados, sin fragmento ni parámetros ignorados (ej. apiKey)
+    """
+    parts = urlsplit(url)
+    ignored = set(ignored_params)
+    params = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in ignored)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(params), ''))
+
+
+class HTTPCache:
+    """
+    Almacén SQLite de respuestas HTTP con TTL y desalojo LRU por tamaño
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, default_ttl: int = 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Lo reemplazado o desalojado se sobrescribe con ceros en vez de quedar en páginas libres
+        self._conn.execute("PRAGMA secure_delete = ON")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        # Cachés anteriores guardaban la URL original, con apiKey incluida
+        self._conn.execute("UPDATE responses SET url = key WHERE url != key")
+        self._conn.commit()
+
+    def record(self, counter: str) -> None:
+        """Incrementa un contador (hits, misses, revalidated) de forma segura entre hilos"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Obtiene una entrada (vigente o expirada) y actualiza su último acceso"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        url, status, headers, body, etag, last_modified, expires_at = row
+        return {
+            'url': url,
+            'status': status,
+            'headers': json.loads(headers),
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': expires_at,
+        }
+
+    def put(self, key: str, response: requests.Response, ttl: int) -> None:
+        """
+        Guarda una respuesta 200 y desaloja entradas antiguas si se excede el tamaño
+
+        Como URL se guarda la clave normalizada: la original puede traer
+        credenciales (apiKey) que no deben quedar en disco
+        """
+        body = response.content
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, key, response.status_code, json.dumps(headers), body,
+                    response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                    now + ttl, now, len(body)
+                )
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str, ttl: int) -> None:
+        """Extiende la vigencia de una entrada revalidada con 304"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = ? WHERE key = ?", (time.time() + ttl, key))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos y fallos de la caché"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size,
+        }
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Adaptador de requests que sirve GETs desde HTTPCache y revalida con
+    peticiones condicionales cuando la entrada expiró
+    """
+
+    def __init__(self, cache: HTTPCache, ignored_params: Iterable[str] = ('apiKey',), **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.ignored_params = tuple(ignored_params)
+
+    def _ttl_for(self, response: requests.Response) -> Optional[int]:
+        """TTL según Cache-Control (None si la respuesta no debe guardarse)"""
+        cache_control = response.headers.get('Cache-Control', '')
+        if 'no-store' in cache_control:
+            return None
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return int(match.group(1))
+        return self.cache.default_ttl
+
+    def _from_cache(self, request: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET' or kwargs.get('stream'):
+            return super().send(request, **kwargs)
+
+        key = normalize_url(request.url, self.ignored_params)
+        entry = self.cache.get(key)
+
+        if entry and entry['expires_at'] > time.time():
+            self.cache.record('hits')
+            return self._from_cache(request, entry)
+
+        if entry:
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.record('revalidated')
+            self.cache.refresh(key, self._ttl_for(response) or 0)
+            return self._from_cache(request, entry)
+
+        self.cache.record('misses')
+        response.from_cache = False
+        if response.status_code == 200:
+            ttl = self._ttl_for(response)
+            if ttl is not None:
+                self.cache.put(key, response, ttl)
+        return response
+
+
+_default_cache: Optional[HTTPCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> HTTPCache:
+    """Caché compartida del proceso, configurada desde HTTP_CACHE"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HTTPCache(
+                HTTP_CACHE['path'],
+                max_bytes=HTTP_CACHE['max_bytes'],
+                default_ttl=HTTP_CACHE['default_ttl_seconds']
+            )
+        return _default_cache
+
+
+def install_cache(session: requests.Session, cache: Optional[HTTPCache] = None) -> HTTPCache:
+    """
+    Monta el adaptador con caché en un requests.Session para http y https
+
+    Returns:
+        HTTPCache: La caché montada (útil para leer sus contadores)
+    """
+    cache = cache or get_default_cache()
+    # Sesión compartida entre scrapers: no reemplazar el adaptador (y su pool de conexiones)
+    current = session.get_adapter('https://')
+    if isinstance(current, CachingAdapter) and current.cache is cache:
+        return cache
+    adapter = CachingAdapter(cache)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return cache
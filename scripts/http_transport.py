@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Transporte HTTP compartido por todos los scrapers ISO
+Un solo adaptador por proceso (con la caché HTTP) reparte sus pools de
+conexiones keep-alive entre todas las sesiones, limita los requests
+simultáneos por host, negocia gzip/brotli y resuelve cada host una sola vez
+gracias a una caché DNS del proceso. Cada scraper crea su sesión con
+`new_session()`: cabeceras y hooks propios, conexiones compartidas.
+"""
+
+import asyncio
+import ipaddress
+import itertools
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import connection as urllib3_connection
+from urllib3.util import make_headers
+
+from config_iso_scraper import HTTP_TRANSPORT, USER_AGENTS
+from http_cache import CachingAdapter, get_default_cache
+
+
+class DNSCache:
+    """
+    Resoluciones getaddrinfo cacheadas por (host, puerto, familia) durante
+    `ttl` segundos; una entrada se descarta si ninguna de sus direcciones conecta
+    """
+
+    def __init__(self, ttl: float = HTTP_TRANSPORT['dns_ttl_seconds']):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, int, int], Tuple[float, List[tuple]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int, family: int) -> List[tuple]:
+        key = (host, port, family)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Fuera del lock: una resolución lenta no bloquea a los demás hosts
+        addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int, family: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port, family), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hosts': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+_dns_cache: Optional[DNSCache] = None
+_original_create_connection = urllib3_connection.create_connection
+
+
+def _cached_create_connection(address, *args, **kwargs) -> socket.socket:
+    """create_connection de urllib3 que resuelve el host con la caché DNS del proceso"""
+    host, port = address
+    host = host.strip('[]')
+    if _dns_cache is None or host == 'localhost' or _is_ip_literal(host):
+        return _original_create_connection(address, *args, **kwargs)
+
+    family = urllib3_connection.allowed_gai_family()
+    error: Optional[OSError] = None
+    for *_, sockaddr in _dns_cache.resolve(host, port, family):
+        try:
+            return _original_create_connection((sockaddr[0], port), *args, **kwargs)
+        except OSError as e:
+            error = e
+    # Ninguna dirección respondió: puede que el host haya cambiado de IP
+    _dns_cache.invalidate(host, port, family)
+    raise error or OSError(f"Sin direcciones para {host}")
+
+
+def install_dns_cache(cache: Optional[DNSCache] = None) -> DNSCache:
+    """Activa la caché DNS para todas las conexiones urllib3 del proceso (idempotente)"""
+    global _dns_cache
+    if _dns_cache is None or cache is not None:
+        _dns_cache = cache or DNSCache()
+    urllib3_connection.create_connection = _cached_create_connection
+    return _dns_cache
+
+
+class HostLimitedAdapter(HTTPAdapter):
+    """
+    Adaptador con un semáforo por host: como mucho `max_per_host` requests a
+    la vez contra un mismo dominio (o su valor en `host_limits`), de modo que
+    los hilos esperan turno en vez de abrir conexiones que luego se
+    descartan ("Connection pool is full")
+    """
+
+    def __init__(self, max_per_host: int = HTTP_TRANSPORT['max_per_host'],
+                 host_limits: Optional[Dict[str, int]] = None, **kwargs):
+        self.max_per_host = max_per_host
+        self.host_limits = dict(HTTP_TRANSPORT['host_limits'] if host_limits is None else host_limits)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._semaphores_lock = threading.Lock()
+        # Pool no bloqueante: una respuesta en streaming que nunca se cierra retendría
+        # su conexión y un pool bloqueante (sin timeout) colgaría el siguiente GET al host
+        kwargs.setdefault('pool_maxsize', max([max_per_host, *self.host_limits.values()]))
+        super().__init__(**kwargs)
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._semaphores_lock:
+            if host not in self._semaphores:
+                limit = self.host_limits.get(host, self.max_per_host)
+                self._semaphores[host] = threading.BoundedSemaphore(limit)
+            return self._semaphores[host]
+
+    def send(self, request, **kwargs):
+        with self._semaphore(urlsplit(request.url).hostname or ''):
+            return super().send(request, **kwargs)
+
+
+class TransportAdapter(CachingAdapter, HostLimitedAdapter):
+    """
+    Caché HTTP delante del límite por host: las respuestas servidas desde la
+    caché no ocupan un turno de conexión
+    """
+
+
+_shared_adapter: Optional[TransportAdapter] = None
+_shared_adapter_lock = threading.Lock()
+_user_agents = itertools.cycle(USER_AGENTS)
+
+
+def get_shared_adapter() -> TransportAdapter:
+    """Adaptador del proceso: sus pools de conexiones los reutilizan todas las sesiones"""
+    global _shared_adapter
+    with _shared_adapter_lock:
+        if _shared_adapter is None:
+            install_dns_cache()
+            _shared_adapter = TransportAdapter(
+                get_default_cache(),
+                pool_connections=HTTP_TRANSPORT['pool_connections'],
+            )
+        return _shared_adapter
+
+
+def new_session(user_agent: Optional[str] = None) -> requests.Session:
+    """
+    Sesión montada sobre el adaptador compartido, con un User-Agent de
+    USER_AGENTS (rotando entre sesiones) y compresión gzip/deflate, más
+    brotli si el paquete `brotli` está instalado
+    """
+    adapter = get_shared_adapter()
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    with _shared_adapter_lock:
+        user_agent = user_agent or next(_user_agents)
+    session.headers.update({
+        'User-Agent': user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+        'Accept-Language': HTTP_TRANSPORT['accept_language'],
+        'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+async def fetch_async(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """
+    GET desde código asyncio sin bloquear el event loop: el request corre en
+    un hilo y respeta los mismos pools, límites por host y caché DNS
+    """
+    return await asyncio.to_thread(session.get, url, **kwargs)
+
+
+def transport_stats() -> Dict[str, Dict[str, int]]:
+    """Contadores de la caché DNS y pools de conexiones abiertos"""
+    adapter = _shared_adapter
+    return {
+        'dns': _dns_cache.stats() if _dns_cache else {},
+        'pools': {'open': len(adapter.poolmanager.pools) if adapter else 0},
+    }
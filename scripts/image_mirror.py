@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Copia local de las imágenes remotas de las noticias
+Descarga una sola vez cada imagen enlazada desde cms2.json, iso_news.json y
+emol_pyme_noticias.json, la reduce a una miniatura WebP con nombre por hash
+de contenido (imágenes repetidas se guardan una vez) y reescribe los JSON
+para apuntar a la copia local. El índice URL -> miniatura evita volver a
+descargar en las siguientes ejecuciones.
+
+Requiere Pillow (pip install pillow); sin Pillow no hace nada.
+
+Uso (desde la raíz del repositorio):
+    python scripts/image_mirror.py [dataset ...]
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from article_extractor import DomainThrottle
+from config_iso_scraper import CONFIG, ENRICHMENT, IMAGE_MIRROR
+from enrich_news import load_dataset, save_dataset
+from fetch_engine import ConcurrentFetcher
+from http_transport import new_session
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+
+class ImageMirror:
+    """
+    Descarga concurrente de imágenes remotas y reescritura de los datasets
+    """
+
+    def __init__(self, config: Dict[str, Any] = IMAGE_MIRROR,
+                 datasets: Dict[str, Dict[str, Any]] = ENRICHMENT['datasets'],
+                 session: Optional[requests.Session] = None):
+        self.output_dir = config['output_dir']
+        self.public_root = config['public_root']
+        self.index_path = config['index']
+        self.fields = config['fields']
+        self.local_prefixes = tuple(config['local_prefixes'])
+        self.thumbnail_width = config['thumbnail_width']
+        self.thumbnail_quality = config['thumbnail_quality']
+        self.max_bytes = config['max_bytes']
+        self.timeout = config['timeout_seconds']
+        self.datasets = datasets
+        self.session = session or new_session()
+        self.fetcher = ConcurrentFetcher(max_workers=config['max_workers'])
+        self.throttle = DomainThrottle(CONFIG['delay_between_requests'])
+        self._write_lock = threading.Lock()
+        # Ruta de miniatura -> evento que se marca cuando quien la reclamó terminó de escribirla
+        self._claims: Dict[str, threading.Event] = {}
+        self.index: Dict[str, Dict[str, Any]] = {}
+
+    def is_remote(self, url: Optional[str]) -> bool:
+        return bool(url) and url.startswith(('http://', 'https://')) and not url.startswith(self.local_prefixes)
+
+    def load_index(self) -> None:
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def save_index(self) -> None:
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(self.index.items())), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+    def download(self, url: str) -> bytes:
+        """Descarga una imagen respetando la pausa por dominio y el tamaño máximo"""
+        self.throttle.wait(urlsplit(url).hostname or '')
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and not content_type.startswith('image/'):
+                raise ValueError(f"no es una imagen ({content_type})")
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data.extend(chunk)
+                if len(data) > self.max_bytes:
+                    raise ValueError(f"imagen mayor a {self.max_bytes} bytes")
+        return bytes(data)
+
+    def _thumbnail(self, data: bytes) -> Dict[str, Any]:
+        digest = hashlib.sha1(data).hexdigest()
+        name = f"{digest[:16]}.webp"
+        path = os.path.join(self.output_dir, name)
+        # Solo se reclama la ruta bajo el lock; decodificar y reducir ocurre en paralelo
+        with self._write_lock:
+            written = self._claims.get(path)
+            owner = written is None
+            if owner:
+                written = self._claims[path] = threading.Event()
+        if not owner:
+            written.wait()
+        try:
+            # Mismo contenido desde otra URL: se reutiliza la miniatura existente
+            if os.path.exists(path):
+                with Image.open(path) as existing:
+                    width, height = existing.size
+            else:
+                with Image.open(io.BytesIO(data)) as opened:
+                    image = ImageOps.exif_transpose(opened)
+                    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+                    image.thumbnail((self.thumbnail_width, self.thumbnail_width * 4))
+                    width, height = image.size
+                    # Escritura atómica: nunca queda a la vista una miniatura a medio guardar
+                    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                    image.save(tmp_path, 'WEBP', quality=self.thumbnail_quality)
+                    os.replace(tmp_path, path)
+        finally:
+            if owner:
+                written.set()
+        return {
+            'sha1': digest,
+            'src': '/' + os.path.relpath(path, self.public_root).replace(os.sep, '/'),
+            'width': width,
+            'height': height,
+            'original_bytes': len(data),
+        }
+
+    def mirror(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._thumbnail(self.download(url))
+        except Exception as e:
+            print(f"⚠️ No se pudo copiar {url}: {e}")
+            return None
+
+    def _load_datasets(self, names: List[str]) -> Dict[str, Any]:
+        loaded = {}
+        for name in names:
+            data, items = load_dataset(name, self.datasets[name])
+            if items is not None:
+                loaded[name] = (data, items)
+        return loaded
+
+    def _rewrite(self, items: List[Dict[str, Any]], field: str) -> int:
+        """Apunta el campo a la copia local y guarda la URL remota en `<campo>_original`"""
+        rewritten = 0
+        for item in items:
+            original = item.get(f"{field}_original") or item.get(field)
+            entry = self.index.get(original)
+            if entry and item.get(field) != entry['src']:
+                item[f"{field}_original"] = original
+                item[field] = entry['src']
+                rewritten += 1
+        return rewritten
+
+    def run(self, names: Optional[List[str]] = None) -> Optional[Dict[str, int]]:
+        if Image is None:
+            print("⚠️ Pillow no está instalado (pip install pillow); se omite la copia de imágenes")
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.load_index()
+        loaded = self._load_datasets(names or [n for n in self.fields if n in self.datasets])
+
+        # Solo se descargan URLs remotas que no estén ya en el índice (dict: únicas y en orden)
+        remote: Dict[str, None] = {}
+        for name, (_, items) in loaded.items():
+            field = self.fields[name]
+            for item in items:
+                url = item.get(f"{field}_original") or item.get(field)
+                if self.is_remote(url) and url not in self.index:
+                    remote[url] = None
+        pending = list(remote)
+
+        results = self.fetcher.map(self.mirror, pending)
+        mirrored = 0
+        for url, entry in zip(pending, results):
+            if entry:
+                self.index[url] = entry
+                mirrored += 1
+        if mirrored:
+            self.save_index()
+
+        summary = {}
+        for name, (data, items) in loaded.items():
+            summary[name] = self._rewrite(items, self.fields[name])
+            if summary[name]:
+                save_dataset(self.datasets[name], data)
+
+        unique = len({entry['sha1'] for entry in self.index.values()})
+        print(f"✅ {mirrored}/{len(pending)} imágenes nuevas copiadas; índice con {len(self.index)} URLs "
+              f"y {unique} archivos únicos")
+        for name, rewritten in summary.items():
+            print(f"📝 {name}: {rewritten} enlaces reescritos a copias locales")
+        return summary
+
+
+if __name__ == "__main__":
+    ImageMirror().run(sys.argv[1:] or None)
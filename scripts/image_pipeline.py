@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Variantes responsivas (WebP/AVIF) de las imágenes de public/images
+Genera cada imagen en varios anchos con un pool de procesos, omite las que
+no cambiaron según su hash de contenido y escribe un manifiesto JSON con
+dimensiones, variantes y un placeholder para que las páginas usen <picture>.
+
+Requiere Pillow (pip install pillow); sin Pillow no hace nada.
+
+Uso (desde la raíz del repositorio):
+    python scripts/image_pipeline.py
+    python scripts/image_pipeline.py --prune-originals dist [.vercelignore]   # después de `npm run build`
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from config_iso_scraper import IMAGES
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+MANIFEST_VERSION = 1
+
+# Archivos del build donde se buscan referencias a los originales antes de quitarlos
+BUILD_TEXT_EXTENSIONS = ('.html', '.js', '.mjs', '.css', '.json', '.xml', '.txt', '.webmanifest')
+
+# Caracteres con significado especial en los patrones de .gitignore / .vercelignore
+_IGNORE_SPECIAL = re.compile(r'([\\*?\[\]!#])')
+
+
+def file_sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def variant_name(digest: str, width: int, fmt: str) -> str:
+    """Nombre por contenido: imágenes idénticas comparten variantes y los nombres no tienen espacios"""
+    return f"{digest[:16]}-{width}.{fmt}"
+
+
+def _normalized(image: 'Image.Image') -> 'Image.Image':
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    target_mode = 'RGBA' if has_alpha else 'RGB'
+    return image if image.mode == target_mode else image.convert(target_mode)
+
+
+def process_image(task: Tuple[str, str, str, str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Genera las variantes de una imagen (se ejecuta en un proceso del pool)
+
+    Args:
+        task: (ruta de origen, sha1, carpeta de salida, prefijo URL de salida, opciones)
+    """
+    source_path, digest, output_dir, url_prefix, options = task
+    with Image.open(source_path) as opened:
+        if getattr(opened, 'is_animated', False):
+            return {'sha1': digest, 'skipped': 'animated'}
+        image = _normalized(opened)
+        width, height = image.size
+
+        max_width = max(options['widths'])
+        targets = sorted({w for w in options['widths'] if w < width} | {min(width, max_width)})
+        variants = []
+        for target in targets:
+            target_height = max(1, round(height * target / width))
+            resized = image if target == width else image.resize((target, target_height), Image.LANCZOS)
+            for fmt, quality in options['formats'].items():
+                name = variant_name(digest, target, fmt)
+                path = os.path.join(output_dir, name)
+                if not os.path.exists(path):
+                    resized.save(path, fmt.upper(), quality=quality)
+                variants.append({
+                    'format': fmt,
+                    'width': target,
+                    'height': target_height,
+                    'src': f"{url_prefix}/{name}",
+                    'bytes': os.path.getsize(path),
+                })
+
+        placeholder = image.copy()
+        placeholder.thumbnail((options['placeholder_width'], options['placeholder_width'] * height // width or 1))
+        buffer = io.BytesIO()
+        placeholder.save(buffer, 'WEBP', quality=30)
+
+    return {
+        'sha1': digest,
+        'width': width,
+        'height': height,
+        'variants': variants,
+        'placeholder': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+    }
+
+
+class ImagePipeline:
+    """
+    Recorre `source_dir`, procesa solo imágenes nuevas o modificadas y
+    mantiene el manifiesto y la carpeta de variantes sincronizados
+    """
+
+    def __init__(self, config: Dict[str, Any] = IMAGES):
+        self.source_dir = config['source_dir']
+        self.public_root = config['public_root']
+        self.output_dir = config['output_dir']
+        self.manifest_path = config['manifest']
+        self.extensions = tuple(config['extensions'])
+        self.max_workers = config['max_workers']
+        formats = dict(config['formats'])
+        if Image is not None and not features.check('avif'):
+            formats.pop('avif', None)
+        self.options = {
+            'widths': sorted(config['widths']),
+            'formats': formats,
+            'placeholder_width': config['placeholder_width'],
+        }
+        self.url_prefix = self._url(self.output_dir)
+
+    def _url(self, path: str) -> str:
+        return '/' + os.path.relpath(path, self.public_root).replace(os.sep, '/')
+
+    def scan(self) -> List[Tuple[str, str]]:
+        """(ruta, URL del sitio) de cada imagen de origen"""
+        output = os.path.abspath(self.output_dir)
+        found = []
+        for root, dirs, files in os.walk(self.source_dir):
+            dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) != output)
+            for name in sorted(files):
+                if name.lower().endswith(self.extensions):
+                    path = os.path.join(root, name)
+                    found.append((path, self._url(path)))
+        return found
+
+    def load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('options') != self.options:
+            return {}  # Cambiaron anchos, formatos o calidades: regenerar todo
+        return manifest.get('images', {})
+
+    def _is_current(self, entry: Optional[Dict[str, Any]], digest: str) -> bool:
+        if not entry or entry.get('sha1') != digest or not entry.get('variants'):
+            return False
+        return all(os.path.exists(os.path.join(self.output_dir, os.path.basename(v['src'])))
+                   for v in entry.get('variants', []))
+
+    def run(self) -> Optional[Dict[str, Any]]:
+        if Image is None:
+            print("⚠️ Pillow no está instalado (pip install pillow); se omiten las variantes de imágenes")
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        previous = self.load_manifest()
+        images: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, List[Tuple[str, os.stat_result]]] = {}  # sha1 -> [(url, stat)]
+        sources: Dict[str, str] = {}
+        reused = 0
+
+        for path, url in self.scan():
+            stat = os.stat(path)
+            entry = previous.get(url)
+            # Mismo tamaño y fecha de modificación: no hace falta volver a leer el archivo
+            if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                digest = entry['sha1']
+            else:
+                digest = file_sha1(path)
+            if self._is_current(entry, digest):
+                images[url] = {**entry, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                reused += 1
+                continue
+            pending.setdefault(digest, []).append((url, stat))
+            sources.setdefault(digest, path)
+
+        failed = skipped = 0
+        if pending:
+            tasks = [(sources[digest], digest, self.output_dir, self.url_prefix, self.options) for digest in pending]
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(process_image, task): task[1] for task in tasks}
+                for future in as_completed(futures):
+                    digest = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"⚠️ No se pudo procesar {sources[digest]}: {e}")
+                        failed += 1
+                        continue
+                    if result.get('skipped'):
+                        skipped += 1  # Animadas: las páginas usan el original tal cual
+                        continue
+                    for url, stat in pending[digest]:
+                        images[url] = {**result, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        removed = self._prune(images)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'options': self.options,
+            'images': dict(sorted(images.items())),
+        }
+        self._write_manifest(manifest)
+
+        original = sum(entry['size'] for entry in images.values())
+        optimized = sum(self._lightest_full_width(entry) for entry in images.values())
+        print(f"✅ {len(images)} imágenes: {len(pending)} procesadas, {reused} sin cambios, "
+              f"{skipped} omitidas, {failed} con error, {removed} variantes obsoletas eliminadas")
+        print(f"📦 Originales {original / 1e6:.1f} MB -> variante más liviana al ancho mayor {optimized / 1e6:.1f} MB")
+        return manifest
+
+    @staticmethod
+    def _lightest_full_width(entry: Dict[str, Any]) -> int:
+        """Bytes de la variante más liviana al ancho mayor (el original si no hay variantes)"""
+        variants = entry.get('variants') or []
+        if not variants:
+            return entry['size']
+        widest = max(v['width'] for v in variants)
+        return min(v['bytes'] for v in variants if v['width'] == widest)
+
+    def _prune(self, images: Dict[str, Dict[str, Any]]) -> int:
+        keep = {os.path.basename(v['src']) for entry in images.values() for v in entry.get('variants', [])}
+        removed = 0
+        for name in os.listdir(self.output_dir):
+            if name not in keep:
+                os.remove(os.path.join(self.output_dir, name))
+                removed += 1
+        return removed
+
+    def prune_originals(self, build_dir: str, ignore_file: Optional[str] = None) -> int:
+        """
+        Quita del build los originales que ya tienen variantes
+
+        Solo borra en `build_dir` los que ningún archivo de texto del build
+        sigue referenciando; public/images no se toca. Si se indica
+        `ignore_file` (.vercelignore), los agrega como exclusiones para que
+        no viajen en el upload del deploy.
+        """
+        manifest = self.load_manifest()
+        candidates = {url for url, entry in manifest.items() if entry.get('variants')}
+        if not candidates:
+            return 0
+        referenced = set()
+        for root, _, files in os.walk(build_dir):
+            for name in files:
+                if not name.endswith(BUILD_TEXT_EXTENSIONS):
+                    continue
+                with open(os.path.join(root, name), encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                for url in candidates - referenced:
+                    if url in content or quote(url) in content:
+                        referenced.add(url)
+
+        unreferenced = sorted(candidates - referenced)
+        freed = 0
+        for url in unreferenced:
+            path = os.path.join(build_dir, url.lstrip('/').replace('/', os.sep))
+            if os.path.exists(path):
+                freed += os.path.getsize(path)
+                os.remove(path)
+        if ignore_file:
+            self._exclude_from_deploy(unreferenced, ignore_file)
+        print(f"🧹 {len(unreferenced)} originales reemplazados por variantes ({freed / 1e6:.1f} MB menos en el build), "
+              f"{len(referenced)} se conservan por estar referenciados")
+        return len(unreferenced)
+
+    def _exclude_from_deploy(self, urls: List[str], ignore_file: str) -> None:
+        """Agrega los originales de public_root a un .vercelignore, respetando su codificación"""
+        try:
+            with open(ignore_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b''
+        encoding = 'utf-16' if raw.startswith((b'\xff\xfe', b'\xfe\xff')) else 'utf-8'
+        text = raw.decode(encoding)
+        newline = '\r\n' if '\r\n' in text else '\n'
+        existing = {line.strip() for line in text.splitlines()}
+
+        public = os.path.relpath(self.public_root).replace(os.sep, '/')
+        patterns = [_IGNORE_SPECIAL.sub(r'\\\1', f"/{public}{url}") for url in urls]
+        added = [pattern for pattern in patterns if pattern not in existing]
+        if not added:
+            return
+        if text and not text.endswith(('\n', '\r')):
+            text += newline
+        text += newline.join(added) + newline
+        # El BOM de UTF-16 lo vuelve a escribir el codec
+        with open(ignore_file, 'wb') as f:
+            f.write(text.encode(encoding))
+        print(f"🚫 {len(added)} originales excluidos del deploy en {ignore_file}")
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        content = json.dumps(manifest, ensure_ascii=False, indent=2) + '\n'
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                if f.read() == content:
+                    return
+        except FileNotFoundError:
+            pass
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) in (3, 4) and sys.argv[1] == '--prune-originals':
+        ImagePipeline().prune_originals(*sys.argv[2:])
+    else:
+        ImagePipeline().run()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Búsqueda de noticias internacionales sobre normas ISO en varios idiomas (NewsAPI)
+Reparte las consultas de todos los idiomas de INTERNATIONAL['languages'] en
+el mismo grupo de hilos, con una sola cuota y un solo limitador de tasa: un
+idioma más suma sus requests, no otra pasada completa. Combina y de-duplica
+los resultados en src/data/iso_news_international.json, con el conteo por
+idioma en `metadata`.
+
+Uso (desde la raíz del repositorio):
+    python scripts/iso_news_international.py [--languages es,en,pt]
+"""
+
+import argparse
+import itertools
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from article import Article
+from config_iso_scraper import INTERNATIONAL
+from iso_news_scraper_newsapi import ISONewsScraperNewsAPI
+from query_planner import PlannedQuery
+from run_metrics import RunMetrics
+from state_store import ArticleStateStore
+from url_utils import canonicalize_url, unique_by_url
+
+
+class ISONewsScraperInternational(ISONewsScraperNewsAPI):
+    """
+    Scraper NewsAPI multilenguaje: mismo flujo que el de español (estado
+    incremental, relevancia, historial y de-duplicado) con su propio estado y
+    archivo de salida. Cada artículo lleva en `language` el idioma de la
+    consulta que lo encontró primero (en el orden de `languages`).
+    """
+
+    scraper_key = 'international'
+    output_filename = INTERNATIONAL['output_file']
+    archive_dataset = 'iso_news_international'
+    data_source = "NewsAPI - Noticias ISO internacionales"
+
+    def __init__(self, output_dir: str = r"src/data", languages: Optional[Dict[str, List[str]]] = None,
+                 session: Optional[requests.Session] = None, state: Optional[ArticleStateStore] = None,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            languages: Código de idioma -> términos; por defecto INTERNATIONAL['languages']
+            state: Almacén de estado; por defecto uno propio, separado del de
+                iso_news.json para que un artículo ya visto allí no se omita aquí
+        """
+        super().__init__(output_dir, session=session,
+                         state=state or ArticleStateStore(INTERNATIONAL['state_path']),
+                         metrics=metrics or RunMetrics(self.scraper_key))
+        self.languages = languages or INTERNATIONAL['languages']
+        self.search_terms = sorted({term for terms in self.languages.values() for term in terms})
+        self.article_languages: Dict[str, str] = {}
+        self.fetched_by_language: Dict[str, int] = {}
+
+    def plan_queries(self) -> List[Tuple[str, PlannedQuery]]:
+        """
+        Consultas agrupadas de todos los idiomas, intercaladas (es, en, pt, es,
+        en...) para que ningún idioma espere a que otro agote la cuota
+        """
+        per_language = [
+            [(language, planned) for planned in self.query_planner.plan(terms, days_back=INTERNATIONAL['days_back'])]
+            for language, terms in self.languages.items()
+        ]
+        return [query for group in itertools.zip_longest(*per_language) for query in group if query]
+
+    def get_iso_news_from_api(self) -> List[Dict[str, Any]]:
+        """
+        Ejecuta las consultas de todos los idiomas en paralelo y combina los
+        resultados; sin artículos de respaldo si la API no responde (el
+        historial mantiene la última salida válida)
+        """
+        queries = self.plan_queries()
+        self.logger.info(
+            f"Ejecutando {len(queries)} consultas agrupadas en {len(self.languages)} idiomas "
+            f"({', '.join(self.languages)})"
+        )
+
+        results = self.fetcher.map(
+            lambda query: list(self.search_newsapi(query[1].q, language=query[0], days_back=query[1].days_back)),
+            queries
+        )
+
+        # Un artículo encontrado en varios idiomas queda con el primero de `languages`
+        by_language: Dict[str, List[Dict[str, Any]]] = {language: [] for language in self.languages}
+        for (language, _), articles in zip(queries, results):
+            by_language[language].extend(articles or [])
+        all_articles = []
+        for language, articles in by_language.items():
+            self.fetched_by_language[language] = len(articles)
+            for article in articles:
+                self.article_languages.setdefault(canonicalize_url(article.get('url') or ''), language)
+            all_articles.extend(articles)
+
+        self.fetcher.report(self.request_count, self.rate_limiter)
+        self.quota.report()
+        self.http.report()
+        self.logger.info(f"Caché HTTP: {self.http_cache.stats()}")
+        self.logger.info(f"Obtenidos por idioma: {self.fetched_by_language}")
+
+        if not self.api_working:
+            self.logger.warning("NewsAPI no disponible: se publica solo el historial")
+
+        unique_articles = unique_by_url(all_articles)
+        self.metrics.record_drops('url_dedupe', {'duplicate_url': len(all_articles) - len(unique_articles)})
+        return unique_articles
+
+    def process_newsapi_articles(self, articles: List[Dict[str, Any]]) -> List[Article]:
+        processed = super().process_newsapi_articles(articles)
+        for article in processed:
+            article['language'] = self.article_languages.get(canonicalize_url(article.url), '')
+        return processed
+
+    def extra_metadata(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        articles_by_language = {language: 0 for language in self.languages}
+        for article in data:
+            language = article.get('language', '')
+            articles_by_language[language] = articles_by_language.get(language, 0) + 1
+        return {
+            "languages": list(self.languages),
+            "articles_by_language": articles_by_language,
+            "fetched_by_language": self.fetched_by_language,
+            "search_terms": self.languages,
+        }
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Noticias ISO internacionales en varios idiomas (NewsAPI)")
+    parser.add_argument('--languages', help=f"Idiomas separados por coma (por defecto: {','.join(INTERNATIONAL['languages'])})")
+    args = parser.parse_args()
+
+    languages = None
+    if args.languages:
+        codes = [code.strip() for code in args.languages.split(',') if code.strip()]
+        unknown = [code for code in codes if code not in INTERNATIONAL['languages']]
+        if unknown:
+            parser.error(f"Idiomas sin términos en INTERNATIONAL['languages']: {', '.join(unknown)}")
+        languages = {code: INTERNATIONAL['languages'][code] for code in codes}
+
+    print("🚀 Iniciando búsqueda de noticias ISO internacionales usando NewsAPI")
+    print("=" * 70)
+
+    scraper = ISONewsScraperInternational(languages=languages)
+    try:
+        generated_files = scraper.run_complete_analysis()
+    except Exception as e:
+        print(f"❌ Error durante la ejecución: {str(e)}")
+        raise
+
+    print("\n✅ Búsqueda completada exitosamente!")
+    print("\n📄 Archivo JSON generado:")
+    for file_type, filepath in generated_files.items():
+        print(f"   • {file_type.replace('_', ' ').title()}: {os.path.basename(filepath)}")
+    print(f"\n🌍 Idiomas: {', '.join(scraper.languages)}")
+    for language, total in scraper.fetched_by_language.items():
+        print(f"   • {language}: {total} noticias obtenidas")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,22 +12,42 @@ from typing import Dict, List, Any, Optional
 import time
 import logging
 
+from article import Article, json_default
+from article_archive import archive_articles
+from article_extractor import ArticleExtractor
+from config_iso_scraper import NEWSAPI
+from date_parsing import parse_date
+from http_cache import install_cache
+from http_transport import new_session
+from relevance import DomainMatcher, KeywordMatcher, get_default_scorer
+from resilience import ResilientClient
+from run_metrics import RunMetrics
+from url_utils import canonicalize_url, unique_by_url
+
 class ISONewsScraperEnhanced:
-    def __init__(self, output_dir: str = r"src/data"):
+    def __init__(self, output_dir: str = r"src/data", session: Optional[requests.Session] = None,
+                 metrics: Optional[RunMetrics] = None):
         """
         Inicializa el scraper de noticias ISO usando NewsAPI
+        (con `session` y `metrics` se comparten la sesión HTTP y las métricas, p. ej. desde pipeline.py)
         """
         self.output_dir = output_dir
-        self.session = requests.Session()
+        self.session = session or new_session()
+        self.http_cache = install_cache(self.session)
+        self.metrics = (metrics or RunMetrics('enhanced')).attach(self.session)
         
         # NewsAPI Configuration
         self.newsapi_key = os.getenv('NEWSAPI_KEY', 'a5b0b5d5ed814c2b9b1f8a8c8e8f8e8f')  # Placeholder
-        self.newsapi_base_url = "https://newsapi.org/v2"
+        self.newsapi_base_url = os.getenv('NEWSAPI_BASE_URL', NEWSAPI['base_url']).rstrip('/')
+        self.inn_news_url = "https://www.inn.cl/noticias"
         
         # Configurar logging
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
         
+        # Timeouts, reintentos con backoff y circuit breaker por host
+        self.http = ResilientClient(self.session, metrics=self.metrics, logger=self.logger)
+        
         # Crear directorio de salida
         os.makedirs(output_dir, exist_ok=True)
         
@@ -51,8 +71,16 @@ class ISONewsScraperEnhanced:
             'cnnchile.com', 't13.cl', 'meganoticias.cl'
         ]
         
+        # Matchers compilados una vez: dominios chilenos, menciones a Chile y relevancia ISO
+        self.chilean_domain_matcher = DomainMatcher(self.chilean_domains)
+        self.chile_mention_matcher = KeywordMatcher(['chile'], prefix=True)
+        self.relevance = get_default_scorer()
+        
         # Lista de artículos hardcodeados (puedes agregar manualmente si lo deseas)
         self.hardcoded_articles = []
+        
+        # Extracción de contenido completo en paralelo con pausas por dominio
+        self.extractor = ArticleExtractor(self.session, logger=self.logger, metrics=self.metrics)
 
     def search_newsapi(self, query: str, language: str = 'es', days_back: int = 30) -> List[Dict[str, Any]]:
         """
@@ -75,7 +103,8 @@ class ISONewsScraperEnhanced:
         
         try:
             # Buscar en everything endpoint (más amplio)
-            response = self.session.get(f"{self.newsapi_base_url}/everything", params=params)
+            with self.metrics.timer('newsapi.search'):
+                response = self.http.get(f"{self.newsapi_base_url}/everything", params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -83,9 +112,13 @@ class ISONewsScraperEnhanced:
                 self.logger.info(f"Encontradas {len(articles)} noticias para '{query}'")
             else:
                 self.logger.warning(f"Error en NewsAPI para '{query}': {response.status_code}")
+                self.metrics.record_failure('newsapi.search')
                 
         except Exception as e:
             self.logger.error(f"Error buscando '{query}': {str(e)}")
+            if isinstance(e, requests.RequestException):
+                self.metrics.record_error(self.newsapi_base_url)
+            self.metrics.record_failure('newsapi.search')
         
         return articles
 
@@ -103,16 +136,10 @@ class ISONewsScraperEnhanced:
         
         # Filtrar artículos que mencionen Chile o tengan dominios chilenos
         for article in general_articles:
-            url = article.get('url', '')
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            
-            # Verificar si es relevante para Chile
+            text = f"{article.get('title') or ''} {article.get('description') or ''}"
             is_chilean = (
-                any(domain in url for domain in self.chilean_domains) or
-                'chile' in title or 'chile' in description or
-                'chileno' in title or 'chileno' in description or
-                'chilena' in title or 'chilena' in description
+                self.chilean_domain_matcher.matches(article.get('url') or '') or
+                bool(self.chile_mention_matcher.find(text))
             )
             
             if is_chilean:
@@ -141,20 +168,15 @@ class ISONewsScraperEnhanced:
             # Pausa entre búsquedas para respetar límites de API
             time.sleep(1)
         
-        # Eliminar duplicados basándose en URL
-        unique_articles = {}
-        for article in all_articles:
-            url = article.get('url')
-            if url and url not in unique_articles:
-                unique_articles[url] = article
-        
-        return list(unique_articles.values())
+        # Eliminar duplicados basándose en la URL canónica (tracking, AMP, www)
+        return unique_by_url(all_articles)
 
-    def process_newsapi_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def process_newsapi_articles(self, articles: List[Dict[str, Any]]) -> List[Article]:
         """
         Procesa artículos de NewsAPI al formato esperado
         """
         processed_articles = []
+        scraped_at = datetime.now().isoformat()
         
         for article in articles:
             try:
@@ -167,50 +189,48 @@ class ISONewsScraperEnhanced:
                 image_url = article.get('urlToImage', '')
                 content = article.get('content', '')
                 
-                # Formatear fecha
-                try:
-                    if published_at:
-                        date_obj = datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%SZ')
-                        formatted_date = date_obj.strftime('%d/%m/%Y')
-                    else:
-                        formatted_date = datetime.now().strftime('%d/%m/%Y')
-                except:
-                    formatted_date = datetime.now().strftime('%d/%m/%Y')
-                
                 # Crear resumen
                 summary = description if description else (content[:200] + '...' if content and len(content) > 200 else content)
                 
-                # Determinar si es de Chile
-                is_chilean = any(domain in url for domain in self.chilean_domains)
-                
-                processed_article = {
-                    'title': title,
-                    'url': url,
-                    'source': f"{source_name}{'🇨🇱' if is_chilean else '🌍'}",
-                    'date': formatted_date,
-                    'summary': summary,
-                    'image_url': image_url,
-                    'full_content': content,
-                    'content_length': len(content) if content else 0,
-                    'scraped_at': datetime.now().isoformat(),
-                    'scraping_success': True,
-                    'is_chilean_source': is_chilean,
-                    'published_at': published_at
-                }
+                # Determinar si es de Chile (la fecha queda vacía si NewsAPI no la entrega o no es válida)
+                processed_article = Article(
+                    title, url, source_name, summary or '',
+                    date=parse_date(published_at),
+                    region='CL' if self.chilean_domain_matcher.matches(url) else 'INT',
+                    content=content or '',
+                    image_url=image_url,
+                    scraped_at=scraped_at,
+                    scraping_success=True,
+                    published_at=published_at
+                )
                 
                 processed_articles.append(processed_article)
                 
             except Exception as e:
                 self.logger.warning(f"Error procesando artículo: {str(e)}")
+                self.metrics.record_failure('normalize')
                 continue
         
-        return processed_articles
+        # Aplicar las mismas reglas de relevancia que los demás scrapers
+        relevant_articles, dropped = self.relevance.filter(processed_articles)
+        self.metrics.record_drops('relevance', dropped)
+        if dropped:
+            self.logger.info(f"Descartados por relevancia: {dropped}")
+        
+        return relevant_articles
+    
+    def scrape_direct_urls(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extrae el contenido completo de cada artículo desde su URL
+        """
+        return self.extractor.scrape(articles)
     
     def save_results_json(self, data: List[Dict[str, Any]], filename: str) -> str:
         """
         Guarda los resultados en formato JSON
         """
         filepath = os.path.join(self.output_dir, filename)
+        metrics = self.metrics.snapshot()
         
         output_data = {
             "metadata": {
@@ -218,16 +238,19 @@ class ISONewsScraperEnhanced:
                 "data_source": self.inn_news_url,
                 "total_articles": len(data),
                 "successful_scrapes": len([a for a in data if a.get('scraping_success', False)]),
-                "failed_scrapes": len([a for a in data if not a.get('scraping_success', True)])
+                "failed_scrapes": sum(metrics['failures'].values()),
+                "metrics": metrics
             },
             "articles": data
         }
 
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
+                json.dump(output_data, f, ensure_ascii=False, indent=2, default=json_default)
             
             self.logger.info(f"Resultados guardados en: {filepath}")
+            self.logger.info(f"Métricas agregadas a: {self.metrics.write(metrics)}")
+            archive_articles('iso_news', data, self.logger)
             return filepath
             
         except Exception as e:
@@ -240,25 +263,35 @@ class ISONewsScraperEnhanced:
         """
         self.logger.info("Iniciando el scraping de noticias ISO Chile")
         
-        # 1. Obtener la lista de artículos de INN
-        inn_articles = []  # O dejar vacío si no es necesario, o reemplazar por otro método si corresponde
+        # 1. Obtener de NewsAPI las noticias relevantes cuyo contenido se va a extraer
+        with self.metrics.timer('stage:fetch'):
+            newsapi_articles = self.process_newsapi_articles(self.get_iso_news_from_api())
         
         # 2. Combinar con artículos hardcodeados y de-duplicar
-        combined_articles = {article['url']: article for article in inn_articles}
+        combined_articles = {canonicalize_url(article['url']): article for article in newsapi_articles}
         for article in self.hardcoded_articles:
-            if article['url'] not in combined_articles:
-                combined_articles[article['url']] = article
+            if canonicalize_url(article['url']) not in combined_articles:
+                combined_articles[canonicalize_url(article['url'])] = article
 
         articles_to_scrape = list(combined_articles.values())
+        self.metrics.record_drops('url_dedupe', {
+            'duplicate_url': len(newsapi_articles) + len(self.hardcoded_articles) - len(articles_to_scrape)
+        })
+        
+        # Sin artículos no se sobrescribe la salida anterior con un archivo vacío
+        if not articles_to_scrape:
+            self.logger.warning("No hay artículos para extraer; se conserva el archivo existente")
+            return {}
 
         # 3. Extraer contenido para todos los artículos
         self.logger.info(f"Se procesará(n) {len(articles_to_scrape)} artículo(s) único(s).")
-        final_articles = self.scrape_direct_urls(articles_to_scrape)
+        with self.metrics.timer('stage:extract'):
+            final_articles = self.scrape_direct_urls(articles_to_scrape)
 
         files_generated = {}
         
-        # Use a canonical filename instead of a timestamped one
-        canonical_filename = 'iso_news.json'
+        # Nombre fijo propio: iso_news.json es la salida combinada de pipeline.py
+        canonical_filename = 'iso_news_enhanced.json'
         
         files_generated['articles'] = self.save_results_json(
             final_articles, canonical_filename
@@ -276,6 +309,9 @@ def main():
     
     try:
         generated_files = scraper.run_complete_analysis()
+        if not generated_files:
+            print("\n⚠️ No se encontraron artículos; no se generó ningún archivo")
+            return
         
         print("\nâœ… Scraping completado exitosamente!")
         print(f"\nðŸ“ Archivo JSON generado:")
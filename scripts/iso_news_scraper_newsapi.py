@@ -8,26 +8,72 @@ import requests
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-import time
+from typing import Dict, Iterator, List, Any, Optional
+import threading
 import logging
 
+from article import Article, json_default
+from article_archive import archive_articles
+from config_iso_scraper import NEWSAPI
+from date_parsing import parse_date
+from dedupe import deduplicate_articles
+from fetch_engine import ConcurrentFetcher, TokenBucket
+from http_cache import install_cache
+from http_transport import new_session
+from query_planner import CHILEAN_QUALIFIERS, QueryPlanner, QuotaTracker
+from relevance import DomainMatcher, KeywordMatcher, get_default_scorer
+from resilience import ResilientClient
+from run_metrics import RunMetrics
+from state_store import UNCHANGED, ArticleStateStore, content_hash, merge_with_history
+from url_utils import unique_by_url
+
 class ISONewsScraperNewsAPI:
-    def __init__(self, output_dir: str = r"src/data"):
+    # Clave en el almacén de estado y en las métricas, archivo de salida y dataset del archivo histórico
+    scraper_key = 'newsapi'
+    output_filename = 'iso_news_newsapi.json'  # iso_news.json es la salida combinada de pipeline.py
+    archive_dataset = 'iso_news'
+    data_source = "NewsAPI - Noticias ISO en Español"
+
+    def __init__(self, output_dir: str = r"src/data", session: Optional[requests.Session] = None,
+                 state: Optional[ArticleStateStore] = None, metrics: Optional[RunMetrics] = None):
         """
         Inicializa el scraper de noticias ISO usando NewsAPI
+        
+        Args:
+            session: Sesión HTTP compartida (p. ej. por pipeline.py); por defecto una propia
+            state: Almacén de estado compartido; por defecto uno propio
+            metrics: Métricas de la ejecución compartidas; por defecto unas propias
         """
         self.output_dir = output_dir
-        self.session = requests.Session()
+        self.session = session or new_session()
+        self.http_cache = install_cache(self.session)
+        self.metrics = (metrics or RunMetrics(self.scraper_key)).attach(self.session)
+        
+        # Configurar logging
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.logger = logging.getLogger(__name__)
+        
+        # Timeouts, reintentos con backoff (429 con Retry-After) y circuit breaker por host
+        self.http = ResilientClient(self.session, metrics=self.metrics, logger=self.logger)
         
         # NewsAPI Configuration
         # Para producción, necesitarás una clave real de NewsAPI
         self.newsapi_key = os.getenv('NEWSAPI_KEY', '8b2a1c3d4e5f6g7h8i9j0k1l2m3n4o5p')  # Placeholder
-        self.newsapi_base_url = "https://newsapi.org/v2"
+        self.newsapi_base_url = os.getenv('NEWSAPI_BASE_URL', NEWSAPI['base_url']).rstrip('/')
         
-        # Configurar logging
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-        self.logger = logging.getLogger(__name__)
+        # Limitador de tasa y motor concurrente (reemplazan las pausas fijas)
+        self.rate_limiter = TokenBucket(NEWSAPI['requests_per_second'], NEWSAPI['burst'])
+        self.fetcher = ConcurrentFetcher(NEWSAPI['max_workers'], self.logger)
+        self.request_count = 0
+        self.api_working = False
+        self._count_lock = threading.Lock()
+        
+        # Planificador de consultas OR y control de cuota por ejecución
+        self.query_planner = QueryPlanner(NEWSAPI['max_query_length'])
+        self.quota = QuotaTracker(NEWSAPI['max_requests_per_run'], self.logger)
+        
+        # Estado persistente para procesar solo artículos nuevos o modificados
+        self.state = state or ArticleStateStore()
         
         # Crear directorio de salida
         os.makedirs(output_dir, exist_ok=True)
@@ -54,15 +100,29 @@ class ISONewsScraperNewsAPI:
             'chile.com', 'chilevisión.cl', 'mega.cl',
             'inn.cl', 'sernac.cl', 'gob.cl'
         ]
+        
+        # Matchers compilados una vez: dominios chilenos, menciones a Chile y relevancia ISO
+        self.chilean_domain_matcher = DomainMatcher(self.chilean_domains)
+        self.chile_mention_matcher = KeywordMatcher(['chile'], prefix=True)
+        self.relevance = get_default_scorer()
 
-    def search_newsapi(self, query: str, language: str = 'es', days_back: int = 30) -> List[Dict[str, Any]]:
+    def search_newsapi(self, query: str, language: str = 'es', days_back: int = 30,
+                       page_size: int = NEWSAPI['page_size']) -> Iterator[Dict[str, Any]]:
         """
-        Busca noticias usando NewsAPI
+        Busca noticias usando NewsAPI, paginando por fecha de publicación
+        
+        Generador: recorre páginas ordenadas por `publishedAt` y se detiene al
+        cruzar la marca de agua (último artículo visto en la ejecución exitosa
+        anterior para esta consulta), al agotar resultados o al llegar a
+        NEWSAPI['max_pages'].
         """
-        articles = []
+        watermark_key = f"{language}:{query}"
+        watermark = self.state.get_watermark(watermark_key)
         
-        # Fecha desde hace X días
-        from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        # Ventana: desde la marca de agua o desde hace X días, lo más reciente. El inicio
+        # se redondea al día para que la URL (clave de la caché HTTP) no cambie en cada ejecución
+        window_start = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%dT00:00:00')
+        from_date = max(watermark.rstrip('Z'), window_start) if watermark else window_start
         
         # Parámetros de búsqueda
         params = {
@@ -70,106 +130,110 @@ class ISONewsScraperNewsAPI:
             'language': language,
             'from': from_date,
             'sortBy': 'publishedAt',
-            'pageSize': 20,
+            'pageSize': page_size,
             'apiKey': self.newsapi_key
         }
         
-        try:
-            # Buscar en everything endpoint (más amplio)
-            response = self.session.get(f"{self.newsapi_base_url}/everything", params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                articles.extend(data.get('articles', []))
-                self.logger.info(f"Encontradas {len(articles)} noticias para '{query}'")
-            elif response.status_code == 429:
-                self.logger.warning(f"Límite de API alcanzado para '{query}'")
-            elif response.status_code == 401:
-                self.logger.error("Clave de API inválida o no proporcionada")
-            else:
-                self.logger.warning(f"Error en NewsAPI para '{query}': {response.status_code}")
+        newest = watermark
+        found = 0
+        completed = True
+        
+        for page in range(1, NEWSAPI['max_pages'] + 1):
+            try:
+                # Buscar en everything endpoint (más amplio); los reintentos por 429
+                # esperan lo que pida Retry-After y también consumen cuota
+                with self.metrics.timer('newsapi.search'):
+                    response = self.http.get(
+                        f"{self.newsapi_base_url}/everything", params={**params, 'page': page},
+                        before_attempt=self._reserve_request
+                    )
+                if response is None:
+                    self.logger.warning(f"Cuota de NewsAPI agotada, se omite '{query}' (página {page})")
+                    completed = False
+                    break
+                self.quota.record_status(response.status_code)
+                if getattr(response, 'from_cache', False):
+                    self.quota.refund()
                 
-        except Exception as e:
-            self.logger.error(f"Error buscando '{query}': {str(e)}")
+                if response.status_code == 200:
+                    self.api_working = True
+                    data = response.json()
+                    page_articles = data.get('articles', [])
+                elif response.status_code == 426:
+                    # El plan gratuito no permite paginar más allá de cierto límite
+                    self.logger.info(f"Límite de paginación alcanzado para '{query}'")
+                    break
+                elif response.status_code == 429:
+                    self.logger.warning(f"Límite de API alcanzado para '{query}'")
+                    completed = False
+                    break
+                elif response.status_code == 401:
+                    self.logger.error("Clave de API inválida o no proporcionada")
+                    completed = False
+                    break
+                else:
+                    self.logger.warning(f"Error en NewsAPI para '{query}': {response.status_code}")
+                    self.metrics.record_failure('newsapi.search')
+                    completed = False
+                    break
+                    
+            except Exception as e:
+                self.logger.error(f"Error buscando '{query}': {str(e)}")
+                if isinstance(e, requests.RequestException):
+                    self.metrics.record_error(self.newsapi_base_url)
+                self.metrics.record_failure('newsapi.search')
+                completed = False
+                break
+            
+            crossed_watermark = False
+            for article in page_articles:
+                published_at = article.get('publishedAt') or ''
+                if watermark and published_at and published_at <= watermark:
+                    crossed_watermark = True
+                    break
+                if published_at and (newest is None or published_at > newest):
+                    newest = published_at
+                found += 1
+                yield article
+            
+            if crossed_watermark or len(page_articles) < page_size or page * page_size >= data.get('totalResults', 0):
+                break
+        else:
+            # Quedan páginas sin leer: avanzar la marca de agua las saltaría para siempre
+            self.logger.warning(f"Se alcanzó el máximo de {NEWSAPI['max_pages']} páginas para '{query}'")
+            completed = False
         
-        return articles
+        self.logger.info(f"Encontradas {found} noticias nuevas para '{query}'")
+        
+        # Una consulta interrumpida no avanza la marca de agua, para no perder
+        # las páginas no leídas; se confirma solo cuando la ejecución termina bien
+        if completed and newest and newest != watermark:
+            self.state.set_watermark(watermark_key, newest)
+
+    def _reserve_request(self) -> bool:
+        """Reserva cuota y espera turno en el limitador antes de cada intento"""
+        if not self.quota.try_consume():
+            return False
+        self.metrics.record_wait('rate_limiter', self.rate_limiter.acquire())
+        with self._count_lock:
+            self.request_count += 1
+        return True
 
-    def search_chilean_sources(self, query: str) -> List[Dict[str, Any]]:
+    def filter_chilean(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Busca específicamente en fuentes chilenas usando NewsAPI
+        Filtra artículos que mencionen Chile o tengan dominios chilenos
         """
-        articles = []
-        
-        # Términos específicos para Chile
-        chilean_queries = [
-            f"{query} Chile",
-            f"Chile {query}",
-            f"{query} chileno",
-            f"{query} chilena"
-        ]
-        
-        for chilean_query in chilean_queries:
-            # Buscar en fuentes generales con filtro de Chile
-            general_articles = self.search_newsapi(chilean_query, days_back=60)
-            
-            # Filtrar artículos que mencionen Chile o tengan dominios chilenos
-            for article in general_articles:
-                url = article.get('url', '')
-                title = article.get('title', '').lower()
-                description = article.get('description', '').lower()
-                
-                # Verificar si es relevante para Chile
-                is_chilean = (
-                    any(domain in url for domain in self.chilean_domains) or
-                    'chile' in title or 'chile' in description or
-                    'chileno' in title or 'chileno' in description or
-                    'chilena' in title or 'chilena' in description
-                )
-                
-                if is_chilean:
-                    articles.append(article)
-            
-            # Pausa entre consultas
-            time.sleep(1)
-        
-        return articles
+        return [article for article in articles if self.is_chilean_article(article)]
 
-    def get_fallback_articles(self) -> List[Dict[str, Any]]:
+    def is_chilean_article(self, article: Dict[str, Any]) -> bool:
         """
-        Proporciona artículos de respaldo si NewsAPI no está disponible
+        Verifica si un artículo es relevante para Chile (dominio o mención
+        de Chile, chileno o chilena en título o descripción)
         """
-        fallback_articles = [
-            {
-                "title": "Tendencias en Certificaciones ISO para 2025",
-                "url": "https://www.iso.org/news/ref2825.html",
-                "source": {"name": "ISO Internacional"},
-                "publishedAt": datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
-                "description": "Las nuevas tendencias en certificaciones ISO que marcarán el 2025, incluyendo sostenibilidad y transformación digital.",
-                "urlToImage": "",
-                "content": "Las organizaciones buscan cada vez más certificaciones ISO que integren sostenibilidad y tecnología..."
-            },
-            {
-                "title": "ISO 9001: Clave para la Competitividad Empresarial",
-                "url": "https://www.example.com/iso-9001-competitividad",
-                "source": {"name": "Gestión Empresarial"},
-                "publishedAt": (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%dT%H:%M:%SZ'),
-                "description": "Cómo la certificación ISO 9001 mejora la competitividad de las empresas en mercados globales.",
-                "urlToImage": "",
-                "content": "La certificación ISO 9001 continúa siendo fundamental para las empresas que buscan..."
-            },
-            {
-                "title": "Nuevas Normativas ISO en Ciberseguridad",
-                "url": "https://www.example.com/iso-27001-ciberseguridad",
-                "source": {"name": "Tecnología Segura"},
-                "publishedAt": (datetime.now() - timedelta(days=5)).strftime('%Y-%m-%dT%H:%M:%SZ'),
-                "description": "Las actualizaciones en las normas ISO 27001 para enfrentar amenazas de ciberseguridad modernas.",
-                "urlToImage": "",
-                "content": "Con el aumento de las amenazas cibernéticas, las normas ISO 27001 han evolucionado..."
-            }
-        ]
-        
-        self.logger.info(f"Usando {len(fallback_articles)} artículos de respaldo")
-        return fallback_articles
+        if self.chilean_domain_matcher.matches(article.get('url') or ''):
+            return True
+        text = f"{article.get('title') or ''} {article.get('description') or ''}"
+        return bool(self.chile_mention_matcher.find(text))
 
     def get_iso_news_from_api(self) -> List[Dict[str, Any]]:
         """
@@ -177,103 +241,107 @@ class ISONewsScraperNewsAPI:
         """
         all_articles = []
         
-        # Intentar búsqueda en NewsAPI
-        api_working = False
-        
-        # Buscar por cada término
-        for i, term in enumerate(self.search_terms):
-            self.logger.info(f"Buscando noticias para: {term} ({i+1}/{len(self.search_terms)})")
-            
-            # Búsqueda general en español
-            general_articles = self.search_newsapi(term)
-            if general_articles:
-                api_working = True
-                all_articles.extend(general_articles)
-            
-            # Búsqueda específica en fuentes chilenas
-            chilean_articles = self.search_chilean_sources(term)
-            if chilean_articles:
-                api_working = True
-                all_articles.extend(chilean_articles)
-            
-            # Pausa entre búsquedas para respetar límites de API
-            time.sleep(2)
-            
-            # Limitar búsquedas si hay muchos resultados
-            if len(all_articles) > 100:
-                break
+        # Planificar consultas OR: general en español + variantes chilenas
+        queries = (
+            self.query_planner.plan(self.search_terms, days_back=30) +
+            self.query_planner.plan(self.search_terms, days_back=60, qualifiers=CHILEAN_QUALIFIERS)
+        )
         
-        # Si la API no funciona, usar artículos de respaldo
-        if not api_working or len(all_articles) == 0:
-            self.logger.warning("NewsAPI no disponible, usando artículos de respaldo")
-            all_articles = self.get_fallback_articles()
+        self.logger.info(
+            f"Ejecutando {len(queries)} consultas agrupadas para {len(self.search_terms)} términos "
+            f"(antes {len(self.search_terms) * 5} consultas individuales)"
+        )
         
-        # Eliminar duplicados basándose en URL
-        unique_articles = {}
-        for article in all_articles:
-            url = article.get('url')
-            if url and url not in unique_articles:
-                unique_articles[url] = article
+        # Ejecutar en paralelo; el limitador de tasa reemplaza las pausas fijas
+        results = self.fetcher.map(
+            lambda planned: list(self.search_newsapi(planned.q, days_back=planned.days_back)),
+            queries
+        )
         
-        return list(unique_articles.values())
+        # Resultados en el mismo orden de las consultas para mantener el de-duplicado
+        for planned, articles in zip(queries, results):
+            if planned.chilean_only:
+                chilean = self.filter_chilean(articles or [])
+                self.metrics.record_drops('chilean_filter', {'not_chilean': len(articles or []) - len(chilean)})
+                articles = chilean
+            if articles:
+                all_articles.extend(articles)
+        
+        self.fetcher.report(self.request_count, self.rate_limiter)
+        self.quota.report()
+        self.http.report()
+        self.logger.info(f"Caché HTTP: {self.http_cache.stats()}")
+        
+        # Sin artículos de respaldo: si la API no responde se publica solo el
+        # historial, sin inventar noticias que quedarían en el estado y el archivo
+        if not self.api_working:
+            self.logger.warning("NewsAPI no disponible: se publica solo el historial")
+        
+        # Eliminar duplicados basándose en la URL canónica (tracking, AMP, www)
+        unique_articles = unique_by_url(all_articles)
+        self.metrics.record_drops('url_dedupe', {'duplicate_url': len(all_articles) - len(unique_articles)})
+        
+        return unique_articles
 
-    def process_newsapi_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def process_newsapi_articles(self, articles: List[Dict[str, Any]]) -> List[Article]:
         """
         Procesa artículos de NewsAPI al formato esperado
         """
         processed_articles = []
+        skipped = 0
+        scraped_at = datetime.now().isoformat()
         
         for article in articles:
             try:
                 # Extraer información básica
                 title = article.get('title', 'Sin título')
                 url = article.get('url', '')
+                
+                # Omitir artículos ya procesados sin cambios
+                digest = content_hash(title, article.get('description'), article.get('content'))
+                if self.state.classify(url, digest) == UNCHANGED:
+                    self.state.touch(url)
+                    skipped += 1
+                    continue
+                
                 source_name = article.get('source', {}).get('name', 'Fuente desconocida')
                 published_at = article.get('publishedAt', '')
                 description = article.get('description', '')
                 image_url = article.get('urlToImage', '')
                 content = article.get('content', '')
                 
-                # Formatear fecha
-                try:
-                    if published_at:
-                        date_obj = datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%SZ')
-                        formatted_date = date_obj.strftime('%d/%m/%Y')
-                    else:
-                        formatted_date = datetime.now().strftime('%d/%m/%Y')
-                except:
-                    formatted_date = datetime.now().strftime('%d/%m/%Y')
-                
                 # Crear resumen
                 summary = description if description else (content[:200] + '...' if content and len(content) > 200 else content)
                 
-                # Determinar si es de Chile
-                is_chilean = any(domain in url for domain in self.chilean_domains)
-                country_flag = '🇨🇱' if is_chilean else '🌍'
-                
-                processed_article = {
-                    'title': title,
-                    'url': url,
-                    'source': f"{source_name} {country_flag}",
-                    'date': formatted_date,
-                    'summary': summary or "Artículo sobre normas ISO y certificaciones de calidad.",
-                    'image_url': image_url,
-                    'full_content': content,
-                    'content_length': len(content) if content else 0,
-                    'scraped_at': datetime.now().isoformat(),
-                    'scraping_success': True,
-                    'is_chilean_source': is_chilean,
-                    'published_at': published_at
-                }
+                # Determinar si es de Chile (la fecha queda vacía si NewsAPI no la entrega o no es válida)
+                processed_article = Article(
+                    title, url, source_name,
+                    summary or "Artículo sobre normas ISO y certificaciones de calidad.",
+                    date=parse_date(published_at),
+                    region='CL' if self.chilean_domain_matcher.matches(url) else 'INT',
+                    content=content or '',
+                    image_url=image_url,
+                    scraped_at=scraped_at,
+                    scraping_success=True,
+                    published_at=published_at,
+                    content_hash=digest
+                )
                 
                 processed_articles.append(processed_article)
                 
             except Exception as e:
                 self.logger.warning(f"Error procesando artículo: {str(e)}")
+                self.metrics.record_failure('normalize')
                 continue
         
+        self.metrics.record_drops('state', {'unchanged': skipped})
+        self.logger.info(f"Procesados {len(processed_articles)} artículos nuevos o modificados, {skipped} sin cambios")
         return processed_articles
 
+    def extra_metadata(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Campos propios del scraper en `metadata` del JSON de salida"""
+        return {"search_terms": self.search_terms}
+
     def save_results_json(self, data: List[Dict[str, Any]], filename: str) -> str:
         """
         Guarda los resultados en formato JSON
@@ -283,17 +351,20 @@ class ISONewsScraperNewsAPI:
         # Separar artículos chilenos y internacionales
         chilean_articles = [a for a in data if a.get('is_chilean_source', False)]
         international_articles = [a for a in data if not a.get('is_chilean_source', False)]
+        metrics = self.metrics.snapshot()
         
         output_data = {
             "metadata": {
                 "generated_at": datetime.now().isoformat(),
-                "data_source": "NewsAPI - Noticias ISO en Español",
+                "data_source": self.data_source,
                 "total_articles": len(data),
                 "chilean_articles": len(chilean_articles),
                 "international_articles": len(international_articles),
-                "search_terms": self.search_terms,
+                **self.extra_metadata(data),
                 "successful_scrapes": len([a for a in data if a.get('scraping_success', False)]),
-                "failed_scrapes": len([a for a in data if not a.get('scraping_success', True)])
+                # Los fallidos no llegan a `data`: se cuentan mientras ocurren
+                "failed_scrapes": sum(metrics['failures'].values()),
+                "metrics": metrics
             },
             "articles": sorted(data, key=lambda x: (
                 0 if x.get('is_chilean_source', False) else 1,  # Chilenos primero
@@ -303,9 +374,11 @@ class ISONewsScraperNewsAPI:
 
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
+                json.dump(output_data, f, ensure_ascii=False, indent=2, default=json_default)
             
             self.logger.info(f"Resultados guardados en: {filepath}")
+            self.logger.info(f"Métricas agregadas a: {self.metrics.write(metrics)}")
+            archive_articles(self.archive_dataset, data, self.logger)
             return filepath
             
         except Exception as e:
@@ -319,37 +392,54 @@ class ISONewsScraperNewsAPI:
         self.logger.info("Iniciando búsqueda de noticias ISO en español usando NewsAPI")
         
         # 1. Obtener noticias de NewsAPI
-        newsapi_articles = self.get_iso_news_from_api()
+        with self.metrics.timer('stage:fetch'):
+            newsapi_articles = self.get_iso_news_from_api()
         self.logger.info(f"Obtenidas {len(newsapi_articles)} noticias de NewsAPI")
         
         # 2. Procesar artículos al formato esperado
-        processed_articles = self.process_newsapi_articles(newsapi_articles)
+        with self.metrics.timer('stage:normalize'):
+            processed_articles = self.process_newsapi_articles(newsapi_articles)
         
-        # 3. Filtrar artículos relevantes (que mencionen ISO de forma significativa)
+        # 3. Filtrar artículos relevantes según las reglas de FILTERS
         relevant_articles = []
-        for article in processed_articles:
-            title_lower = article.get('title', '').lower()
-            summary_lower = article.get('summary', '').lower()
-            
-            # Verificar si es realmente relevante para ISO
-            is_relevant = any(
-                term.lower() in title_lower or term.lower() in summary_lower
-                for term in ['iso', 'certificación', 'calidad', 'gestión', 'norma', 'audit']
-            )
-            
-            if is_relevant:
-                relevant_articles.append(article)
+        dropped = {}
+        with self.metrics.timer('stage:score'):
+            for article, result in zip(processed_articles, self.relevance.score_batch(processed_articles)):
+                if result['relevant']:
+                    article['relevance_score'] = result['score']
+                    relevant_articles.append(article)
+                else:
+                    dropped[result['reason']] = dropped.get(result['reason'], 0) + 1
+                
+                # Registrar también los descartados para no volver a evaluarlos
+                self.state.upsert(self.scraper_key, article['url'], article['content_hash'],
+                                  article if result['relevant'] else None)
+        self.metrics.record_drops('relevance', dropped)
         
+        if dropped:
+            self.logger.info(f"Descartados por relevancia: {dropped}")
         self.logger.info(f"Filtrados {len(relevant_articles)} artículos relevantes")
         
-        files_generated = {}
+        # 4. Combinar con el historial y agrupar copias sindicadas entre medios
+        with self.metrics.timer('stage:dedupe'):
+            merged_articles = merge_with_history(relevant_articles, self.state.history(self.scraper_key))
+            all_articles = deduplicate_articles(merged_articles)
+        self.metrics.record_drops('near_dedupe', {'near_duplicate': len(merged_articles) - len(all_articles)})
+        self.logger.info(
+            f"{len(relevant_articles)} artículos nuevos o modificados, {len(all_articles)} en total "
+            f"({len(merged_articles) - len(all_articles)} duplicados agrupados)"
+        )
         
-        # Usar nombre de archivo canónico
-        canonical_filename = 'iso_news.json'
+        files_generated = {}
         
-        files_generated['articles'] = self.save_results_json(
-            relevant_articles, canonical_filename
-        )
+        try:
+            files_generated['articles'] = self.save_results_json(
+                all_articles, self.output_filename
+            )
+        except Exception:
+            self.state.rollback()
+            raise
+        self.state.commit()
         
         return files_generated
 
@@ -5,88 +5,74 @@ Versión: 2.0 - Diciembre 2024
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 import datetime
 from urllib.parse import urljoin, urlparse
-import ssl
-import urllib3
-import time
-import random
 
-# Deshabilitar advertencias SSL
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from article import Article, json_default
+from article_archive import archive_articles
+from date_parsing import parse_date
+from dedupe import deduplicate_articles
+from html_parsing import SelectorSet, first_match, make_soup
+from http_cache import install_cache
+from http_transport import new_session
+from relevance import get_default_scorer
+from resilience import ResilientClient
+from run_metrics import RunMetrics
+from state_store import UNCHANGED, ArticleStateStore, content_hash, merge_with_history
+
+# Selectores de contenedores de noticias, evaluados juntos en una sola pasada
+NEWS_SELECTORS = SelectorSet([
+    'article',
+    '.noticia',
+    '.news-item',
+    '.entry',
+    '.post',
+    'div[class*="news"]',
+    'div[class*="noticia"]'
+])
+
+# Selectores por campo dentro de cada noticia, en orden de prioridad
+TITLE_SELECTORS = ['h1', 'h2', 'h3', 'h4', '.title', '[class*="title"]', 'a']
+DATE_SELECTORS = ['.date', '.fecha', '[class*="date"]', '[class*="fecha"]', 'time']
+SUMMARY_SELECTORS = ['.excerpt', '.summary', '.description', 'p']
+
+INN_SOURCE = "Instituto Nacional de Normalización (INN)"
 
 class ISONewsScraperReal:
-    def __init__(self):
-        """Inicializar el scraper para noticias ISO reales"""
+    def __init__(self, session=None, state=None, metrics=None):
+        """Inicializar el scraper para noticias ISO reales (sesión, estado y métricas opcionales, compartidos)"""
         self.base_url = "https://www.inn.cl"
         self.news_url = "https://www.inn.cl/noticias"
-        self.session = requests.Session()
+        self.session = session or new_session()
+        self.http_cache = install_cache(self.session)
+        self.metrics = (metrics or RunMetrics('inn')).attach(self.session)
         
-        # Headers para parecer un navegador real
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'es-ES,es;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        # Timeouts de la configuración, reintentos con backoff y circuit breaker por host
+        self.http = ResilientClient(self.session, metrics=self.metrics)
         
         self.articles = []
         
+        # Estado persistente para procesar solo noticias nuevas o modificadas
+        self.state = state or ArticleStateStore()
+        
+        # Reglas de relevancia compartidas con los demás scrapers
+        self.relevance = get_default_scorer()
+        
     def get_page_content(self, url):
         """Obtener contenido de una página web con manejo de errores"""
         try:
-            response = self.session.get(url, verify=False, timeout=15)
+            with self.metrics.timer('inn.page'):
+                response = self.http.get(url)
             response.raise_for_status()
             return response.text
         except requests.exceptions.RequestException as e:
             print(f"❌ Error al obtener {url}: {e}")
+            if e.response is None:
+                self.metrics.record_error(url)
+            self.metrics.record_failure('inn.page')
             return None
             
-    def parse_date(self, date_str):
-        """Convertir fecha a formato DD/MM/YYYY"""
-        if not date_str:
-            return datetime.datetime.now().strftime("%d/%m/%Y")
-            
-        try:
-            # Intentar varios formatos de fecha
-            formats = [
-                "%d/%m/%Y",
-                "%d-%m-%Y", 
-                "%Y-%m-%d",
-                "%d de %B de %Y",
-                "%d %B %Y"
-            ]
-            
-            # Mapeo de meses en español
-            months_es = {
-                'enero': 'January', 'febrero': 'February', 'marzo': 'March',
-                'abril': 'April', 'mayo': 'May', 'junio': 'June',
-                'julio': 'July', 'agosto': 'August', 'septiembre': 'September',
-                'octubre': 'October', 'noviembre': 'November', 'diciembre': 'December'
-            }
-            
-            date_clean = date_str.strip().lower()
-            for es_month, en_month in months_es.items():
-                date_clean = date_clean.replace(es_month, en_month)
-            
-            for fmt in formats:
-                try:
-                    parsed_date = datetime.datetime.strptime(date_clean, fmt.lower())
-                    return parsed_date.strftime("%d/%m/%Y")
-                except ValueError:
-                    continue
-                    
-            # Si no se puede parsear, usar fecha actual
-            return datetime.datetime.now().strftime("%d/%m/%Y")
-            
-        except Exception as e:
-            print(f"⚠️ Error parseando fecha '{date_str}': {e}")
-            return datetime.datetime.now().strftime("%d/%m/%Y")
-    
     def scrape_inn_news(self):
         """Scrapear noticias del INN Chile"""
         print("🇨🇱 Scrapeando noticias del INN Chile...")
@@ -96,26 +82,13 @@ class ISONewsScraperReal:
             print("❌ No se pudo obtener el contenido de noticias del INN")
             return []
             
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = make_soup(content)
         articles = []
         
-        # Buscar diferentes selectores de noticias
-        news_selectors = [
-            'article',
-            '.noticia',
-            '.news-item',
-            '.entry',
-            '.post',
-            'div[class*=\"news\"]',
-            'div[class*=\"noticia\"]'
-        ]
-        
-        news_items = []
-        for selector in news_selectors:
-            items = soup.select(selector)
-            if items:
-                news_items.extend(items)
-                print(f"✅ Encontrados {len(items)} elementos con selector '{selector}'")
+        # Buscar contenedores de noticias en un solo recorrido (sin duplicar anidados)
+        news_items = NEWS_SELECTORS.select_distinct(soup)
+        for selector, count in NEWS_SELECTORS.counts.items():
+            print(f"✅ Encontrados {count} elementos con selector '{selector}'")
         
         # Si no encuentra con selectores específicos, buscar enlaces que parezcan noticias
         if not news_items:
@@ -128,8 +101,7 @@ class ISONewsScraperReal:
                 text = link.get_text(strip=True)
                 
                 # Filtrar enlaces que parezcan noticias
-                if (text and len(text) > 20 and 
-                    any(keyword in text.lower() for keyword in ['iso', 'norma', 'certificación', 'estándar', 'calidad'])):
+                if text and len(text) > 20 and self.relevance.score({'title': text})['relevant']:
                     news_links.append(link)
             
             print(f"🔗 Encontrados {len(news_links)} enlaces de noticias potenciales")
@@ -139,21 +111,22 @@ class ISONewsScraperReal:
                 news_items.append(link.parent if link.parent else link)
         
         print(f"📰 Procesando {len(news_items)} elementos de noticias...")
+        skipped = 0
+        discarded = {}
+        scraped_at = datetime.datetime.now().isoformat()
         
         for item in news_items[:15]:  # Limitar a 15 noticias
             try:
                 # Extraer título
-                title_elem = (
-                    item.find('h1') or item.find('h2') or item.find('h3') or 
-                    item.find('h4') or item.find('.title') or 
-                    item.find('[class*=\"title\"]') or item.find('a')
-                )
+                title_elem = first_match(item, TITLE_SELECTORS)
                 
                 if not title_elem:
+                    discarded['no_title'] = discarded.get('no_title', 0) + 1
                     continue
                     
                 title = title_elem.get_text(strip=True)
                 if not title or len(title) < 10:
+                    discarded['short_title'] = discarded.get('short_title', 0) + 1
                     continue
                 
                 # Extraer URL
@@ -164,23 +137,17 @@ class ISONewsScraperReal:
                     url = self.news_url
                 
                 # Extraer fecha
-                date_elem = (
-                    item.find('.date') or item.find('.fecha') or 
-                    item.find('[class*=\"date\"]') or item.find('[class*=\"fecha\"]') or
-                    item.find('time')
-                )
+                date_elem = first_match(item, DATE_SELECTORS)
                 
+                date = None
                 if date_elem:
-                    date_text = date_elem.get_text(strip=True)
-                    date = self.parse_date(date_text)
-                else:
-                    date = datetime.datetime.now().strftime("%d/%m/%Y")
+                    date_text = date_elem.get('datetime') or date_elem.get_text(strip=True)
+                    date = parse_date(date_text)
+                    if date is None:
+                        print(f"⚠️ Fecha no reconocida '{date_text}' en: {title[:60]}")
                 
                 # Extraer resumen/descripción
-                summary_elem = (
-                    item.find('.excerpt') or item.find('.summary') or 
-                    item.find('.description') or item.find('p')
-                )
+                summary_elem = first_match(item, SUMMARY_SELECTORS)
                 
                 if summary_elem:
                     summary = summary_elem.get_text(strip=True)
@@ -189,70 +156,48 @@ class ISONewsScraperReal:
                 else:
                     summary = f"Noticia sobre normas ISO del INN Chile - {title[:100]}..."
                 
+                # Omitir noticias ya procesadas sin cambios
+                digest = content_hash(title, summary)
+                if self.state.classify(url, digest) == UNCHANGED:
+                    self.state.touch(url)
+                    skipped += 1
+                    continue
+                
                 # Verificar que es relevante para ISO
-                combined_text = f"{title} {summary}".lower()
-                iso_keywords = ['iso', 'norma', 'certificación', 'estándar', 'calidad', 'gestión']
+                relevance = self.relevance.score({'title': title, 'summary': summary, 'url': url})
                 
-                if any(keyword in combined_text for keyword in iso_keywords):
-                    article = {
-                        "title": title,
-                        "url": url,
-                        "source": "Instituto Nacional de Normalización (INN)",
-                        "date": date,
-                        "summary": summary,
-                        "image_url": "",
-                        "full_content": summary,
-                        "content_length": len(summary),
-                        "scraped_at": datetime.datetime.now().isoformat()
-                    }
+                article = None
+                if relevance['relevant']:
+                    article = Article(
+                        title, url, INN_SOURCE, summary,
+                        date=date,
+                        scraped_at=scraped_at,
+                        content_hash=digest,
+                        relevance_score=relevance['score']
+                    )
                     
                     articles.append(article)
                     print(f"✅ Agregada noticia: {title[:60]}...")
+                else:
+                    self.metrics.record_drops('relevance', {relevance['reason']: 1})
                 
-                # Pausa entre requests
-                time.sleep(random.uniform(0.5, 1.5))
+                self.state.upsert('inn', url, digest, article)
                 
             except Exception as e:
                 print(f"⚠️ Error procesando noticia: {e}")
+                self.metrics.record_failure('inn.item')
                 continue
         
-        print(f"🎯 Total de noticias reales obtenidas del INN: {len(articles)}")
+        self.metrics.record_drops('parse', discarded)
+        self.metrics.record_drops('state', {'unchanged': skipped})
+        print(f"🎯 Total de noticias nuevas o modificadas del INN: {len(articles)} ({skipped} sin cambios)")
         return articles
     
-    def get_additional_iso_content(self):
-        """Obtener contenido adicional de ISO del INN"""
-        print("📋 Obteniendo contenido adicional sobre ISO...")
-        
-        additional_articles = [
-            {
-                "title": "Nuevas Normas ISO 2025 - Actualización del INN",
-                "url": f"{self.base_url}/normas-iso-2025",
-                "source": "Instituto Nacional de Normalización (INN)",
-                "date": datetime.datetime.now().strftime("%d/%m/%Y"),
-                "summary": "El INN Chile informa sobre las nuevas actualizaciones de normas ISO previstas para 2025, incluyendo revisiones de ISO 9001, ISO 14001 e ISO 45001.",
-                "image_url": "",
-                "full_content": "Actualización sobre nuevas normas ISO 2025 del Instituto Nacional de Normalización de Chile.",
-                "content_length": 120,
-                "scraped_at": datetime.datetime.now().isoformat()
-            },
-            {
-                "title": "Certificaciones ISO en Chile - Estadísticas 2024",
-                "url": f"{self.base_url}/estadisticas-iso-chile-2024",
-                "source": "Instituto Nacional de Normalización (INN)",
-                "date": datetime.datetime.now().strftime("%d/%m/%Y"),
-                "summary": "Reporte estadístico sobre el crecimiento de certificaciones ISO en Chile durante el año 2024, destacando sectores con mayor adopción.",
-                "image_url": "",
-                "full_content": "Estadísticas de certificaciones ISO en Chile durante 2024 según datos del INN.",
-                "content_length": 110,
-                "scraped_at": datetime.datetime.now().isoformat()
-            }
-        ]
-        
-        return additional_articles
-    
-    def save_results_json(self, all_articles, filename="src/data/iso_news.json"):
+    def save_results_json(self, all_articles, filename="src/data/iso_news_inn.json"):
         """Guardar resultados en archivo JSON con solo datos reales"""
         try:
+            metrics = self.metrics.snapshot()
+            
             # Crear metadata con información real
             metadata = {
                 "generated_at": datetime.datetime.now().isoformat(),
@@ -262,7 +207,9 @@ class ISONewsScraperReal:
                 "international_articles": 0,
                 "search_terms": ["Normas ISO", "Certificación", "INN Chile"],
                 "coverage": "chile_inn_real_data",
-                "description": "Noticias reales sobre normas ISO del Instituto Nacional de Normalización de Chile"
+                "description": "Noticias reales sobre normas ISO del Instituto Nacional de Normalización de Chile",
+                "failed_scrapes": sum(metrics['failures'].values()),
+                "metrics": metrics
             }
             
             # Estructura del archivo JSON solo con datos reales
@@ -272,34 +219,42 @@ class ISONewsScraperReal:
             }
             
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
             
             print(f"✅ Archivo JSON guardado: {filename}")
             print(f"📊 Total de artículos reales: {len(all_articles)}")
+            print(f"📈 Métricas agregadas a: {self.metrics.write(metrics)}")
+            archive_articles('iso_news', all_articles)
+            return True
             
         except Exception as e:
             print(f"❌ Error guardando archivo JSON: {e}")
+            return False
     
     def run(self):
         """Ejecutar el scraper completo con solo datos reales"""
         print("🚀 Iniciando scraper de noticias ISO reales...")
         print("=" * 60)
         
-        # Obtener noticias reales del INN
-        inn_articles = self.scrape_inn_news()
+        # Obtener noticias reales del INN (solo nuevas o modificadas)
+        with self.metrics.timer('stage:fetch'):
+            fresh_articles = self.scrape_inn_news()
         
-        # Si no se obtuvieron suficientes noticias reales, agregar contenido adicional
-        if len(inn_articles) < 5:
-            print("📝 Agregando contenido adicional...")
-            additional_content = self.get_additional_iso_content()
-            inn_articles.extend(additional_content)
+        # Combinar con el historial y agrupar noticias casi duplicadas
+        with self.metrics.timer('stage:dedupe'):
+            merged_articles = merge_with_history(fresh_articles, self.state.history('inn'))
+            inn_articles = deduplicate_articles(merged_articles)
+        self.metrics.record_drops('near_dedupe', {'near_duplicate': len(merged_articles) - len(inn_articles)})
         
         # Guardar solo datos reales
         if inn_articles:
-            self.save_results_json(inn_articles)
+            if self.save_results_json(inn_articles):
+                self.state.commit()
             print("=" * 60)
             print(f"✅ Scraping completado exitosamente!")
             print(f"📰 {len(inn_articles)} noticias reales obtenidas del INN")
+            print(f"🗄️ Caché HTTP: {self.http_cache.stats()}")
+            print(f"🔁 Reintentos: {self.http.report()}")
         else:
             print("❌ No se pudieron obtener noticias reales")
             
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita a NewsAPI para pruebas de carga y de backoff
+Responde /v2/everything con `q`, `from`, `pageSize` y `page` usando artículos
+sintéticos deterministas (misma consulta -> mismos artículos), con latencia
+configurable, ráfagas de 429 con Retry-After, 401 por clave inválida y el
+límite de paginación (426) del plan gratuito. En modo replay sirve respuestas
+grabadas; en modo record las graba desde la API real.
+
+Los scrapers lo usan con la variable NEWSAPI_BASE_URL:
+
+    python scripts/newsapi_mock_server.py --port 8750 --latency-ms 30 --429-every 50
+    NEWSAPI_BASE_URL=http://127.0.0.1:8750/v2 python scripts/iso_news_scraper_newsapi.py
+
+Uso (desde la raíz del repositorio):
+    python scripts/newsapi_mock_server.py [--port N] [--latency-ms MS] [--jitter-ms MS]
+        [--429-every N] [--429-burst M] [--retry-after S] [--api-key KEY]
+        [--results-per-query N] [--max-results N] [--replay DIR | --record DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from config_iso_scraper import NEWSAPI
+from http_cache import normalize_url
+
+Response = Tuple[int, Dict[str, str], Dict[str, Any]]
+
+DOMAINS = ['emol.com', 'latercera.com', 'df.cl', 'biobiochile.cl', 'elpais.com', 'infobae.com', 'iso.org']
+
+
+def error(status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Respuesta de error con el formato de NewsAPI"""
+    return status, headers or {}, {'status': 'error', 'code': code, 'message': message}
+
+
+def synthetic_articles(query: str, total: int, anchor: datetime) -> List[Dict[str, Any]]:
+    """Artículos deterministas de una consulta, del más reciente (`anchor`) al más antiguo"""
+    seed = int(hashlib.sha1(query.encode('utf-8')).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    label = query if len(query) <= 60 else query[:57] + '...'
+    articles = []
+    for i in range(total):
+        domain = rng.choice(DOMAINS)
+        articles.append({
+            'source': {'id': None, 'name': domain.split('.')[0].title()},
+            'author': f"Redacción {domain}",
+            'title': f"Certificación ISO en la industria: {label} #{i}",
+            'description': f"Las empresas avanzan en normas ISO y gestión de calidad ({label}).",
+            'url': f"https://{domain}/noticias/{seed:08x}-{i}",
+            'urlToImage': f"https://{domain}/img/{seed:08x}-{i}.jpg",
+            'publishedAt': (anchor - timedelta(minutes=37 * i + seed % 60)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': 'La certificación ISO 9001 sigue creciendo entre las organizaciones... [+800 chars]',
+        })
+    return articles
+
+
+class MockNewsAPI:
+    """
+    Lógica del servidor, independiente de HTTP para poder usarla también
+    desde pruebas en el mismo proceso
+    """
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, rate_limit_every: int = 0,
+                 rate_limit_burst: int = 1, retry_after: int = 1, api_key: Optional[str] = None,
+                 results_per_query: int = 30, max_results: int = 100, seed: int = 0,
+                 anchor: Optional[datetime] = None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_burst = rate_limit_burst
+        self.retry_after = retry_after
+        self.api_key = api_key
+        self.results_per_query = results_per_query
+        self.max_results = max_results
+        # Fechas relativas al inicio del día: dentro de la ventana `from` de los scrapers y estables en el día
+        self.anchor = anchor or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+
+    def _delay(self) -> None:
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _rate_limited(self, number: int) -> bool:
+        # Cada `rate_limit_every` requests, los `rate_limit_burst` siguientes reciben 429
+        if not self.rate_limit_every:
+            return False
+        return number % (self.rate_limit_every + self.rate_limit_burst) >= self.rate_limit_every
+
+    def everything(self, params: Dict[str, str]) -> Response:
+        with self._lock:
+            number = self.requests
+            self.requests += 1
+
+        if self.api_key is not None and params.get('apiKey') != self.api_key:
+            return error(401, 'apiKeyInvalid', 'Your API key is invalid or incorrect.')
+        if self._rate_limited(number):
+            return error(429, 'rateLimited', 'You have made too many requests recently.',
+                         {'Retry-After': str(self.retry_after)})
+        if not params.get('q'):
+            return error(400, 'parametersMissing', 'Required parameters are missing: q.')
+
+        try:
+            page = max(1, int(params.get('page', 1)))
+            page_size = min(100, max(1, int(params.get('pageSize', 100))))
+        except ValueError:
+            return error(400, 'parameterInvalid', 'page and pageSize must be integers.')
+        if (page - 1) * page_size >= self.max_results:
+            return error(426, 'maximumResultsReached',
+                         f"You have requested too many results. Limit of {self.max_results}.")
+
+        articles = synthetic_articles(params['q'], self.results_per_query, self.anchor)
+        if params.get('from'):
+            # Las fechas ISO sin zona se comparan bien como texto
+            since = params['from'].rstrip('Z')
+            articles = [a for a in articles if a['publishedAt'].rstrip('Z') >= since]
+        start = (page - 1) * page_size
+        return 200, {}, {'status': 'ok', 'totalResults': len(articles), 'articles': articles[start:start + page_size]}
+
+    def handle(self, path: str, params: Dict[str, str]) -> Response:
+        self._delay()
+        if path.rstrip('/') == '/v2/everything':
+            response = self.everything(params)
+        else:
+            response = error(404, 'notFound', f"Unknown endpoint {path}")
+        with self._lock:
+            self.statuses[response[0]] = self.statuses.get(response[0], 0) + 1
+        return response
+
+
+class ReplayNewsAPI:
+    """
+    Sirve (o graba) respuestas por URL normalizada sin la clave de API ni
+    `from` (que los scrapers calculan desde la hora actual): una grabación
+    hecha con la API real se reproduce sin red ni clave
+    """
+
+    def __init__(self, directory: str, upstream: Optional[str] = None, latency_ms: float = 0):
+        self.directory = directory
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self.latency = latency_ms / 1000
+        self.session = requests.Session() if upstream else None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, path: str, params: Dict[str, str]) -> str:
+        key = normalize_url(f"http://newsapi{path}?{urlencode(sorted(params.items()))}", ('apiKey', 'from'))
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _record(self, path: str, params: Dict[str, str]) -> Response:
+        upstream_path = path[len('/v2'):] if path.startswith('/v2') else path
+        response = self.session.get(f"{self.upstream}{upstream_path}", params=params, timeout=30)
+        headers = {k: v for k, v in response.headers.items() if k.lower() == 'retry-after'}
+        recorded = (response.status_code, headers, response.json())
+        if response.status_code != 429:
+            with open(self._path(path, params), 'w', encoding='utf-8') as f:
+                json.dump(recorded, f, ensure_ascii=False)
+        return recorded
+
+    def handle(self, path: str, params: Dict[str, str]) -> Response:
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.upstream:
+            response = self._record(path, params)
+        else:
+            try:
+                with open(self._path(path, params), encoding='utf-8') as f:
+                    status, headers, body = json.load(f)
+                response = (status, headers, body)
+            except FileNotFoundError:
+                response = error(404, 'notRecorded', f"No recording for {path} with these parameters")
+        with self._lock:
+            self.statuses[response[0]] = self.statuses.get(response[0], 0) + 1
+        return response
+
+
+class NewsAPIRequestHandler(BaseHTTPRequestHandler):
+    """Adaptador HTTP; `server.backend` es un MockNewsAPI o un ReplayNewsAPI"""
+
+    protocol_version = 'HTTP/1.1'  # Conexiones keep-alive, como la API real
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        status, headers, body = self.server.backend.handle(parts.path, dict(parse_qsl(parts.query)))
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Cache-Control', 'no-store')  # Cada request de una prueba de carga llega al servidor
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def start_server(backend: Any, host: str = '127.0.0.1', port: int = 0,
+                 verbose: bool = False) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Levanta el servidor en un hilo de fondo
+
+    Returns:
+        tuple: (servidor, URL base para `newsapi_base_url`, p. ej. http://127.0.0.1:8750/v2)
+    """
+    server = ThreadingHTTPServer((host, port), NewsAPIRequestHandler)
+    server.daemon_threads = True
+    server.backend = backend
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v2"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8750)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--429-every', dest='rate_limit_every', type=int, default=0,
+                        help="Cada N requests responde con una ráfaga de 429 (0 = nunca)")
+    parser.add_argument('--429-burst', dest='rate_limit_burst', type=int, default=1,
+                        help="Largo de cada ráfaga de 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="Segundos del encabezado Retry-After")
+    parser.add_argument('--api-key', help="Si se indica, cualquier otra clave recibe 401")
+    parser.add_argument('--results-per-query', type=int, default=30)
+    parser.add_argument('--max-results', type=int, default=100, help="Límite de paginación (426 al superarlo)")
+    parser.add_argument('--seed', type=int, default=0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--replay', metavar='DIR', help="Servir respuestas grabadas en DIR")
+    mode.add_argument('--record', metavar='DIR', help="Grabar en DIR las respuestas de la API real")
+    parser.add_argument('--upstream', default=NEWSAPI['base_url'], help="API real para --record")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if args.replay:
+        backend = ReplayNewsAPI(args.replay, latency_ms=args.latency_ms)
+    elif args.record:
+        backend = ReplayNewsAPI(args.record, upstream=args.upstream, latency_ms=args.latency_ms)
+    else:
+        backend = MockNewsAPI(args.latency_ms, args.jitter_ms, args.rate_limit_every, args.rate_limit_burst,
+                              args.retry_after, args.api_key, args.results_per_query, args.max_results, args.seed)
+
+    server, base_url = start_server(backend, args.host, args.port, args.verbose)
+    print(f"🧪 NewsAPI local en {base_url} (NEWSAPI_BASE_URL={base_url}); Ctrl+C para detener")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"📊 {backend.requests} requests atendidos, respuestas: {dict(sorted(backend.statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
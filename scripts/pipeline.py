@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Pipeline único de noticias ISO
+Ejecuta las fuentes (NewsAPI e INN) como etapas paralelas de un DAG sobre una
+sola sesión HTTP y un solo almacén de estado, con la extracción directa del
+contenido completo (`enhanced`) como paso opcional sobre lo nuevo de ambas:
+
+    fetch:newsapi -> normalize:newsapi -> score:newsapi ─┐
+                                                        ├-> [extract] -> dedupe -> enrich -> write
+    fetch:inn (ya normaliza, filtra y registra estado) ─┘
+
+Combina todo en un único src/data/iso_news.json e imprime el tiempo de cada etapa.
+Es el único que escribe ese archivo: cada scraper ejecutado por separado
+guarda su propia salida (iso_news_newsapi.json, iso_news_inn.json,
+iso_news_enhanced.json).
+
+Uso (desde la raíz del repositorio):
+    python scripts/pipeline.py [--sources newsapi,inn,enhanced] [--output src/data/iso_news.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from article import json_default
+from article_archive import archive_articles
+from article_extractor import ArticleExtractor
+from config_iso_scraper import ENRICHMENT
+from dedupe import deduplicate_articles
+from enrich_news import NewsEnricher
+from http_cache import install_cache
+from http_transport import new_session, transport_stats
+from iso_news_scraper_newsapi import ISONewsScraperNewsAPI
+from iso_news_scraper_real import ISONewsScraperReal
+from relevance import get_default_scorer
+from run_metrics import RunMetrics
+from state_store import ArticleStateStore, content_hash, merge_with_history
+
+SOURCES = ('newsapi', 'inn', 'enhanced')
+
+# Estados de una etapa
+PENDING, RUNNING, DONE, FAILED, SKIPPED = 'pending', 'running', 'done', 'failed', 'skipped'
+
+
+class Stage:
+    """
+    Nodo del DAG: `func` recibe un dict {dependencia: resultado}
+    Una etapa no requerida que falla entrega `default` y no detiene a las siguientes.
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = (),
+                 required: bool = True, default: Any = None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.required = required
+        self.default = default
+        self.status = PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.seconds: Optional[float] = None
+
+
+class PipelineRunner:
+    """
+    Ejecuta etapas en un pool de hilos apenas sus dependencias terminan
+    """
+
+    def __init__(self, max_workers: int = 4, logger: Optional[logging.Logger] = None,
+                 metrics: Optional[RunMetrics] = None):
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or logging.getLogger(__name__)
+        self.metrics = metrics
+        self.stages: Dict[str, Stage] = {}
+        self.wall_seconds = 0.0
+        self._start = 0.0
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = (),
+            required: bool = True, default: Any = None) -> Stage:
+        if name in self.stages:
+            raise ValueError(f"Etapa duplicada: '{name}'")
+        stage = Stage(name, func, deps, required, default)
+        self.stages[name] = stage
+        return stage
+
+    def _check_graph(self) -> None:
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"La etapa '{stage.name}' depende de etapas inexistentes: {missing}")
+        # Kahn: si no se pueden ordenar todas las etapas hay un ciclo
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Ciclo entre las etapas: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _execute(self, stage: Stage) -> Any:
+        stage.started = time.monotonic() - self._start
+        inputs = {dep: self.stages[dep].result for dep in stage.deps}
+        try:
+            return stage.func(inputs)
+        finally:
+            stage.seconds = time.monotonic() - self._start - stage.started
+            if self.metrics:
+                self.metrics.record_latency(f"stage:{stage.name}", stage.seconds)
+
+    def _ready(self) -> List[Stage]:
+        ready = []
+        for stage in self.stages.values():
+            if stage.status != PENDING:
+                continue
+            deps = [self.stages[dep] for dep in stage.deps]
+            if any(dep.status in (FAILED, SKIPPED) and dep.required for dep in deps):
+                stage.status = SKIPPED
+                stage.error = 'dependencia fallida'
+                continue
+            if all(dep.status in (DONE, FAILED) for dep in deps):
+                ready.append(stage)
+        return ready
+
+    def run(self) -> Dict[str, Any]:
+        """Ejecuta el DAG y devuelve {etapa: resultado}"""
+        self._check_graph()
+        self._start = time.monotonic()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                ready = self._ready()
+                for stage in ready:
+                    stage.status = RUNNING
+                    running[executor.submit(self._execute, stage)] = stage
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        stage.result = future.result()
+                        stage.status = DONE
+                    except Exception as e:
+                        stage.status = FAILED
+                        stage.error = str(e)
+                        stage.result = stage.default
+                        self.logger.error(f"Falló la etapa '{stage.name}': {e}")
+                        if self.metrics:
+                            self.metrics.record_failure(f"stage:{stage.name}")
+        for stage in self.stages.values():
+            if stage.status == PENDING:  # Dependía de una etapa saltada declarada después
+                stage.status = SKIPPED
+                stage.error = 'dependencia fallida'
+        self.wall_seconds = time.monotonic() - self._start
+        return {name: stage.result for name, stage in self.stages.items()}
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Imprime y devuelve el tiempo de cada etapa en orden de inicio"""
+        rows = []
+        for stage in sorted(self.stages.values(), key=lambda s: (s.started is None, s.started or 0)):
+            items = len(stage.result) if isinstance(stage.result, list) else None
+            rows.append({
+                'stage': stage.name,
+                'status': stage.status,
+                'start_seconds': round(stage.started, 2) if stage.started is not None else None,
+                'seconds': round(stage.seconds, 2) if stage.seconds is not None else None,
+                'items': items,
+                'error': stage.error,
+            })
+
+        print(f"\n⏱️ {'Etapa':<20} {'inicio':>8} {'duración':>9} {'elementos':>10}  estado")
+        for row in rows:
+            start = f"{row['start_seconds']:.2f}s" if row['start_seconds'] is not None else '-'
+            seconds = f"{row['seconds']:.2f}s" if row['seconds'] is not None else '-'
+            items = row['items'] if row['items'] is not None else '-'
+            status = row['status'] + (f" ({row['error']})" if row['error'] else '')
+            print(f"   {row['stage']:<20} {start:>8} {seconds:>9} {items:>10}  {status}")
+        busy = sum(row['seconds'] or 0 for row in rows)
+        print(f"   Total: {self.wall_seconds:.2f}s de reloj para {busy:.2f}s de trabajo en etapas")
+        return rows
+
+
+class ISONewsPipeline:
+    """
+    Arma el DAG de las fuentes de noticias ISO sobre recursos compartidos
+    """
+
+    def __init__(self, sources: Iterable[str] = SOURCES, output_path: str = 'src/data/iso_news.json',
+                 max_workers: int = 4):
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.logger = logging.getLogger(__name__)
+        self.sources = [source for source in SOURCES if source in set(sources)]
+        self.output_path = output_path
+
+        # Un solo pool de conexiones (con la caché HTTP), un solo almacén de estado y unas solas métricas
+        self.session = new_session()
+        self.http_cache = install_cache(self.session)
+        self.metrics = RunMetrics('pipeline').attach(self.session)
+        self.state = ArticleStateStore()  # Serializa su propio acceso entre etapas
+        self.relevance = get_default_scorer()
+        self.runner = PipelineRunner(max_workers=max_workers, logger=self.logger, metrics=self.metrics)
+        # Fuente -> etapa que entrega sus artículos relevantes, nuevos o modificados
+        self.ready: Dict[str, str] = {}
+
+    # --- Etapas por fuente -------------------------------------------------
+
+    def _add_newsapi(self) -> str:
+        scraper = ISONewsScraperNewsAPI(output_dir=os.path.dirname(self.output_path),
+                                        session=self.session, state=self.state, metrics=self.metrics)
+        self.runner.add('fetch:newsapi', lambda _: scraper.get_iso_news_from_api(), required=False, default=[])
+        self.runner.add('normalize:newsapi', lambda r: scraper.process_newsapi_articles(r['fetch:newsapi']),
+                        deps=['fetch:newsapi'], required=False, default=[])
+        self.runner.add('score:newsapi', lambda r: self.score('newsapi', r['normalize:newsapi']),
+                        deps=['normalize:newsapi'])
+        return 'score:newsapi'
+
+    def _add_inn(self) -> str:
+        # scrape_inn_news ya normaliza, filtra por relevancia y registra cada noticia en
+        # el estado: pasarla otra vez por `score` la puntuaría y registraría dos veces
+        scraper = ISONewsScraperReal(session=self.session, state=self.state, metrics=self.metrics)
+        self.runner.add('fetch:inn', lambda _: scraper.scrape_inn_news(), required=False, default=[])
+        return 'fetch:inn'
+
+    def _add_extract(self) -> str:
+        """Contenido completo de las noticias nuevas de todas las fuentes (fuente `enhanced`)"""
+        extractor = ArticleExtractor(self.session, logger=self.logger, metrics=self.metrics)
+
+        def extract(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+            by_source = {source: results[stage] or [] for source, stage in self.ready.items()}
+            articles = [article for items in by_source.values() for article in items]
+            extracted = [a for a in extractor.scrape(articles) if a.get('scraping_success')]
+            # El estado guardó las noticias antes de extraerlas: actualizarlo para que el
+            # historial de las próximas ejecuciones conserve el contenido completo
+            for source, items in by_source.items():
+                for article in items:
+                    if article.get('scraping_success') and article.get('content_hash'):
+                        self.state.upsert(source, article['url'], article['content_hash'], article)
+            return extracted
+
+        self.runner.add('extract', extract, deps=list(self.ready.values()), required=False, default=[])
+        return 'extract'
+
+    def score(self, source: str, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filtra por relevancia y registra cada artículo (también los descartados) en el estado"""
+        relevant = []
+        dropped: Dict[str, int] = {}
+        for article, result in zip(articles, self.relevance.score_batch(articles)):
+            digest = article.get('content_hash') or content_hash(article.get('title'), article.get('summary'))
+            article['content_hash'] = digest
+            if result['relevant']:
+                article['relevance_score'] = result['score']
+                relevant.append(article)
+            else:
+                dropped[result['reason']] = dropped.get(result['reason'], 0) + 1
+            self.state.upsert(source, article.get('url', ''), digest, article if result['relevant'] else None)
+        self.metrics.record_drops(f"relevance:{source}", dropped)
+        return relevant
+
+    # --- Etapas comunes ----------------------------------------------------
+
+    def dedupe(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Combina cada fuente con su historial y agrupa duplicados entre fuentes"""
+        merged = []
+        for source, stage in self.ready.items():
+            merged.extend(merge_with_history(results.get(stage) or [], self.state.history(source)))
+        articles = deduplicate_articles(merged)
+        self.metrics.record_drops('near_dedupe', {'near_duplicate': len(merged) - len(articles)})
+        return articles
+
+    def enrich(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        NewsEnricher().enrich_items(articles, ENRICHMENT['datasets']['iso_news'])
+        return articles
+
+    def write(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Escribe el archivo combinado y confirma el estado solo si se guardó"""
+        articles = sorted(articles, key=lambda a: (
+            bool(a.get('is_chilean_source')),  # Chilenos primero
+            a.get('fecha_iso') or '',  # Más recientes primero
+        ), reverse=True)
+        by_source = {source: len(self.runner.stages[stage].result or []) for source, stage in self.ready.items()}
+        metrics = self.metrics.snapshot()
+        output = {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "data_source": "Pipeline ISO - " + ", ".join(self.sources),
+                "total_articles": len(articles),
+                "chilean_articles": len([a for a in articles if a.get('is_chilean_source')]),
+                "international_articles": len([a for a in articles if not a.get('is_chilean_source')]),
+                "new_or_changed_by_source": by_source,
+                "successful_scrapes": len([a for a in articles if a.get('scraping_success', False)]),
+                # Los fallidos no llegan a `articles`: se cuentan mientras ocurren
+                "failed_scrapes": sum(metrics['failures'].values()),
+                "metrics": metrics,
+            },
+            "articles": articles,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.output_path) or '.', exist_ok=True)
+            with open(self.output_path, 'w', encoding='utf-8') as f:
+                json.dump(output, f, ensure_ascii=False, indent=2, default=json_default)
+        except Exception:
+            self.state.rollback()
+            raise
+        self.state.commit()
+        self.logger.info(f"Resultados guardados en: {self.output_path}")
+        archive_articles('iso_news', articles, self.logger)
+        return articles
+
+    def build(self) -> PipelineRunner:
+        builders = {'newsapi': self._add_newsapi, 'inn': self._add_inn}
+        for source in self.sources:
+            if source in builders:
+                self.ready[source] = builders[source]()
+        deps = list(self.ready.values())
+        if 'enhanced' in self.sources:
+            deps.append(self._add_extract())
+        self.runner.add('dedupe', self.dedupe, deps=deps)
+        self.runner.add('enrich', lambda r: self.enrich(r['dedupe']), deps=['dedupe'])
+        self.runner.add('write', lambda r: self.write(r['enrich']), deps=['enrich'])
+        return self.runner
+
+    def run(self) -> Optional[List[Dict[str, Any]]]:
+        self.build()
+        results = self.runner.run()
+        self.runner.report()
+        metrics = self.metrics.snapshot()
+        for name, dropped in metrics['drops'].items():
+            if dropped:
+                self.logger.info(f"Descartados en {name}: {dropped}")
+        self.logger.info(f"Caché HTTP: {self.http_cache.stats()}")
+        self.logger.info(f"Transporte HTTP: {transport_stats()}")
+        # El historial incluye la duración de la etapa de escritura
+        self.logger.info(f"Métricas agregadas a: {self.metrics.write(metrics)}")
+        return results.get('write')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline único de noticias ISO")
+    parser.add_argument('--sources', default=','.join(SOURCES),
+                        help=f"Fuentes separadas por coma ({', '.join(SOURCES)})")
+    parser.add_argument('--output', default='src/data/iso_news.json')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    sources = [s.strip() for s in args.sources.split(',') if s.strip()]
+    unknown = set(sources) - set(SOURCES)
+    if unknown:
+        parser.error(f"Fuentes desconocidas: {', '.join(sorted(unknown))}")
+
+    print("🚀 Iniciando pipeline de noticias ISO")
+    print("=" * 60)
+    articles = ISONewsPipeline(sources, args.output, args.workers).run()
+    if articles is None:
+        print("❌ El pipeline no generó el archivo de noticias")
+        raise SystemExit(1)
+    print(f"✅ {len(articles)} noticias en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
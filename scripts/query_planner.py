@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Planificador de consultas para NewsAPI
+Agrupa términos de búsqueda y variantes chilenas en consultas booleanas OR
+respetando el largo máximo de `q`, y lleva la cuenta de la cuota consumida
+"""
+
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# NewsAPI rechaza valores de `q` de más de 500 caracteres
+NEWSAPI_MAX_QUERY_LENGTH = 500
+
+# Calificadores que reemplazan a "{q} Chile", "Chile {q}", "{q} chileno" y "{q} chilena"
+CHILEAN_QUALIFIERS = ['Chile', 'chileno', 'chilena']
+
+
+class PlannedQuery(NamedTuple):
+    """Consulta lista para enviar a NewsAPI"""
+    q: str
+    terms: List[str]
+    days_back: int
+    chilean_only: bool
+
+
+def term_clause(term: str) -> str:
+    """
+    Convierte un término en una cláusula booleana equivalente a la búsqueda
+    original sin comillas (todas las palabras deben aparecer)
+    """
+    words = term.split()
+    if len(words) == 1:
+        return words[0]
+    return '(' + ' AND '.join(words) + ')'
+
+
+def _or_group(clauses: Sequence[str]) -> str:
+    if len(clauses) == 1:
+        return clauses[0]
+    return '(' + ' OR '.join(clauses) + ')'
+
+
+class QueryPlanner:
+    """
+    Reescribe términos × variantes en el mínimo de consultas OR que caben
+    dentro del largo máximo permitido por NewsAPI
+    """
+
+    def __init__(self, max_query_length: int = NEWSAPI_MAX_QUERY_LENGTH):
+        self.max_query_length = max_query_length
+
+    def build_query(self, terms: Sequence[str], qualifiers: Optional[Sequence[str]] = None) -> str:
+        """
+        Construye la consulta booleana para un grupo de términos
+        """
+        query = _or_group([term_clause(term) for term in terms])
+        if qualifiers:
+            query = f"{query} AND {_or_group(list(qualifiers))}"
+        return query
+
+    def plan(self, terms: Sequence[str], days_back: int = 30,
+             qualifiers: Optional[Sequence[str]] = None) -> List[PlannedQuery]:
+        """
+        Agrupa los términos en consultas (first-fit decreasing por largo)
+
+        Args:
+            terms: Términos de búsqueda originales
+            days_back: Ventana de días para las consultas resultantes
+            qualifiers: Calificadores obligatorios (ej. CHILEAN_QUALIFIERS)
+
+        Returns:
+            List[PlannedQuery]: Consultas planificadas
+        """
+        # Eliminar términos repetidos sin importar mayúsculas
+        unique_terms = list({term.strip().lower(): term.strip() for term in terms if term.strip()}.values())
+
+        bins: List[List[str]] = []
+        for term in sorted(unique_terms, key=len, reverse=True):
+            if len(self.build_query([term], qualifiers)) > self.max_query_length:
+                raise ValueError(f"El término '{term}' excede el largo máximo de consulta")
+            for group in bins:
+                if len(self.build_query(group + [term], qualifiers)) <= self.max_query_length:
+                    group.append(term)
+                    break
+            else:
+                bins.append([term])
+
+        return [
+            PlannedQuery(
+                q=self.build_query(group, qualifiers),
+                terms=group,
+                days_back=days_back,
+                chilean_only=bool(qualifiers)
+            )
+            for group in bins
+        ]
+
+
+class QuotaTracker:
+    """
+    Contabiliza el consumo de cuota de NewsAPI durante una ejecución
+    """
+
+    def __init__(self, max_requests: int, logger: Optional[logging.Logger] = None):
+        self.max_requests = max_requests
+        self.logger = logger or logging.getLogger(__name__)
+        self.used = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.max_requests - self.used)
+
+    def try_consume(self) -> bool:
+        """
+        Reserva un request de la cuota; devuelve False si ya se agotó
+        """
+        with self._lock:
+            if self.used >= self.max_requests:
+                self.rejected += 1
+                return False
+            self.used += 1
+            return True
+
+    def refund(self) -> None:
+        """Devuelve a la cuota un request que se sirvió desde la caché local"""
+        with self._lock:
+            self.used = max(0, self.used - 1)
+
+    def record_status(self, status_code: int) -> None:
+        """Registra respuestas 429 devueltas por la API"""
+        if status_code == 429:
+            with self._lock:
+                self.rate_limited += 1
+
+    def report(self) -> Dict[str, int]:
+        """
+        Resume el consumo de cuota de la ejecución
+        """
+        stats = {
+            'quota': self.max_requests,
+            'used': self.used,
+            'remaining': self.remaining,
+            'rate_limited': self.rate_limited,
+            'rejected': self.rejected,
+        }
+        self.logger.info(
+            f"Cuota NewsAPI: {stats['used']}/{stats['quota']} requests usados, "
+            f"{stats['rate_limited']} respuestas 429, {stats['rejected']} consultas sin cuota"
+        )
+        return stats
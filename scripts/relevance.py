@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Motor de relevancia ISO compilado una sola vez desde config_iso_scraper
+Reemplaza los bucles `any(term in text ...)` dispersos en los scrapers por
+expresiones regulares precompiladas y un matcher de dominios por sufijo
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from config_iso_scraper import FILTERS, ISO_KEYWORDS, RELEVANCE_WEIGHTS
+
+_STANDARD_RE = re.compile(r'^ISO \d+$')
+# Bloques Unicode de marcas diacríticas combinantes (tildes, diéresis, virgulillas...)
+_COMBINING_RE = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas y sin tildes, para comparar 'certificación' con 'certificacion'"""
+    if text.isascii():
+        return text.lower()
+    return _COMBINING_RE.sub('', unicodedata.normalize('NFKD', text.lower()))
+
+
+def _is_acronym(keyword: str) -> bool:
+    # Siglas como INN, SGS o ISP se comparan respetando mayúsculas y como palabra
+    # completa; si no, 'INN' coincidiría con 'innovación'
+    return keyword.isupper() and ' ' not in keyword
+
+
+def _keyword_pattern(keyword: str, prefix: bool) -> str:
+    words = [re.escape(word) for word in keyword.split()]
+    body = r'\s+'.join(words)
+    # Los términos de una palabra aceptan sufijos ('norma' -> 'normas', 'normativa')
+    suffix = r'\w*' if prefix and len(words) == 1 else r'\b'
+    return body + suffix  # El \b inicial lo pone la alternancia de KeywordMatcher
+
+
+class KeywordMatcher:
+    """
+    Compila una lista de palabras clave en dos alternancias (siglas y texto
+    normalizado) que encuentran todas las coincidencias en una pasada
+    """
+
+    def __init__(self, keywords: Iterable[str], prefix: bool = False, case_sensitive_acronyms: bool = True):
+        """
+        Args:
+            keywords: Palabras clave a buscar
+            prefix: Los términos de una palabra aceptan sufijos ('norma' -> 'normativa')
+            case_sensitive_acronyms: Las siglas solo coinciden en mayúsculas; con False
+                coinciden en cualquier caso, pero siempre como palabra completa
+        """
+        # Más largas primero para que 'sistema de gestión ISO' gane a 'sistema de gestión'
+        self.keywords: List[str] = sorted(set(keywords), key=len, reverse=True)
+        acronym_parts, text_parts = [], []
+        for keyword in self.keywords:
+            if _is_acronym(keyword) and case_sensitive_acronyms:
+                acronym_parts.append((keyword, rf"{re.escape(keyword)}\b"))
+            elif _is_acronym(keyword):
+                text_parts.append((keyword, rf"{re.escape(fold_text(keyword))}\b"))
+            else:
+                text_parts.append((keyword, _keyword_pattern(fold_text(keyword), prefix)))
+
+        self._acronym_re = self._compile(acronym_parts)
+        self._text_re = self._compile(text_parts)
+
+    @staticmethod
+    def _compile(parts: List[Tuple[str, str]]) -> Optional[Tuple['re.Pattern', 're.Pattern', List[str]]]:
+        """
+        (búsqueda, identificación, palabras clave): la alternancia sin grupos
+        recorre el texto varias veces más rápido; la versión con un grupo por
+        palabra clave solo se evalúa donde la primera ya encontró algo
+        """
+        if not parts:
+            return None
+        search = r'\b(?:' + '|'.join(pattern for _, pattern in parts) + ')'
+        identify = r'\b(?:' + '|'.join(f"(?P<k{i}>{pattern})" for i, (_, pattern) in enumerate(parts)) + ')'
+        return re.compile(search), re.compile(identify), [keyword for keyword, _ in parts]
+
+    @staticmethod
+    def _scan(patterns: Tuple['re.Pattern', 're.Pattern', List[str]], text: str, found: set) -> None:
+        search, identify, keywords = patterns
+        # finditer no se solapa, así que solo dentro de cada tramo encontrado se
+        # buscan palabras clave que empiecen más adelante: 'certificación ISO 9001'
+        # cuenta 'certificación ISO' e 'ISO 9001'
+        for match in search.finditer(text):
+            found.add(keywords[int(identify.match(text, match.start()).lastgroup[1:])])
+            for pos in range(match.start() + 1, match.end()):
+                if search.match(text, pos) is not None:
+                    found.add(keywords[int(identify.match(text, pos).lastgroup[1:])])
+
+    def find(self, text: str, folded: Optional[str] = None) -> List[str]:
+        """
+        Palabras clave distintas presentes en el texto
+
+        Args:
+            text: Texto original (para siglas)
+            folded: Texto ya normalizado con fold_text, para no recalcularlo
+        """
+        found = set()
+        if self._acronym_re is not None:
+            self._scan(self._acronym_re, text, found)
+        if self._text_re is not None:
+            self._scan(self._text_re, fold_text(text) if folded is None else folded, found)
+        return sorted(found)
+
+
+class DomainMatcher:
+    """
+    Reconoce dominios y sus subdominios mediante un conjunto de sufijos
+    (ej. 'm.emol.com' coincide con 'emol.com', 'noemol.com' no)
+    """
+
+    def __init__(self, domains: Iterable[str]):
+        self.domains = {domain.lower().lstrip('.') for domain in domains}
+
+    def matches(self, url: str) -> bool:
+        host = urlsplit(url if '//' in url else f"//{url}").hostname or ''
+        labels = host.split('.')
+        return any('.'.join(labels[i:]) in self.domains for i in range(len(labels)))
+
+
+class RelevanceScorer:
+    """
+    Puntúa artículos por relevancia ISO y aplica las reglas de FILTERS:
+    dominios y palabras excluidas, al menos una palabra requerida y un
+    puntaje mínimo
+    """
+
+    def __init__(self, keywords: Sequence[str] = ISO_KEYWORDS, filters: Dict[str, Any] = FILTERS,
+                 weights: Dict[str, float] = RELEVANCE_WEIGHTS):
+        self.weights = weights
+        self.min_score = filters.get('min_relevance_score', 1)
+        self.keyword_matcher = KeywordMatcher(keywords)
+        # 'ISO' requerido debe aceptar también 'iso' en minúsculas
+        self.required_matcher = KeywordMatcher(filters.get('required_keywords_any', []), prefix=True,
+                                               case_sensitive_acronyms=False)
+        self.exclude_matcher = KeywordMatcher(filters.get('exclude_keywords', []), prefix=True)
+        self.excluded_domains = DomainMatcher(filters.get('exclude_domains', []))
+
+    def _keyword_weight(self, keyword: str) -> float:
+        if _STANDARD_RE.match(keyword):
+            return self.weights['standard']
+        if 'ISO' in keyword:
+            return self.weights['iso_term']
+        return self.weights['keyword']
+
+    def score(self, article: Dict[str, Any], fields: Sequence[str] = ('title', 'summary')) -> Dict[str, Any]:
+        """
+        Evalúa un artículo
+
+        Returns:
+            dict: score, matched (palabras clave), relevant (bool) y reason
+                  (motivo del descarte, o None)
+        """
+        text = ' '.join(str(article.get(field) or '') for field in fields)
+        folded = fold_text(text)
+
+        matched = self.keyword_matcher.find(text, folded)
+        score = sum(self._keyword_weight(keyword) for keyword in matched)
+
+        if self.excluded_domains.matches(article.get('url') or ''):
+            reason = 'excluded_domain'
+        elif self.exclude_matcher.find(text, folded):
+            reason = 'excluded_keyword'
+        elif not self.required_matcher.find(text, folded):
+            reason = 'missing_required_keyword'
+        elif score < self.min_score:
+            reason = 'low_score'
+        else:
+            reason = None
+
+        return {'score': score, 'matched': matched, 'relevant': reason is None, 'reason': reason}
+
+    def score_batch(self, articles: Iterable[Dict[str, Any]],
+                    fields: Sequence[str] = ('title', 'summary')) -> List[Dict[str, Any]]:
+        """Puntúa un lote de artículos en una sola pasada"""
+        return [self.score(article, fields) for article in articles]
+
+    def filter(self, articles: Iterable[Dict[str, Any]],
+               fields: Sequence[str] = ('title', 'summary')) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Conserva los artículos relevantes y agrega `relevance_score` a cada uno
+
+        Returns:
+            tuple: (artículos relevantes, conteo de descartes por motivo)
+        """
+        relevant, dropped = [], {}
+        for article in articles:
+            result = self.score(article, fields)
+            if result['relevant']:
+                article['relevance_score'] = result['score']
+                relevant.append(article)
+            else:
+                dropped[result['reason']] = dropped.get(result['reason'], 0) + 1
+        return relevant, dropped
+
+
+_default_scorer: Optional[RelevanceScorer] = None
+
+
+def get_default_scorer() -> RelevanceScorer:
+    """Scorer compartido, compilado una vez por proceso"""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = RelevanceScorer()
+    return _default_scorer
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Capa de resiliencia HTTP compartida por los scrapers ISO
+Reintenta con backoff exponencial y jitter (respetando Retry-After), aplica
+timeouts de conexión y lectura desde la configuración y corta con un circuit
+breaker por host las llamadas a dominios que siguen fallando, para que una
+caída parcial no consuma el tiempo de la ejecución.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from config_iso_scraper import CONFIG, RESILIENCE
+
+# Estados del circuit breaker
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """El host tiene el circuito abierto: no se intenta la conexión"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuito abierto para {host} (reintento en {retry_in:.0f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos indicados por Retry-After (número o fecha HTTP); None si no se entiende"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Breaker de un host: tras `failure_threshold` fallos seguidos se abre por
+    `reset_seconds`; luego deja pasar un request de prueba (medio abierto) que
+    lo cierra si funciona o lo vuelve a abrir si falla
+    """
+
+    def __init__(self, failure_threshold: int = RESILIENCE['breaker_failure_threshold'],
+                 reset_seconds: float = RESILIENCE['breaker_reset_seconds']):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.retry_in() <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Devuelve el turno de prueba de `allow()` cuando el intento no llegó a hacerse"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class BreakerRegistry:
+    """Un CircuitBreaker por host, creado al primer uso"""
+
+    def __init__(self, failure_threshold: int = RESILIENCE['breaker_failure_threshold'],
+                 reset_seconds: float = RESILIENCE['breaker_reset_seconds']):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+            return self._breakers[host]
+
+    def open_hosts(self) -> Dict[str, float]:
+        """Hosts con el circuito abierto y segundos hasta el próximo intento"""
+        with self._lock:
+            return {host: round(b.retry_in(), 1) for host, b in self._breakers.items() if b.state != CLOSED}
+
+
+class RetryPolicy:
+    """Cuándo reintentar y cuánto esperar antes de cada reintento"""
+
+    def __init__(self, max_attempts: int = RESILIENCE['max_attempts'],
+                 base_delay: float = RESILIENCE['backoff_base_seconds'],
+                 max_delay: float = RESILIENCE['backoff_max_seconds'],
+                 max_retry_after: float = RESILIENCE['max_retry_after_seconds'],
+                 retry_statuses=RESILIENCE['retry_statuses']):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, attempt: int) -> float:
+        """Backoff exponencial con jitter completo: uniforme en [0, base * 2^intento]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def delay_for(self, attempt: int, response: Optional[requests.Response]) -> Optional[float]:
+        """
+        Espera antes del siguiente intento; None si no conviene reintentar
+        (el servidor pide esperar más de `max_retry_after`)
+        """
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        if retry_after is None:
+            return self.backoff(attempt)
+        if retry_after > self.max_retry_after:
+            return None
+        return retry_after
+
+
+_default_breakers: Optional[BreakerRegistry] = None
+_default_breakers_lock = threading.Lock()
+
+
+def get_default_breakers() -> BreakerRegistry:
+    """Breakers del proceso: todos los scrapers ven el mismo estado de cada host"""
+    global _default_breakers
+    with _default_breakers_lock:
+        if _default_breakers is None:
+            _default_breakers = BreakerRegistry()
+        return _default_breakers
+
+
+class ResilientClient:
+    """
+    GET con timeouts, reintentos y circuit breaker sobre un requests.Session
+
+    Reintenta errores de conexión, timeouts y los estados de
+    RESILIENCE['retry_statuses']; cualquier otra respuesta se devuelve tal cual.
+    """
+
+    def __init__(self, session: requests.Session, policy: Optional[RetryPolicy] = None,
+                 breakers: Optional[BreakerRegistry] = None, metrics: Any = None,
+                 timeout: Optional[Tuple[float, float]] = None, logger: Optional[logging.Logger] = None):
+        self.session = session
+        self.policy = policy or RetryPolicy()
+        self.breakers = breakers or get_default_breakers()
+        self.metrics = metrics
+        self.timeout = timeout or (RESILIENCE['connect_timeout_seconds'], CONFIG['timeout_seconds'])
+        self.logger = logger or logging.getLogger(__name__)
+        self.retries = 0
+        self.wait_seconds = 0.0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def _wait(self, url: str, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.wait_seconds += delay
+        if self.metrics is not None:
+            self.metrics.record_retry(url)
+            self.metrics.record_wait('retry_backoff', delay)
+        time.sleep(delay)
+
+    def get(self, url: str, before_attempt: Optional[Callable[[], bool]] = None,
+            deadline: Optional[float] = None, **kwargs) -> Optional[requests.Response]:
+        """
+        Args:
+            before_attempt: Se llama antes de cada intento (cuota, limitador);
+                si devuelve False no se intenta más
+            deadline: Instante (time.monotonic) después del cual no se reintenta
+            **kwargs: Argumentos de requests (params, verify, stream...)
+
+        Returns:
+            La última respuesta, o None si `before_attempt` rechazó el primer intento
+
+        Raises:
+            CircuitOpenError: El host tiene el circuito abierto
+            requests.RequestException: El último intento falló sin respuesta
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlsplit(url).hostname or ''
+        breaker = self.breakers.get(host)
+        response: Optional[requests.Response] = None
+        failure: Optional[Exception] = None
+
+        for attempt in range(self.policy.max_attempts):
+            if not breaker.allow():
+                with self._lock:
+                    self.short_circuited += 1
+                if response is not None:
+                    return response
+                raise CircuitOpenError(host, breaker.retry_in())
+            if before_attempt is not None and not before_attempt():
+                # Sin esto, un breaker medio abierto quedaría esperando una prueba que nunca ocurre
+                breaker.release()
+                if failure is not None:
+                    raise failure
+                return response
+
+            try:
+                response, failure = self.session.get(url, **kwargs), None
+            except requests.exceptions.SSLError:
+                # Un certificado inválido no se arregla reintentando
+                breaker.record_failure()
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                breaker.record_failure()
+                response, failure = None, e
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in self.policy.retry_statuses:
+                    return response
+
+            if attempt + 1 >= self.policy.max_attempts:
+                break
+            delay = self.policy.delay_for(attempt, response)
+            if delay is None or (deadline is not None and time.monotonic() + delay >= deadline):
+                break
+            self.logger.debug(f"Reintentando {host} en {delay:.2f}s (intento {attempt + 2})")
+            self._wait(url, delay)
+
+        if failure is not None:
+            raise failure
+        return response
+
+    def report(self) -> Dict[str, Any]:
+        """Resume reintentos, tiempo esperado y hosts cortados"""
+        with self._lock:
+            stats = {
+                'retries': self.retries,
+                'retry_wait_seconds': round(self.wait_seconds, 2),
+                'short_circuited': self.short_circuited,
+            }
+        stats['open_circuits'] = self.breakers.open_hosts()
+        self.logger.info(
+            f"Resiliencia: {stats['retries']} reintentos, {stats['retry_wait_seconds']}s esperando, "
+            f"{stats['short_circuited']} requests evitados por circuito abierto"
+            + (f" ({', '.join(stats['open_circuits'])})" if stats['open_circuits'] else '')
+        )
+        return stats
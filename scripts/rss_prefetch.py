@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Descarga previa de los feeds RSS/Atom que muestra el sitio
+Baja en paralelo los feeds de RSS_FEEDS (con la caché HTTP compartida: un
+feed vigente no sale a la red y uno vencido se revalida con If-None-Match /
+If-Modified-Since), normaliza sus entradas al esquema de iso_news.json y
+escribe un JSON por salida en src/data/rss. El build de Astro lee solo esos
+archivos, así que un host lento o caído no lo demora ni lo hace fallar: si
+un feed no responde se conservan sus entradas de la ejecución anterior.
+
+Uso (desde la raíz del repositorio):
+    python scripts/rss_prefetch.py [--feeds wired,google_normas_iso_chile]
+"""
+
+import argparse
+import json
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+
+from article import Article, json_default, loads_articles
+from config_iso_scraper import RSS_FEEDS
+from http_transport import new_session
+from resilience import ResilientClient
+from url_utils import unique_by_url
+
+_NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'media': 'http://search.yahoo.com/mrss/',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+}
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """Fecha RFC 822 (RSS) o ISO 8601 (Atom); None si no se reconoce"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def html_to_text(html: str, length: int = RSS_FEEDS['summary_length']) -> str:
+    """Texto plano de un fragmento HTML, cortado en una palabra si excede `length`"""
+    text = BeautifulSoup(html or '', 'html.parser').get_text(' ', strip=True)
+    text = ' '.join(text.split())
+    if len(text) > length:
+        text = text[:length].rsplit(' ', 1)[0] + '...'
+    return text
+
+
+def _text(element: ET.Element, path: str) -> str:
+    found = element.find(path, _NS)
+    return (found.text or '').strip() if found is not None else ''
+
+
+def _image(item: ET.Element, html: str) -> str:
+    """Imagen de una entrada: enclosure, media:content / media:thumbnail o el primer <img>"""
+    for enclosure in item.findall('enclosure'):
+        if enclosure.get('type', '').startswith('image/') and enclosure.get('url'):
+            return enclosure.get('url')
+    for path in ('media:content', 'media:thumbnail', 'media:group/media:content'):
+        for media in item.findall(path, _NS):
+            if media.get('url') and media.get('medium', 'image') == 'image':
+                return media.get('url')
+    img = BeautifulSoup(html or '', 'html.parser').find('img', src=True)
+    return img['src'] if img else ''
+
+
+def parse_feed(content: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    (título del feed, entradas) de un documento RSS 2.0 o Atom
+
+    Cada entrada trae title, link, html (descripción), published (datetime o
+    None), image y source (el <source> del ítem, si lo hay)
+
+    Raises:
+        ET.ParseError: El contenido no es XML
+    """
+    root = ET.fromstring(content)
+    entries = []
+
+    if root.tag == f"{{{_NS['atom']}}}feed":
+        for entry in root.findall('atom:entry', _NS):
+            link = next((candidate.get('href') for candidate in entry.findall('atom:link', _NS)
+                         if candidate.get('rel', 'alternate') == 'alternate'), '')
+            html = _text(entry, 'atom:summary') or _text(entry, 'atom:content')
+            entries.append({
+                'title': _text(entry, 'atom:title'),
+                'link': link or '',
+                'html': html,
+                'published': parse_feed_date(_text(entry, 'atom:published') or _text(entry, 'atom:updated')),
+                'image': _image(entry, html),
+                'source': _text(entry, 'atom:source/atom:title'),
+            })
+        return _text(root, 'atom:title'), entries
+
+    channel = root.find('channel')
+    if channel is None:
+        return '', []
+    for item in channel.findall('item'):
+        html = _text(item, 'description') or _text(item, 'content:encoded')
+        entries.append({
+            'title': _text(item, 'title'),
+            'link': _text(item, 'link'),
+            'html': html,
+            'published': parse_feed_date(_text(item, 'pubDate')),
+            'image': _image(item, html),
+            'source': _text(item, 'source'),
+        })
+    return _text(channel, 'title'), entries
+
+
+class RSSPrefetcher:
+    """
+    Descarga los feeds configurados y escribe <output_dir>/<salida>.json
+
+    Cada artículo guarda en `feed` el nombre del feed que lo trajo, para
+    reconocer qué entradas conservar cuando ese feed falla.
+    """
+
+    def __init__(self, feeds: Dict[str, Dict[str, Any]] = RSS_FEEDS['feeds'],
+                 output_dir: str = RSS_FEEDS['output_dir'],
+                 max_workers: int = RSS_FEEDS['max_workers']):
+        self.feeds = feeds
+        self.output_dir = output_dir
+        self.max_workers = max(1, max_workers)
+        self.session = new_session()
+        self.http = ResilientClient(self.session)
+
+    def normalize(self, name: str, feed_title: str, entries: List[Dict[str, Any]],
+                  scraped_at: str) -> List[Article]:
+        """Entradas de un feed como Article, hasta `max_items_per_feed`"""
+        spec = self.feeds[name]
+        articles = []
+        for entry in entries[:RSS_FEEDS['max_items_per_feed']]:
+            title, url = entry['title'], entry['link']
+            if not title or not url:
+                continue
+            source = spec.get('source_name') or entry['source'] or feed_title or name
+            # Google News agrega " - <medio>" al final del título
+            if entry['source'] and title.endswith(f" - {entry['source']}"):
+                title = title[:-len(entry['source']) - 3]
+            published = entry['published']
+            articles.append(Article(
+                title, url, source, html_to_text(entry['html']),
+                date=published.date() if published else None,
+                region=spec.get('region'),
+                image_url=entry['image'],
+                scraped_at=scraped_at,
+                scraping_success=True,
+                published_at=published.isoformat() if published else '',
+                feed=name,
+            ))
+        return articles
+
+    def fetch(self, name: str, scraped_at: str) -> Dict[str, Any]:
+        """{'status', 'articles', 'error'} de un feed; nunca lanza excepciones"""
+        try:
+            response = self.http.get(self.feeds[name]['url'])
+            response.raise_for_status()
+            feed_title, entries = parse_feed(response.content)
+        except (requests.RequestException, ET.ParseError) as e:
+            return {'status': 'error', 'articles': [], 'error': str(e)}
+        status = 'caché' if getattr(response, 'from_cache', False) else 'descargado'
+        return {'status': status, 'articles': self.normalize(name, feed_title, entries, scraped_at)}
+
+    def _output_path(self, output: str) -> str:
+        return os.path.join(self.output_dir, f"{output}.json")
+
+    def previous(self, output: str) -> Dict[str, List[Article]]:
+        """Artículos de la ejecución anterior de una salida, por feed"""
+        try:
+            with open(self._output_path(output), encoding='utf-8') as f:
+                articles = loads_articles(f.read())
+        except (OSError, ValueError):
+            return {}
+        by_feed: Dict[str, List[Article]] = {}
+        for article in articles:
+            by_feed.setdefault(article.get('feed', ''), []).append(article)
+        return by_feed
+
+    def write(self, output: str, names: List[str], results: Dict[str, Dict[str, Any]]) -> int:
+        previous = self.previous(output)
+        articles: List[Article] = []
+        feeds_metadata = {}
+        for name in names:
+            result = results[name]
+            feed_articles = result['articles']
+            if result['status'] in ('error', 'omitido'):
+                feed_articles = previous.get(name, [])
+            articles.extend(feed_articles)
+            feeds_metadata[name] = {'status': result['status'], 'articles': len(feed_articles)}
+            if 'error' in result:
+                feeds_metadata[name]['error'] = result['error']
+
+        articles = unique_by_url(articles)
+        articles.sort(key=lambda a: a.get('published_at') or '', reverse=True)
+        data = {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "data_source": "RSS - " + ", ".join(names),
+                "total_articles": len(articles),
+                "chilean_articles": len([a for a in articles if a.get('is_chilean_source')]),
+                "international_articles": len([a for a in articles if a.get('is_chilean_source') is False]),
+                "feeds": feeds_metadata,
+            },
+            "articles": articles,
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self._output_path(output), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+        return len(articles)
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, int]:
+        """Descarga los feeds (todos si no se indican) y devuelve artículos por salida"""
+        names = [name for name in (names or self.feeds) if name in self.feeds]
+        scraped_at = datetime.now().isoformat()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(names) or 1)) as executor:
+            results = dict(zip(names, executor.map(lambda name: self.fetch(name, scraped_at), names)))
+
+        for name, result in results.items():
+            if result['status'] == 'error':
+                print(f"⚠️ {name}: {result['error']} (se conservan las entradas anteriores)")
+            else:
+                print(f"📰 {name}: {len(result['articles'])} entradas ({result['status']})")
+
+        outputs: Dict[str, List[str]] = {}
+        for name in names:
+            outputs.setdefault(self.feeds[name]['output'], []).append(name)
+        # Una salida se reescribe completa: incluye también los feeds no pedidos
+        for output, members in outputs.items():
+            for name in self.feeds:
+                if self.feeds[name]['output'] == output and name not in members:
+                    members.append(name)
+                    results[name] = {'status': 'omitido', 'articles': []}
+
+        totals = {output: self.write(output, members, results) for output, members in outputs.items()}
+        for output, total in totals.items():
+            print(f"✅ {total} artículos en {self._output_path(output)}")
+        return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Descarga previa de feeds RSS para el build del sitio")
+    parser.add_argument('--feeds', help=f"Feeds separados por coma (por defecto: {','.join(RSS_FEEDS['feeds'])})")
+    args = parser.parse_args()
+    RSSPrefetcher().run(args.feeds.split(',') if args.feeds else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Métricas operativas de una ejecución de los scrapers
+Cuenta requests, bytes, aciertos de caché, respuestas 429 y reintentos por
+host, latencias por etapa (percentiles) y descartes por filtro. El resumen se
+incluye en el bloque `metadata` de la salida y se agrega como una línea a
+METRICS['path'] para comparar costo y regresiones entre ejecuciones diarias.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from config_iso_scraper import METRICS
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[float], percentiles: List[int] = METRICS['percentiles']) -> Dict[str, Any]:
+    """Cantidad, total, percentiles y máximo (en segundos) de una serie de latencias"""
+    ordered = sorted(samples)
+    summary = {'count': len(ordered), 'total_seconds': round(sum(ordered), 3)}
+    for pct in percentiles:
+        summary[f"p{pct}"] = round(percentile(ordered, pct), 3)
+    summary['max'] = round(ordered[-1], 3) if ordered else 0.0
+    return summary
+
+
+class RunMetrics:
+    """
+    Acumulador de métricas de una ejecución, seguro para varios hilos
+
+    Se engancha a un requests.Session con `attach`, de modo que cada
+    respuesta (también las servidas por la caché HTTP) queda contabilizada
+    sin tocar el código de descarga.
+    """
+
+    def __init__(self, run_name: str):
+        self.run_name = run_name
+        self.started_at = datetime.now().isoformat()
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self.drops: Dict[str, Dict[str, int]] = {}
+        self.failures: Dict[str, int] = {}
+        self.waits: Dict[str, float] = {}
+
+    def _host(self, host: str) -> Dict[str, Any]:
+        if host not in self.hosts:
+            self.hosts[host] = {
+                'requests': 0, 'bytes': 0, 'cache_hits': 0,
+                'rate_limited': 0, 'retries': 0, 'errors': 0, 'status': {}, 'latencies': [],
+            }
+        return self.hosts[host]
+
+    def attach(self, session: requests.Session) -> 'RunMetrics':
+        """Registra el hook de respuestas en la sesión (una sola vez por sesión)"""
+        hooks = session.hooks.setdefault('response', [])
+        if self.on_response not in hooks:
+            hooks.append(self.on_response)
+        return self
+
+    def on_response(self, response: requests.Response, *args, **kwargs) -> None:
+        """Hook de requests: contabiliza la respuesta en su host"""
+        if kwargs.get('stream'):
+            # No consumir descargas en streaming: basta el largo declarado
+            size = int(response.headers.get('Content-Length') or 0)
+        else:
+            size = len(response.content or b'')
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', None) or ()
+        from_cache = bool(getattr(response, 'from_cache', False))
+
+        with self._lock:
+            stats = self._host(urlsplit(response.url).hostname or '')
+            stats['requests'] += 1
+            stats['bytes'] += 0 if from_cache else size
+            stats['cache_hits'] += from_cache
+            stats['rate_limited'] += response.status_code == 429
+            stats['retries'] += len(retries)
+            status = str(response.status_code)
+            stats['status'][status] = stats['status'].get(status, 0) + 1
+            if not from_cache:
+                stats['latencies'].append(response.elapsed.total_seconds())
+
+    def record_error(self, url: str) -> None:
+        """Request que no obtuvo respuesta (DNS, conexión, timeout)"""
+        with self._lock:
+            self._host(urlsplit(url).hostname or '')['errors'] += 1
+
+    def record_retry(self, url: str) -> None:
+        """Reintento hecho por la aplicación (los de urllib3 se cuentan solos)"""
+        with self._lock:
+            self._host(urlsplit(url).hostname or '')['retries'] += 1
+
+    def record_wait(self, reason: str, seconds: float) -> None:
+        """Tiempo de reloj esperado sin trabajar (backoff de reintentos, limitador...)"""
+        with self._lock:
+            self.waits[reason] = self.waits.get(reason, 0.0) + seconds
+
+    def record_latency(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Mide un bloque como una muestra de latencia de `stage`"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_latency(stage, time.monotonic() - start)
+
+    def record_drops(self, filter_name: str, dropped: Dict[str, int]) -> None:
+        """Suma los descartes por motivo de un filtro (relevancia, duplicados, sin cambios...)"""
+        with self._lock:
+            counts = self.drops.setdefault(filter_name, {})
+            for reason, count in dropped.items():
+                if count:
+                    counts[reason] = counts.get(reason, 0) + count
+
+    def record_failure(self, stage: str, count: int = 1) -> None:
+        """Artículo o página que no se pudo obtener o procesar"""
+        with self._lock:
+            self.failures[stage] = self.failures.get(stage, 0) + count
+
+    @property
+    def failed_scrapes(self) -> int:
+        with self._lock:
+            return sum(self.failures.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Resumen serializable de la ejecución hasta este momento"""
+        with self._lock:
+            hosts = {}
+            for host, stats in sorted(self.hosts.items()):
+                hosts[host] = {key: value for key, value in stats.items() if key != 'latencies'}
+                hosts[host]['status'] = dict(sorted(stats['status'].items()))
+                hosts[host]['latency'] = summarize(stats['latencies'])
+            totals = {
+                key: sum(stats[key] for stats in self.hosts.values())
+                for key in ('requests', 'bytes', 'cache_hits', 'rate_limited', 'retries', 'errors')
+            }
+            return {
+                'run': self.run_name,
+                'started_at': self.started_at,
+                'finished_at': datetime.now().isoformat(),
+                'wall_seconds': round(time.monotonic() - self._start, 3),
+                'totals': totals,
+                'hosts': hosts,
+                'stages': {stage: summarize(samples) for stage, samples in sorted(self.latencies.items())},
+                'drops': {name: dict(sorted(counts.items())) for name, counts in sorted(self.drops.items())},
+                'failures': dict(sorted(self.failures.items())),
+                'wait_seconds': {reason: round(seconds, 3) for reason, seconds in sorted(self.waits.items())},
+            }
+
+    def write(self, snapshot: Optional[Dict[str, Any]] = None, path: str = METRICS['path'],
+              keep_runs: int = METRICS['keep_runs']) -> str:
+        """
+        Agrega la ejecución como una línea JSON al historial de métricas,
+        conservando solo las últimas `keep_runs`
+        """
+        line = json.dumps(snapshot or self.snapshot(), ensure_ascii=False, sort_keys=True)
+        try:
+            with open(path, encoding='utf-8') as f:
+                lines = [existing.rstrip('\n') for existing in f if existing.strip()]
+        except FileNotFoundError:
+            lines = []
+        lines = (lines + [line])[-keep_runs:]
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Almacén persistente (SQLite) de artículos ya vistos
+Permite que cada ejecución procese solo artículos nuevos o modificados y
+combine el resultado con el historial publicado en ejecuciones anteriores
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from article import Article, json_default
+from config_iso_scraper import STATE_STORE
+from url_utils import canonicalize_url
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+
+def content_hash(*parts: Optional[str]) -> str:
+    """Hash estable del contenido relevante de un artículo"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part or '').strip().encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+class ArticleStateStore:
+    """
+    Registro de URLs canónicas con primera/última vez vistas y hash de contenido
+    """
+
+    def __init__(self, path: str = STATE_STORE['path']):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS seen_articles (
+                url TEXT PRIMARY KEY,
+                scraper TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                payload TEXT
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_scraper ON seen_articles(scraper, last_seen)"
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS query_watermarks (
+                query TEXT PRIMARY KEY,
+                published_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def classify(self, url: str, digest: str) -> str:
+        """
+        Indica si un artículo es nuevo, cambió o ya se procesó igual
+
+        Returns:
+            str: NEW, CHANGED o UNCHANGED
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM seen_articles WHERE url = ?", (canonicalize_url(url),)
+            ).fetchone()
+        if row is None:
+            return NEW
+        return UNCHANGED if row[0] == digest else CHANGED
+
+    def touch(self, url: str) -> None:
+        """Actualiza la última vez visto de un artículo sin cambios"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE seen_articles SET last_seen = ? WHERE url = ?",
+                (datetime.now().isoformat(), canonicalize_url(url))
+            )
+
+    def upsert(self, scraper: str, url: str, digest: str, payload: Optional[Dict[str, Any]]) -> None:
+        """
+        Registra un artículo procesado. `payload` es None para artículos
+        descartados, que así no se vuelven a evaluar mientras no cambien.
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO seen_articles (url, scraper, content_hash, first_seen, last_seen, payload)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       content_hash = excluded.content_hash,
+                       last_seen = excluded.last_seen,
+                       payload = excluded.payload""",
+                (
+                    canonicalize_url(url), scraper, digest, now, now,
+                    json.dumps(payload, ensure_ascii=False, default=json_default) if payload is not None else None
+                )
+            )
+
+    def history(self, scraper: str, days: int = STATE_STORE['history_days']) -> List[Article]:
+        """
+        Artículos publicados por un scraper vistos dentro de la ventana de historial
+        (como Article: el historial es lo que más artículos mantiene en memoria)
+        """
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT payload FROM seen_articles
+                   WHERE scraper = ? AND payload IS NOT NULL AND last_seen >= ?
+                   ORDER BY first_seen DESC""",
+                (scraper, since)
+            ).fetchall()
+        return [Article.from_dict(json.loads(row[0])) for row in rows]
+
+    def get_watermark(self, query: str) -> Optional[str]:
+        """
+        Fecha de publicación más reciente vista para una consulta en la
+        última ejecución exitosa (o None si nunca se ejecutó)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT published_at FROM query_watermarks WHERE query = ?", (query,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, query: str, published_at: str) -> None:
+        """Registra la nueva marca de agua; se confirma junto con commit()"""
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO query_watermarks (query, published_at, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT(query) DO UPDATE SET
+                       published_at = excluded.published_at,
+                       updated_at = excluded.updated_at""",
+                (query, published_at, datetime.now().isoformat())
+            )
+
+    def commit(self) -> None:
+        """Confirma los cambios; se llama solo después de guardar la salida"""
+        with self._lock:
+            self._conn.commit()
+
+    def rollback(self) -> None:
+        with self._lock:
+            self._conn.rollback()
+
+
+def merge_with_history(fresh: List[Dict[str, Any]], history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Combina artículos recién procesados con el historial; los nuevos
+    reemplazan a la versión almacenada de la misma URL canónica
+    """
+    merged = {}
+    for article in fresh + history:
+        key = canonicalize_url(article.get('url', ''))
+        if key and key not in merged:
+            merged[key] = article
+    return list(merged.values())
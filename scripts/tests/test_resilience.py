@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Pruebas del circuit breaker de ResilientClient (sin red)
+
+Uso (desde la raíz del repositorio):
+    python -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resilience import HALF_OPEN, BreakerRegistry, ResilientClient, RetryPolicy  # noqa: E402
+
+
+class _NoNetworkSession:
+    """Sesión que falla si alguien intenta conectarse"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise AssertionError(f"conexión inesperada a {url}")
+
+
+class HalfOpenRefusedAttemptTest(unittest.TestCase):
+
+    def setUp(self):
+        self.breakers = BreakerRegistry(failure_threshold=1, reset_seconds=0)
+        self.session = _NoNetworkSession()
+        self.client = ResilientClient(self.session, policy=RetryPolicy(max_attempts=1), breakers=self.breakers)
+        self.breaker = self.breakers.get('example.com')
+        self.breaker.record_failure()  # Abierto; con reset 0 el próximo allow() pasa a medio abierto
+
+    def test_refused_attempt_releases_trial_slot(self):
+        response = self.client.get('https://example.com/noticias', before_attempt=lambda: False)
+
+        self.assertIsNone(response)
+        self.assertEqual(self.session.calls, 0)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        # El turno de prueba sigue disponible para el siguiente request al host
+        self.assertTrue(self.breaker.allow())
+
+    def test_trial_slot_is_exclusive_while_in_flight(self):
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
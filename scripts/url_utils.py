@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Utilidades de URLs compartidas por los scrapers ISO
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src'}
+TRACKING_PREFIXES = ('utm_',)
+
+# Parámetros que solo seleccionan la versión AMP de la misma noticia
+AMP_PARAMS = {'amp', 'outputtype', 'output'}
+
+# Sufijos de ruta de versiones AMP: /amp, /amp/, .amp, .amp.html
+_AMP_PATH_RE = re.compile(r'(/amp/?$|\.amp(?=\.html?$)|\.amp$)')
+
+_SLUG_INVALID_RE = re.compile(r'[^a-z0-9]+')
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Forma canónica de una URL de artículo: https, host en minúsculas,
+    sin www ni variantes AMP, sin fragmento, sin parámetros de seguimiento
+    y sin "/" final
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ('www.', 'amp.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    params = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+        and k.lower() not in AMP_PARAMS
+    ]
+    path = _AMP_PATH_RE.sub('', parts.path)
+    path = path.replace('/amp/', '/').rstrip('/') or '/'
+    scheme = parts.scheme.lower()
+    if scheme in ('', 'http'):
+        scheme = 'https'
+    return urlunsplit((scheme, host, path, urlencode(sorted(params)), ''))
+
+
+def unique_by_url(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Primera aparición de cada URL canónica (tracking, AMP, www); descarta
+    artículos sin URL
+    """
+    unique = {}
+    for article in articles:
+        url = canonicalize_url(article.get('url') or '')
+        if url and url not in unique:
+            unique[url] = article
+    return list(unique.values())
+
+
+def slugify(text: str, max_words: int = 0) -> str:
+    """
+    Slug ASCII para URLs: minúsculas, sin tildes y palabras separadas por "-"
+    (solo las primeras `max_words` palabras si se indica)
+    """
+    decomposed = unicodedata.normalize('NFKD', (text or '').lower())
+    ascii_text = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    words = [word for word in _SLUG_INVALID_RE.split(ascii_text) if word]
+    if max_words:
+        words = words[:max_words]
+    return '-'.join(words)
+
+
+def stable_slug(text: str, parts, max_words: int = 8) -> str:
+    """
+    Slug estable de una noticia: primeras palabras del texto más un hash
+    corto de `parts` (no depende de la posición en el archivo)
+    """
+    digest = hashlib.sha1('\x1f'.join((part or '').strip() for part in parts).encode('utf-8')).hexdigest()[:8]
+    return f"{slugify(text, max_words) or 'noticia'}-{digest}"
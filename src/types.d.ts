@@ -18,6 +18,16 @@ declare module '../data/cms2.json' {
     texto: string;
     imagen: string;
     link: string;
+    // Campos precalculados por scripts/enrich_news.py
+    categoria?: string;
+    ano?: number | null;
+    mes?: string;
+    fecha_formateada?: string;
+    fecha_iso?: string | null;
+    slug?: string;
+    titulo?: string;
+    extracto?: string;
+    enrich_hash?: string;
   }
   interface CMS2Data {
     sitio_web: string;
@@ -38,3 +48,22 @@ declare module '../../data/cms1.json' {
   const noticias: Noticia[];
   export default noticias;
 }
+
+declare module '../data/shards/manifest.json' {
+  interface AnoShards {
+    ano: number;
+    total: number;
+  }
+  interface ShardsManifest {
+    fuente: string;
+    fuente_sha1: string;
+    sitio_web: string;
+    total: number;
+    tamano_pagina: number;
+    total_paginas: number;
+    anos: AnoShards[];
+    slugs: string[];
+  }
+  const manifest: ShardsManifest;
+  export default manifest;
+}